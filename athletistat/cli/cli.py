@@ -3,6 +3,15 @@ from datetime import datetime
 from athletistat.core.scraper import Scraper
 from athletistat.core.preprocessing import Preprocessor
 from athletistat.core.generator import DatasetGenerator, DatasetSplitter
+from athletistat.core.merger import RankedMerger
+from athletistat.core.sketches import SketchStore
+from athletistat.core.indexer import RankIndexBuilder
+from athletistat.core.rankindex import RankIndex
+from athletistat.core.daemon import RefreshDaemon
+from athletistat.core.sampler import DatasetSampler
+from athletistat.core.memory import MemoryBudget
+from athletistat.core.reranker import Reranker
+from athletistat.core.features import FeatureExporter
 from athletistat.scripts.fetch_info import DatasetInfo
 
 
@@ -12,45 +21,165 @@ from athletistat.scripts.fetch_info import DatasetInfo
 @click.option('--create-dataset', type=click.Choice(['seasons', 'all-time']), help='Generate datasets from preprocessed data.')
 @click.option('--combine', is_flag=True, help='Combine datasets in season for all years scraped.')
 @click.option('--split-dataset', type=click.Choice(['seasons', 'all-time']), help='Splits datasets according to gender, discipline, and event type.')
+@click.option('--merge-ranked', is_flag=True, help='Merges preprocessed season files into globally ranked multi-season files per discipline and gender.')
 @click.option('--fetch-data', type=click.Choice(['seasons', 'all-time']), help='Performs --scraper, --preprocessing and --create-dataset for given mode.')
 @click.option('--year', type=int, help='Year to use for seasons mode. If blank, behavior depends on the command.')
 @click.option('--fetch-info', is_flag=True, help='Generates a txt file of dataset information; file name, file size, and row number')
+@click.option('--compression', type=click.Choice(['zstd', 'gzip']), help='Compress CSV outputs of preprocessing, dataset generation, splitting, and ranked merges.')
+@click.option('--delta', is_flag=True, help='Write a delta of added/removed/changed performances against the previous build, plus a build manifest, when generating datasets.')
+@click.option('--job-store', type=click.Path(dir_okay=False), help='Shared SQLite job store; run the scraper as one of several distributed workers.')
+@click.option('--worker-id', type=str, help='Identifier of this worker in the job store. Defaults to hostname-pid.')
+@click.option('--plan', type=click.Choice(['seasons', 'all-time']), help='Estimates total requests and wall time of a scrape from previous runs, without scraping.')
+@click.option('--workers', type=int, default=10, show_default=True, help='Scraper thread count.')
+@click.option('--retry-failed', type=click.Choice(['seasons', 'all-time']), help='Retries the jobs in the dead-letter file of a mode.')
+@click.option('--build-stats', type=click.Choice(['seasons', 'all-time']), help='Rebuilds the per-season summary sketches in data/stats from the preprocessed files.')
+@click.option('--summary', type=str, help='Prints merged percentiles, depth, and nationality counts of a normalized discipline, e.g. "100-metres".')
+@click.option('--sex', type=click.Choice(['male', 'female']), default='male', show_default=True, help='Sex for --summary.')
+@click.option('--summary-mode', type=click.Choice(['seasons', 'all-time']), default='seasons', show_default=True, help='Stats built by --build-stats to read for --summary.')
+@click.option('--seasons', type=str, help='Season or season range for --summary, e.g. "2015-2024". Defaults to every stored season.')
+@click.option('--depth', type=float, multiple=True, help='Mark to count performances at or better than, for --summary. Repeatable.')
+@click.option('--build-index', type=click.Choice(['seasons', 'all-time']), help='Builds the memory-mapped rank-of-mark index in data/index from the preprocessed files.')
+@click.option('--rank-of', type=str, help='Looks up the rank a mark would have had in a normalized discipline, e.g. "100-metres". Uses the season from --year, or the all-time list.')
+@click.option('--type-slug', type=str, help='WA type slug for --rank-of and --summary, when the discipline exists under several types, e.g. "road-running".')
+@click.option('--mark', type=str, multiple=True, help='Mark for --rank-of, e.g. "9.85" or "3:29.50". Repeatable.')
+@click.option('--daemon', is_flag=True, help='Keeps the current season in memory, refreshes changed lists on a schedule, and serves /top and /athlete queries locally. Lists are checked by their first, last, and one rotating middle page, so an edit that keeps the row count deep in a long list can take several refreshes to be picked up.')
+@click.option('--interval', type=float, default=3.0, show_default=True, help='Hours between --daemon refreshes.')
+@click.option('--port', type=int, default=8766, show_default=True, help='Port of the --daemon query endpoint.')
+@click.option('--sample', type=click.Choice(['seasons', 'all-time', 'both']), help='Writes a reproducible stratified subset of the data under --sample-root for fast development runs.')
+@click.option('--sample-source', type=click.Choice(['raw', 'datasets']), default='raw', show_default=True, help='Sample data/processing/output (raw) or the generated datasets.')
+@click.option('--sample-fraction', type=float, default=0.01, show_default=True, help='Share of each season/sex/type/discipline stratum to keep.')
+@click.option('--sample-max-rows', type=int, help='Most rows kept per stratum.')
+@click.option('--sample-seed', type=int, default=0, show_default=True, help='Random seed of --sample.')
+@click.option('--sample-root', type=click.Path(file_okay=False), default='sample', show_default=True, help='Directory the --sample subset is written under.')
+@click.option('--memory-limit', type=str, help='Memory the preprocessing, dataset, combine, and split stages may use, e.g. "8G". Sizes chunks, streams oversized files, and throttles parallel groups.')
+@click.option('--rerank', type=click.Choice(['seasons', 'all-time', 'both']), help='Recomputes integer competition ranks per sex and discipline in the generated season or all-time datasets.')
+@click.option('--legal-wind', is_flag=True, help='With --rerank, also add rank_legal: the rank among wind-legal marks (<= +2.0 m/s).')
+@click.option('--best-per-athlete', is_flag=True, help="With --rerank, also add rank_athlete: the rank of each athlete's best mark.")
+@click.option('--export-features', type=click.Choice(['seasons', 'all-time', 'both']), help='Exports the generated datasets as memory-mappable per-column .npy arrays in data/features.')
 
-def cli(scraper, preprocessing, create_dataset, combine, split_dataset, fetch_data, dataset_info, year):
+def cli(scraper, preprocessing, create_dataset, combine, split_dataset, merge_ranked, fetch_data, fetch_info, year, compression, delta, job_store, worker_id, plan, workers, retry_failed,
+        build_stats, summary, sex, summary_mode, seasons, depth, build_index, rank_of, type_slug, mark, daemon, interval, port,
+        sample, sample_source, sample_fraction, sample_max_rows, sample_seed, sample_root, memory_limit,
+        rerank, legal_wind, best_per_athlete, export_features):
     """AthletiStat CLI"""
     
     current_year = datetime.now().year
 
+    try:
+        memory = MemoryBudget(memory_limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--memory-limit")
+
+    if plan:
+        s_year = year if year else current_year
+        Scraper(mode=plan).plan(plan, max_workers=workers, year=s_year if plan == 'seasons' else None)
+
     if fetch_data:
         click.echo(f"Running fetch-data for {fetch_data}...")
         s_year = year if year else current_year
-        Scraper(mode=fetch_data).run(year=s_year if fetch_data == 'seasons' else None)
-        Preprocessor(mode=fetch_data).run()
-        DatasetGenerator(mode=fetch_data).run()
+        with memory.stage("scraper"):
+            Scraper(mode=fetch_data).run(max_workers=workers, year=s_year if fetch_data == 'seasons' else None, job_store=job_store, worker_id=worker_id)
+        with memory.stage("preprocessing"):
+            Preprocessor(mode=fetch_data, compression=compression, memory=memory).run()
+        with memory.stage("create-dataset"):
+            DatasetGenerator(mode=fetch_data, compression=compression, deltas=delta, memory=memory).run()
     
     if scraper:
         click.echo(f"Running scraper for {scraper}...")
         s_year = year if year else current_year
-        Scraper(mode=scraper).run(year=s_year if scraper == 'seasons' else None)
+        with memory.stage("scraper"):
+            Scraper(mode=scraper).run(max_workers=workers, year=s_year if scraper == 'seasons' else None, job_store=job_store, worker_id=worker_id)
+
+    if retry_failed:
+        click.echo(f"Retrying dead-lettered {retry_failed} jobs...")
+        Scraper(mode=retry_failed).retry_failed(retry_failed, max_workers=workers)
         
     if preprocessing:
         click.echo(f"Running preprocessing for {preprocessing}...")
         # Note: Preprocessor currently processes all years as implemented
-        Preprocessor(mode=preprocessing).run()
+        with memory.stage("preprocessing"):
+            Preprocessor(mode=preprocessing, compression=compression, memory=memory).run()
 
     if create_dataset:
         click.echo(f"Creating dataset for {create_dataset}...")
         # Note: DatasetGenerator currently processes all years as implemented
-        DatasetGenerator(mode=create_dataset).run()
+        with memory.stage("create-dataset"):
+            DatasetGenerator(mode=create_dataset, compression=compression, deltas=delta, memory=memory).run()
         
     if combine:
         click.echo("Combining datasets...")
-        DatasetGenerator(mode="seasons").run(combine=True)
+        with memory.stage("combine"):
+            DatasetGenerator(mode="seasons", compression=compression, deltas=delta, memory=memory).run(combine=True)
         
     if split_dataset:
         click.echo(f"Splitting dataset for {split_dataset}...")
-        DatasetSplitter(mode=split_dataset).run()
+        with memory.stage("split-dataset"):
+            DatasetSplitter(mode=split_dataset, compression=compression, memory=memory).run()
+
+    if rerank:
+        click.echo(f"Re-ranking {rerank} datasets...")
+        with memory.stage("rerank"):
+            Reranker(mode=rerank, legal_wind=legal_wind, best_per_athlete=best_per_athlete).run()
+
+    if export_features:
+        click.echo(f"Exporting {export_features} features...")
+        with memory.stage("export-features"):
+            FeatureExporter(mode=export_features, memory=memory).run()
+
+    if merge_ranked:
+        click.echo("Merging ranked season files...")
+        with memory.stage("merge-ranked"):
+            RankedMerger(compression=compression).run()
 
-    if dataset_info:
+    if build_stats:
+        click.echo(f"Building summary sketches for {build_stats}...")
+        SketchStore(mode=build_stats).build()
+
+    if summary:
+        season_range = None
+        if seasons:
+            first, _, last = seasons.partition("-")
+            season_range = range(int(first), int(last or first) + 1)
+        try:
+            SketchStore(mode=summary_mode).print_summary(sex, summary, season_range, depth, type_slug=type_slug)
+        except KeyError as e:
+            raise click.BadParameter(e.args[0], param_hint="--summary")
+
+    if build_index:
+        click.echo(f"Building rank index for {build_index}...")
+        RankIndexBuilder(mode=build_index).run()
+
+    if rank_of:
+        parse_mark = Preprocessor(mode="seasons", sketches=False).parse_mark_to_number
+        index_mode = "seasons" if year else "all-time"
+        try:
+            index = RankIndex(mode=index_mode)
+        except FileNotFoundError:
+            raise click.ClickException(f"No {index_mode} rank index found in data/index. Build it with --build-index {index_mode}.")
+        with index:
+            label = year if year else "all-time"
+            for value in mark:
+                numeric = parse_mark(value)
+                if numeric == float("inf"):
+                    raise click.BadParameter(f"Cannot parse mark '{value}'", param_hint="--mark")
+                try:
+                    result = index.lookup(sex, rank_of, numeric, season=year, type_slug=type_slug)
+                except KeyError as e:
+                    raise click.BadParameter(e.args[0], param_hint="--rank-of")
+                click.echo(f"{sex} {rank_of} {label}: {value} ranks #{result['rank']} of {result['total']} "
+                           f"({result['better']} better, {result['tied']} tied, percentile {result['percentile']:.2f})")
+
+    if sample:
+        click.echo(f"Sampling {sample_source} {sample} data into {sample_root}/...")
+        DatasetSampler(mode=sample, source=sample_source, output_root=sample_root, fraction=sample_fraction,
+                       max_rows=sample_max_rows, seed=sample_seed, years=[year] if year else None).run()
+
+    if fetch_info:
         click.echo("Fetching dataset information...")
-        FetchInfo().run()
\ No newline at end of file
+        DatasetInfo().run()
+
+    memory.report()
+
+    if daemon:
+        click.echo(f"Starting refresh daemon (every {interval:g} hours, port {port})...")
+        RefreshDaemon(interval=interval * 3600, port=port, max_workers=workers, compression=compression).run()
\ No newline at end of file
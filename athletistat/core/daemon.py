@@ -0,0 +1,445 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from athletistat.core.generator import DatasetGenerator
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix
+from athletistat.core.jobstore import JobStore
+from athletistat.core.preprocessing import Preprocessor
+from athletistat.core.scraper import Scraper
+from athletistat.core.sketches import DEDUPE_COLUMNS, SketchStore
+
+# Columns of a scraped row that come from the site, used to fingerprint a page
+RAW_COLUMNS = ["rank", "mark", "wind", "competitor", "dob", "nationality", "position", "venue", "date", "result_score"]
+
+# How the combined files store `date` and `dob`
+DATE_PATTERN = r"\d{4}-\d{2}-\d{2}"
+
+class RefreshDaemon:
+    """Keeps the current season warm in memory, refreshes it on a schedule, and answers queries over local HTTP."""
+    def __init__(self, interval=3 * 3600, host="127.0.0.1", port=8766, max_workers=10, compression=None,
+                 page_size=100, scraper=None, preprocessor=None):
+        """
+        Initializes the daemon. The scraper session, discipline mappings, and country lookup are built once here.
+
+        Args:
+            interval (float): Seconds between refreshes. Defaults to 3 hours.
+            host (str): Interface the query endpoint binds to. Defaults to "127.0.0.1".
+            port (int): Port of the query endpoint. Defaults to 8766.
+            max_workers (int): Scraper thread count. Defaults to 10.
+            compression (str or None): Output compression, "zstd" or "gzip". Defaults to None (plain CSV).
+            page_size (int): Rows per toplist page on the site. Defaults to 100.
+            scraper (Scraper or None): Scraper to use. Defaults to a seasons Scraper.
+            preprocessor (Preprocessor or None): Preprocessor to use. Defaults to a seasons Preprocessor.
+        """
+        self.interval = interval
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.scraper = scraper or Scraper(mode="seasons")
+        self.preprocessor = preprocessor or Preprocessor(mode="seasons", compression=compression)
+        self.generator = DatasetGenerator(mode="seasons", compression=compression)
+        self.ingestor = CSVIngestor()
+
+        self.year = None
+        self.frames = {}
+        # Query state is rebuilt after each refresh and swapped in with one assignment
+        self.state = None
+        self.status = {"year": None, "refreshes": 0, "last_refresh": None}
+        self.stop_event = threading.Event()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    # --- Change detection ---
+
+    def _fingerprint_file(self):
+        return f"queues/seasons/fingerprints_{self.year}.json"
+
+    def _load_fingerprints(self):
+        path = self._fingerprint_file()
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_fingerprints(self, fingerprints):
+        os.makedirs(os.path.dirname(self._fingerprint_file()), exist_ok=True)
+        with open(self._fingerprint_file(), "w") as f:
+            json.dump(fingerprints, f, indent=1, sort_keys=True)
+
+    def _hash_rows(self, rows):
+        values = [[str(row.get(col, "")) for col in RAW_COLUMNS] for row in rows]
+        return hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()
+
+    def _fingerprint(self, rows):
+        """
+        Fingerprints a scraped list page by page.
+
+        Args:
+            rows (list): Row dicts of the whole list, in site order.
+
+        Returns:
+            dict: Row count, and the hash of every page.
+        """
+        return {
+            "rows": len(rows),
+            "pages": [self._hash_rows(rows[start:start + self.page_size]) for start in range(0, len(rows), self.page_size)],
+        }
+
+    def _check(self, job, previous):
+        """
+        Decides whether a job's list changed since its fingerprint was taken, using at most four requests.
+
+        The first and last page are always compared. A new or removed result anywhere in the list shifts every
+        row after it, so it always changes the last page. An edit that keeps the row count (a corrected mark
+        or name) only changes its own page, so one middle page is compared per refresh, in rotation: such an
+        edit deep in a list of n pages is picked up within n - 2 refreshes, not at the next one.
+
+        Args:
+            job (tuple): The scrape job.
+            previous (dict or None): Stored fingerprint of the job.
+
+        Returns:
+            tuple: (changed, first page rows or None if the first page could not be fetched).
+        """
+        try:
+            head = self.scraper.fetch_page(job, 1)
+            if previous is None or "pages" not in previous or self._hash_rows(head) != previous["pages"][0]:
+                return True, head
+
+            hashes = previous["pages"]
+            pages = len(hashes)
+            checked = [pages] if pages > 1 else []
+            if pages > 2:
+                checked.insert(0, 2 + self.status["refreshes"] % (pages - 2))
+            for page in checked:
+                time.sleep(self.scraper.page_delay)
+                if self._hash_rows(self.scraper.fetch_page(job, page)) != hashes[page - 1]:
+                    return True, head
+
+            # A full last page may have spilled onto a new page
+            if previous["rows"] and previous["rows"] % self.page_size == 0:
+                time.sleep(self.scraper.page_delay)
+                if self.scraper.fetch_page(job, pages + 1):
+                    return True, head
+            return False, head
+        except Exception:
+            # Let the scraper's own retries and dead-lettering deal with it
+            return True, None
+
+    # --- Refresh ---
+
+    def _load_frames(self, year):
+        """
+        Loads the combined files of a season from disk.
+
+        Args:
+            year (int): The season.
+
+        Returns:
+            dict: Combined file name mapped to its DataFrame.
+        """
+        year_dir = os.path.join("data", "processing", "combined", "seasons", str(year))
+        if not os.path.exists(year_dir):
+            return {}
+        frames = {}
+        for name in sorted(f for f in os.listdir(year_dir) if is_csv(f)):
+            try:
+                frames[name] = self.ingestor.read(os.path.join(year_dir, name))
+            except Exception as e:
+                print(f"[DAEMON] Error reading {name}: {e}")
+        return frames
+
+    def _check_date_formats(self):
+        """
+        Verifies that every in-memory frame stores `date` and `dob` the way the combined files do.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a frame holds a date in another form, which would mix formats in the season dataset.
+        """
+        for name, df in self.frames.items():
+            for col in ["date", "dob"]:
+                if col not in df.columns:
+                    continue
+                values = df[col].dropna().astype(str)
+                invalid = values[~values.str.fullmatch(DATE_PATTERN)]
+                if len(invalid):
+                    raise ValueError(f"{name} has {len(invalid)} {col} values not in YYYY-MM-DD form, e.g. '{invalid.iloc[0]}'")
+
+    def _read_raw(self, job):
+        path = self.scraper.output_path(job)
+        if not os.path.exists(path):
+            return []
+        return pd.read_csv(path, dtype=str, keep_default_na=False).to_dict("records")
+
+    def refresh(self):
+        """
+        Refreshes the current season, scraping and reprocessing only the lists that changed.
+
+        Every job's list is checked by its first, last, and one rotating middle page (see `_check`). Changed jobs
+        are scraped (resuming after the already-fetched first page), only their discipline groups are preprocessed
+        again, and the season dataset is rewritten from the in-memory frames.
+
+        Returns:
+            dict: Counts and timing of the refresh.
+        """
+        start = time.perf_counter()
+        self.scraper.refresh_dates()
+        year = self.scraper.current_year
+        if year != self.year:
+            self.year = year
+            self.frames = self._load_frames(year)
+
+        jobs = self.scraper.build_jobs("seasons", year)
+        fingerprints = self._load_fingerprints()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            checks = list(executor.map(lambda job: self._check(job, fingerprints.get(JobStore.job_key(job))), jobs))
+
+        changed = []
+        for job, (is_changed, head) in zip(jobs, checks):
+            if not is_changed:
+                continue
+            if head is not None:
+                # The first page is already fetched; scrape_event resumes after it
+                with self.scraper.lock:
+                    self.scraper.progress[job] = {"page": 2, "data": head, "error": None}
+            changed.append(job)
+        print(f"[DAEMON] {len(changed)} of {len(jobs)} lists changed for {year}")
+
+        scraped = []
+        dead = self.scraper.run_jobs("seasons", changed, self.max_workers, on_success=scraped.append)
+        for job in scraped:
+            fingerprints[JobStore.job_key(job)] = self._fingerprint(self._read_raw(job))
+        self._save_fingerprints(fingerprints)
+
+        groups = {
+            (str(year), gender, type_slug, self.preprocessor.normalize_discipline(discipline_slug))
+            for gender, _, discipline_slug, type_slug, _, _, _ in scraped
+        }
+        if groups:
+            files_by_key = self.preprocessor._get_files_by_key("seasons") or {}
+            sketch_store = SketchStore("seasons") if self.preprocessor.sketches else None
+            for key in sorted(groups):
+                if key not in files_by_key:
+                    continue
+                result = self.preprocessor.process_group("seasons", key, files_by_key[key], sketch_store)
+                if result is not None:
+                    # Read back as written, so the frame matches the ones loaded from disk (string dates)
+                    output_path = result[0]
+                    self.frames[os.path.basename(output_path)] = self.ingestor.read(output_path)
+            if sketch_store is not None:
+                sketch_store.save()
+            if self.frames:
+                self._check_date_formats()
+                self.generator.save_season(year, [self.frames[name] for name in sorted(self.frames)], {})
+
+        if groups or self.state is None:
+            self._publish()
+
+        summary = {
+            "year": year,
+            "jobs": len(jobs),
+            "changed": len(changed),
+            "scraped": len(scraped),
+            "dead_lettered": len(dead),
+            "groups_rebuilt": len(groups),
+            "seconds": round(time.perf_counter() - start, 2),
+            "finished": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.status.update({"year": year, "refreshes": self.status["refreshes"] + 1, "last_refresh": summary})
+        print(f"[DAEMON] Refresh finished in {summary['seconds']}s: {summary}")
+        return summary
+
+    # --- Queries ---
+
+    def _publish(self):
+        """
+        Rebuilds the query state from the in-memory frames and swaps it in.
+
+        Returns:
+            None
+        """
+        lists = {}
+        tables = []
+        for name, df in sorted(self.frames.items()):
+            parts = strip_csv_suffix(name).split("_", 3)
+            if len(parts) != 4:
+                continue
+            _, sex, type_slug, discipline = parts
+            df = df.copy()
+            df["mark_numeric"] = pd.to_numeric(df["mark_numeric"], errors="coerce")
+            df = df[np.isfinite(df["mark_numeric"])]
+            df = df.drop_duplicates(subset=[c for c in DEDUPE_COLUMNS if c in df.columns]).reset_index(drop=True)
+            # Rank on the integer marks where present, so equal marks tie exactly
+            mark = "mark_int" if "mark_int" in df.columns else "mark_numeric"
+            df.insert(0, "overall_rank", df[mark].rank(method="min", ascending=type_slug in Preprocessor.ascending_types).astype(int))
+            lists[(sex, discipline)] = df
+            tables.append(df)
+
+        athletes = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(columns=["competitor"])
+        names = athletes["competitor"].astype(str).str.lower()
+        self.state = {
+            "lists": lists,
+            "athletes": athletes,
+            "by_name": {name: idx for name, idx in names.groupby(names).indices.items()},
+            "rows": len(athletes),
+        }
+
+    @staticmethod
+    def _records(df):
+        return json.loads(df.to_json(orient="records"))
+
+    def top(self, sex, discipline, n=10, best_only=False):
+        """
+        Returns the top of a current-season list from memory.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            n (int): Number of rows. Defaults to 10.
+            best_only (bool): Keep only each athlete's best mark. Defaults to False.
+
+        Returns:
+            list or None: Row dicts, or None if the list is unknown.
+        """
+        df = self.state["lists"].get((sex, discipline)) if self.state else None
+        if df is None:
+            return None
+        if best_only:
+            df = df.drop_duplicates(subset=[c for c in ["competitor", "dob"] if c in df.columns])
+        return self._records(df.head(n))
+
+    def athlete(self, name, limit=500):
+        """
+        Returns the current-season performances of an athlete, by exact or partial (case-insensitive) name.
+
+        Args:
+            name (str): Athlete name or part of it.
+            limit (int): Maximum number of performances. Defaults to 500.
+
+        Returns:
+            dict: Matching names and their performances.
+        """
+        state = self.state
+        if state is None:
+            return {"matches": [], "performances": []}
+        query = name.strip().lower()
+        matches = [query] if query in state["by_name"] else sorted(n for n in state["by_name"] if query in n)[:20]
+        if not matches:
+            return {"matches": [], "performances": []}
+        rows = np.concatenate([state["by_name"][m] for m in matches])
+        df = state["athletes"].iloc[np.sort(rows)[:limit]]
+        return {"matches": sorted(df["competitor"].astype(str).unique()), "performances": self._records(df)}
+
+    def handle(self, request_path):
+        """
+        Builds the response for a query path.
+
+        Args:
+            request_path (str): Path and query string, e.g. "/top?sex=male&discipline=100-metres&n=10".
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable payload).
+        """
+        start = time.perf_counter()
+        parsed = urlparse(request_path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        if parsed.path == "/status":
+            state = self.state
+            return 200, dict(self.status, rows=state["rows"] if state else 0, lists=len(state["lists"]) if state else 0)
+        if self.state is None:
+            return 503, {"error": "No data loaded yet"}
+
+        if parsed.path == "/top":
+            if not params.get("discipline"):
+                return 400, {"error": "discipline is required"}
+            try:
+                n = int(params.get("n", 10))
+            except ValueError:
+                n = 0
+            if n < 1:
+                return 400, {"error": f"n must be a positive integer, got '{params['n']}'"}
+            rows = self.top(params.get("sex", "male"), params["discipline"], n, params.get("best") in ("1", "true"))
+            if rows is None:
+                return 404, {"error": f"No {self.year} list for {params.get('sex', 'male')} {params['discipline']}"}
+            payload = {"year": self.year, "rows": rows}
+        elif parsed.path == "/athlete":
+            if not params.get("name"):
+                return 400, {"error": "name is required"}
+            payload = dict(self.athlete(params["name"]), year=self.year)
+        else:
+            return 404, {"error": "Unknown endpoint; use /top, /athlete, or /status"}
+
+        payload["query_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return 200, payload
+
+    def _make_handler(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    status, payload = daemon.handle(self.path)
+                except Exception as e:
+                    status, payload = 500, {"error": repr(e)}
+                body = json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    # --- Lifecycle ---
+
+    def run(self):
+        """
+        Serves queries on a background thread and refreshes the current season every `interval` seconds until interrupted.
+
+        Returns:
+            None
+        """
+        self.year = self.scraper.current_year
+        self.frames = self._load_frames(self.year)
+        if self.frames:
+            self._publish()
+
+        server = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        server.start()
+        host, port = self.httpd.server_address[:2]
+        print(f"[DAEMON] Serving /top, /athlete, and /status at http://{host}:{port} ({len(self.frames)} lists loaded)")
+
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"[DAEMON] Refresh failed: {repr(e)}")
+                self.stop_event.wait(self.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stops refreshing and serving."""
+        self.stop_event.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
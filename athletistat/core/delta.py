@@ -0,0 +1,196 @@
+import os
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from athletistat.core.ingest import CSVIngestor, csv_filename, strip_csv_suffix, write_csv
+
+# Columns that identify one performance. age_cat is included because the same result is listed once per
+# age-category list it appears in (e.g. senior and u20). The discipline is the normalized one, so a result
+# scraped under an alias slug (e.g. 110m-hurdles and 110-metres-hurdles) keeps its identity.
+IDENTITY_COLUMNS = ["competitor", "dob", "nationality", "normalized_discipline", "sex", "age_cat", "date", "venue", "position"]
+
+# Columns left out of the change comparison. Ranks shift for every row below a new result,
+# so including them would flag most of the list as changed on every build.
+IGNORED_COLUMNS = ["rank", "rank_legal", "rank_athlete"]
+
+class DeltaTracker:
+    """Computes added, removed, and changed performances between two builds of a dataset file."""
+    def __init__(self, ingestor=None, compression=None, chunksize=500_000):
+        """
+        Initializes the tracker with its reading layer and sidecar settings.
+
+        Args:
+            ingestor (CSVIngestor or None): CSV reading layer used to stream the previous build. Defaults to a CSVIngestor.
+            compression (str or None): Compression of the delta sidecar files, "zstd" or "gzip". Defaults to None.
+            chunksize (int): Rows per chunk when streaming the previous build. Defaults to 500,000.
+        """
+        self.ingestor = ingestor or CSVIngestor()
+        self.compression = compression
+        self.chunksize = chunksize
+        self.build_id = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+
+    def _hash_rows(self, df, seen_counts=None):
+        """
+        Hashes each row into a stable row id and a content hash.
+
+        Identical identities get an occurrence number folded into the row id, so exact duplicates stay distinct.
+
+        Args:
+            df (pd.DataFrame): Rows to hash.
+            seen_counts (pd.Series or None): Occurrences per identity hash from earlier chunks of the same file.
+
+        Returns:
+            tuple: (row ids as uint64 ndarray, content hashes as uint64 ndarray, updated occurrence counts).
+        """
+        identity_cols = [c for c in IDENTITY_COLUMNS if c in df.columns]
+        content_cols = [c for c in df.columns if c not in IGNORED_COLUMNS]
+
+        identity = pd.util.hash_pandas_object(df[identity_cols], index=False)
+        occurrence = identity.groupby(identity).cumcount().astype("int64")
+        if seen_counts is not None and not seen_counts.empty:
+            occurrence = occurrence + identity.map(seen_counts).fillna(0).astype("int64")
+
+        row_ids = pd.util.hash_pandas_object(
+            pd.DataFrame({"identity": identity.values, "occurrence": occurrence.values}), index=False
+        ).values
+        content = pd.util.hash_pandas_object(df[content_cols], index=False).values
+
+        counts = identity.value_counts().astype("int64")
+        seen_counts = counts if seen_counts is None else seen_counts.add(counts, fill_value=0).astype("int64")
+        return row_ids, content, seen_counts
+
+    def compute(self, new_df, previous_path):
+        """
+        Diffs a freshly generated dataset against the previous build on disk.
+
+        The new build is already in memory; the previous one is streamed in chunks and only its
+        removed rows are kept, so both full versions are never held at once.
+
+        Args:
+            new_df (pd.DataFrame): The dataset about to be written.
+            previous_path (str): Path of the previous build of the same file.
+
+        Returns:
+            pd.DataFrame: Delta rows with a leading `change` ("added", "removed", "changed") and `row_id` column.
+        """
+        new_ids, new_content, _ = self._hash_rows(new_df)
+        new_index = pd.Index(new_ids)
+        matched_in_new = np.zeros(len(new_df), dtype=bool)
+        changed_positions = []
+        removed_parts = []
+
+        seen_counts = None
+        for chunk in self.ingestor.iter_chunks(previous_path, chunksize=self.chunksize):
+            old_ids, old_content, seen_counts = self._hash_rows(chunk, seen_counts)
+            positions = new_index.get_indexer(old_ids)
+            found = positions != -1
+
+            if (~found).any():
+                removed = chunk[~found].copy()
+                removed.insert(0, "row_id", old_ids[~found])
+                removed_parts.append(removed)
+
+            matched = positions[found]
+            matched_in_new[matched] = True
+            changed_positions.append(matched[new_content[matched] != old_content[found]])
+
+        parts = []
+        added = new_df[~matched_in_new].copy()
+        added.insert(0, "row_id", new_ids[~matched_in_new])
+        parts.append(("added", added))
+
+        changed_positions = np.concatenate(changed_positions) if changed_positions else np.array([], dtype=int)
+        changed = new_df.iloc[np.sort(changed_positions)].copy()
+        changed.insert(0, "row_id", new_ids[np.sort(changed_positions)])
+        parts.append(("changed", changed))
+
+        if removed_parts:
+            parts.append(("removed", pd.concat(removed_parts, ignore_index=True)))
+
+        frames = []
+        for change, frame in parts:
+            frame.insert(0, "change", change)
+            frames.append(frame)
+        delta = pd.concat(frames, ignore_index=True)
+        delta["row_id"] = delta["row_id"].map(lambda value: f"{int(value):016x}")
+        return delta
+
+    def write_delta(self, delta, dataset_path):
+        """
+        Writes a delta as a sidecar file in a `deltas/` folder next to the dataset.
+
+        Args:
+            delta (pd.DataFrame): Output of `compute`.
+            dataset_path (str): Path of the dataset the delta belongs to.
+
+        Returns:
+            str: Path of the written sidecar, relative to the dataset's directory.
+        """
+        dataset_dir, dataset_name = os.path.split(dataset_path)
+        delta_dir = os.path.join(dataset_dir, "deltas")
+        os.makedirs(delta_dir, exist_ok=True)
+
+        delta_name = csv_filename(f"{strip_csv_suffix(dataset_name)}.delta_{self.build_id}", self.compression)
+        write_csv(delta, os.path.join(delta_dir, delta_name))
+        return os.path.join("deltas", delta_name)
+
+    def summarize(self, delta):
+        """
+        Counts delta rows per change kind.
+
+        Args:
+            delta (pd.DataFrame or None): Output of `compute`, or None for a first build.
+
+        Returns:
+            dict: {"added": int, "removed": int, "changed": int}
+        """
+        counts = {"added": 0, "removed": 0, "changed": 0}
+        if delta is not None:
+            counts.update({k: int(v) for k, v in delta["change"].value_counts().items()})
+        return counts
+
+    def update_manifest(self, dataset_dir, entries):
+        """
+        Records this build in the directory's manifest and in a per-build copy under `deltas/`.
+
+        Entries for files not rebuilt in this run are carried over unchanged.
+
+        Args:
+            dataset_dir (str): Dataset directory (e.g. data/datasets/seasons).
+            entries (dict): Dataset file name mapped to its manifest entry.
+
+        Returns:
+            str: Path of the manifest.
+        """
+        manifest_path = os.path.join(dataset_dir, "manifest.json")
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+
+        # Drop entries for files that no longer exist (e.g. rewritten under another compression)
+        files = {
+            name: entry for name, entry in manifest.get("files", {}).items()
+            if os.path.exists(os.path.join(dataset_dir, name))
+        }
+        files.update(entries)
+        manifest = {
+            "build_id": self.build_id,
+            "previous_build_id": manifest.get("build_id"),
+            "identity_columns": IDENTITY_COLUMNS,
+            "ignored_columns": IGNORED_COLUMNS,
+            "files": files,
+        }
+
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        delta_dir = os.path.join(dataset_dir, "deltas")
+        os.makedirs(delta_dir, exist_ok=True)
+        with open(os.path.join(delta_dir, f"manifest_{self.build_id}.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        return manifest_path
@@ -0,0 +1,364 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix
+from athletistat.core.memory import MemoryBudget
+from athletistat.core.preprocessing import Preprocessor
+
+# Dataset columns exported as integer codes into a sorted code table; -1 marks a missing value
+CATEGORICAL_FEATURES = {
+    "normalized_discipline": "int16",
+    "sex": "int8",
+    "type": "int8",
+    "age_cat": "int8",
+    "nationality": "int16",
+}
+
+# Numeric features and their array dtypes; NaN (or -1 for integers) marks a missing or unparseable value
+NUMERIC_FEATURES = {
+    "mark_numeric": "float64",
+    "mark_int": "int32",
+    "wind": "float32",
+    "wind_int": "int16",
+    "mark_flags": "uint8",
+    "age_at_event": "float32",
+    "season": "int16",
+}
+
+# Integer features where -1 is not available or is a valid value, and what marks a missing value instead.
+# 0 is a valid `mark_flags` value (no flags), so missing flags use a value outside the flag bits.
+INTEGER_MISSING = {
+    "wind_int": int(np.iinfo(np.int16).min),
+    "mark_flags": int(np.iinfo(np.uint8).max),
+}
+
+def missing_value(column):
+    """
+    Returns the value that marks a missing entry in a numeric feature array.
+
+    Args:
+        column (str): Numeric feature name.
+
+    Returns:
+        int or None: -1 or the column's INTEGER_MISSING value for integers. None for floats, whose missing
+        entries are NaN, which has no JSON form; the schema records this as `"missing_is_nan": true`.
+    """
+    if not np.issubdtype(np.dtype(NUMERIC_FEATURES[column]), np.integer):
+        return None
+    return INTEGER_MISSING.get(column, -1)
+
+
+class FeatureExporter:
+    """Exports the generated datasets as memory-mappable per-column NumPy arrays with code tables and a JSON schema."""
+    def __init__(self, mode="seasons", output_dir="data/features", ingestor=None, memory=None):
+        """
+        Initializes the exporter.
+
+        Args:
+            mode (str): "seasons", "all-time", or "both". Defaults to "seasons".
+            output_dir (str): Root of the exported arrays; each mode gets a subdirectory. Defaults to "data/features".
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor with default settings.
+            memory (MemoryBudget or None): Memory budget used to size the read chunks. Defaults to None (no limit).
+        """
+        self.mode = mode
+        self.output_dir = output_dir
+        self.ingestor = ingestor or CSVIngestor()
+        self.memory = memory or MemoryBudget()
+        self.preprocessor = Preprocessor(mode="seasons", sketches=False)
+
+    def _source_files(self, current_mode):
+        """
+        Lists the dataset files a mode is exported from: the per-season files oldest first, or the all-time file.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            list: Dataset file paths.
+        """
+        dataset_dir = os.path.join("data", "datasets", current_mode)
+        if not os.path.isdir(dataset_dir):
+            return []
+        if current_mode == "seasons":
+            names = sorted(
+                (f for f in os.listdir(dataset_dir)
+                 if is_csv(f) and f.split("_")[0].isdigit() and strip_csv_suffix(f).endswith("_track_field_performances")),
+                key=lambda f: int(f.split("_")[0]),
+            )
+        else:
+            names = [f for f in os.listdir(dataset_dir) if is_csv(f) and strip_csv_suffix(f) == "top_track_field_performances_all_time"]
+        return [os.path.join(dataset_dir, f) for f in names]
+
+    def _chunks(self, path, usecols):
+        """
+        Streams the given columns of a dataset file; columns the file lacks come back as all-missing.
+
+        Args:
+            path (str): Dataset file.
+            usecols (list): Columns to load.
+
+        Yields:
+            pd.DataFrame: Chunks with exactly `usecols`.
+        """
+        header = self.ingestor.read_header(path)
+        present = [c for c in usecols if c in header]
+        for chunk in self.ingestor.iter_chunks(path, chunksize=self.memory.chunk_rows(path), usecols=present):
+            yield chunk.reindex(columns=usecols)
+
+    def _scan(self, paths):
+        """
+        First pass: counts the rows and collects the values of every categorical column.
+
+        Args:
+            paths (list): Dataset files.
+
+        Returns:
+            tuple: (rows per file, {column: sorted list of values}).
+        """
+        rows = []
+        values = {column: set() for column in CATEGORICAL_FEATURES}
+        for path in paths:
+            count = 0
+            for chunk in self._chunks(path, list(CATEGORICAL_FEATURES)):
+                count += len(chunk)
+                for column in CATEGORICAL_FEATURES:
+                    values[column].update(chunk[column].dropna().astype("str").unique())
+            rows.append(count)
+        return rows, {column: sorted(found) for column, found in values.items()}
+
+    def _encode(self, chunk, column, categories):
+        """
+        Encodes a chunk's categorical column against its code table.
+
+        Args:
+            chunk (pd.DataFrame): Dataset rows.
+            column (str): Categorical column.
+            categories (list): Sorted code table of the column.
+
+        Returns:
+            np.ndarray: Codes; -1 for missing values.
+        """
+        codes = pd.Categorical(chunk[column].astype("str").where(chunk[column].notna()), categories=categories).codes
+        return codes.astype(CATEGORICAL_FEATURES[column])
+
+    def _numeric(self, chunk, column):
+        """
+        Converts a chunk's numeric column to its array dtype.
+
+        Args:
+            chunk (pd.DataFrame): Dataset rows.
+            column (str): Numeric column.
+
+        Returns:
+            np.ndarray: Values; `missing_value(column)` for missing values, and NaN for every missing or
+            non-finite float, e.g. the `inf` mark_numeric of an unparseable mark.
+        """
+        dtype = NUMERIC_FEATURES[column]
+        if column == "wind":
+            values = self.preprocessor.parse_wind(chunk["wind"])
+        else:
+            values = pd.to_numeric(chunk[column], errors="coerce")
+        if np.issubdtype(np.dtype(dtype), np.integer):
+            return values.fillna(missing_value(column)).to_numpy(dtype=dtype)
+        values = values.to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    def export(self, current_mode):
+        """
+        Writes one `.npy` file per feature, a `codes/{column}.json` table per categorical feature, and `schema.json`.
+
+        The files are read twice, chunk by chunk: once to count rows and build the sorted code tables, and once
+        to fill the pre-sized arrays through `np.lib.format.open_memmap`. The export is built in a temporary
+        directory and swapped in when complete, so readers never see a partial export.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            str or None: Directory of the export, or None if there was nothing to export.
+        """
+        paths = self._source_files(current_mode)
+        if not paths:
+            print(f"[FEATURES] No {current_mode} datasets found in data/datasets/{current_mode}")
+            return None
+
+        rows_per_file, categories = self._scan(paths)
+        total = sum(rows_per_file)
+        if not total:
+            print(f"[FEATURES] The {current_mode} datasets have no rows")
+            return None
+        for column, table in categories.items():
+            if len(table) > np.iinfo(CATEGORICAL_FEATURES[column]).max:
+                raise ValueError(f"{len(table)} {column} categories do not fit in {CATEGORICAL_FEATURES[column]} codes")
+
+        target_dir = os.path.join(self.output_dir, current_mode)
+        building_dir = f"{target_dir}.tmp"
+        shutil.rmtree(building_dir, ignore_errors=True)
+        os.makedirs(os.path.join(building_dir, "codes"))
+
+        arrays = {}
+        for column, dtype in {**CATEGORICAL_FEATURES, **NUMERIC_FEATURES}.items():
+            arrays[column] = np.lib.format.open_memmap(
+                os.path.join(building_dir, f"{column}.npy"), mode="w+", dtype=dtype, shape=(total,)
+            )
+
+        offset = 0
+        for path in paths:
+            for chunk in self._chunks(path, list(CATEGORICAL_FEATURES) + list(NUMERIC_FEATURES)):
+                end = offset + len(chunk)
+                for column in CATEGORICAL_FEATURES:
+                    arrays[column][offset:end] = self._encode(chunk, column, categories[column])
+                for column in NUMERIC_FEATURES:
+                    arrays[column][offset:end] = self._numeric(chunk, column)
+                offset = end
+
+        for array in arrays.values():
+            array.flush()
+        del arrays
+
+        for column, table in categories.items():
+            with open(os.path.join(building_dir, "codes", f"{column}.json"), "w") as f:
+                json.dump(table, f, indent=1)
+
+        schema = {
+            "mode": current_mode,
+            "rows": total,
+            "columns": {
+                **{
+                    column: {"file": f"{column}.npy", "dtype": dtype, "kind": "categorical", "missing": -1,
+                             "codes": f"codes/{column}.json", "categories": len(categories[column])}
+                    for column, dtype in CATEGORICAL_FEATURES.items()
+                },
+                **{
+                    column: {"file": f"{column}.npy", "dtype": dtype, "kind": "numeric", "missing": missing_value(column),
+                             "missing_is_nan": missing_value(column) is None}
+                    for column, dtype in NUMERIC_FEATURES.items()
+                },
+            },
+            "sources": [
+                {"file": os.path.basename(path), "rows": rows, "offset": sum(rows_per_file[:i])}
+                for i, (path, rows) in enumerate(zip(paths, rows_per_file))
+            ],
+        }
+        with open(os.path.join(building_dir, "schema.json"), "w") as f:
+            json.dump(schema, f, indent=1)
+
+        # Swap the finished export in place of the previous one
+        previous_dir = f"{target_dir}.old"
+        shutil.rmtree(previous_dir, ignore_errors=True)
+        if os.path.exists(target_dir):
+            os.replace(target_dir, previous_dir)
+        os.replace(building_dir, target_dir)
+        shutil.rmtree(previous_dir, ignore_errors=True)
+
+        print(f"[FEATURES] Exported {total:,} {current_mode} rows to {target_dir}/")
+        return target_dir
+
+    def run(self):
+        """
+        Exports the configured mode(s).
+
+        Returns:
+            None
+        """
+        modes = ["seasons", "all-time"] if self.mode == "both" else [self.mode]
+        for current_mode in modes:
+            self.export(current_mode)
+
+
+class FeatureSet:
+    """Zero-copy reader of an export written by `FeatureExporter`."""
+    def __init__(self, mode="seasons", feature_dir="data/features"):
+        """
+        Opens an export's schema. Arrays are memory-mapped on access, so processes reading the same export
+        share its pages.
+
+        Args:
+            mode (str): "seasons" or "all-time". Defaults to "seasons".
+            feature_dir (str): Root of the exports. Defaults to "data/features".
+
+        Raises:
+            FileNotFoundError: If the mode has not been exported.
+        """
+        self.path = os.path.join(feature_dir, mode)
+        with open(os.path.join(self.path, "schema.json"), "r") as f:
+            self.schema = json.load(f)
+        self._categories = {}
+
+    def __len__(self):
+        return self.schema["rows"]
+
+    def column(self, name):
+        """
+        Memory-maps one feature array read-only.
+
+        Args:
+            name (str): Feature name, e.g. "mark_numeric".
+
+        Returns:
+            np.memmap: The column.
+
+        Raises:
+            KeyError: If the feature was not exported.
+        """
+        return np.load(os.path.join(self.path, self.schema["columns"][name]["file"]), mmap_mode="r")
+
+    def columns(self, names=None):
+        """
+        Memory-maps several feature arrays.
+
+        Args:
+            names (list or None): Feature names. Defaults to None (every feature).
+
+        Returns:
+            dict: Feature name mapped to its array.
+        """
+        return {name: self.column(name) for name in (names or self.schema["columns"])}
+
+    def categories(self, name):
+        """
+        Returns the code table of a categorical feature; code i stands for `categories(name)[i]`.
+
+        Args:
+            name (str): Categorical feature name.
+
+        Returns:
+            list: Category labels.
+        """
+        if name not in self._categories:
+            with open(os.path.join(self.path, self.schema["columns"][name]["codes"]), "r") as f:
+                self._categories[name] = json.load(f)
+        return self._categories[name]
+
+    def code(self, name, label):
+        """
+        Looks up the code of a category label, e.g. to filter rows with `column(name) == code`.
+
+        Args:
+            name (str): Categorical feature name.
+            label (str): Category label.
+
+        Returns:
+            int: The code, or -1 if the label does not occur.
+        """
+        table = self.categories(name)
+        index = int(np.searchsorted(table, label))
+        return index if index < len(table) and table[index] == label else -1
+
+    def decode(self, name, codes):
+        """
+        Converts codes of a categorical feature back to labels.
+
+        Args:
+            name (str): Categorical feature name.
+            codes (np.ndarray): Codes.
+
+        Returns:
+            np.ndarray: Object array of labels; None for -1.
+        """
+        table = np.array(self.categories(name) + [None], dtype=object)
+        return table[np.asarray(codes)]
@@ -1,17 +1,201 @@
 import os
+import json
 import glob
+import shutil
+import hashlib
 import pandas as pd
 
+from athletistat.core.delta import DeltaTracker
+from athletistat.core.memory import MemoryBudget, format_size
+from athletistat.core.ingest import (
+    CSVIngestor, check_compression, csv_filename, find_csv, is_csv, open_segment, open_text,
+    remove_stale_variants, strip_csv_suffix, write_csv,
+)
+
 class DatasetGenerator:
     """Generates and combines track and field datasets from processed CSV files."""
-    def __init__(self, mode="both"):
+    def __init__(self, mode="both", ingestor=None, compression=None, deltas=False, memory=None):
         """
         Initializes the dataset generator with the specific running mode.
         
         Args:
             mode (str): "seasons", "all-time", or "both". Defaults to "both".
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor with default settings.
+            compression (str or None): Output compression, "zstd" or "gzip". Defaults to None (plain CSV).
+            deltas (bool): Whether to write a delta sidecar against the previous build and a build manifest. Defaults to False.
+            memory (MemoryBudget or None): Memory budget used to size chunks and to stream seasons that would not fit
+                in memory. Defaults to None (no limit).
         """
+        check_compression(compression)
         self.mode = mode
+        self.ingestor = ingestor or CSVIngestor()
+        self.compression = compression
+        self.memory = memory or MemoryBudget()
+        self.delta_tracker = DeltaTracker(ingestor=self.ingestor, compression=compression) if deltas else None
+
+    def _save_dataset(self, df, output_filename, manifest_entries):
+        """
+        Writes a generated dataset, first diffing it against the previous build when deltas are enabled.
+
+        Args:
+            df (pd.DataFrame): Dataset to write.
+            output_filename (str): Destination path.
+            manifest_entries (dict): Collects the manifest entry for this file when deltas are enabled.
+
+        Returns:
+            None
+        """
+        if self.delta_tracker is None:
+            write_csv(df, output_filename)
+            return
+
+        # The previous build must be read before it is overwritten
+        previous_path = find_csv(strip_csv_suffix(output_filename))
+        delta = self.delta_tracker.compute(df, previous_path) if previous_path else None
+
+        write_csv(df, output_filename)
+
+        # No sidecar when nothing changed; the zero counts in the manifest say so
+        entry = {"rows": len(df), "bytes": os.path.getsize(output_filename), "delta": None}
+        if delta is not None and not delta.empty:
+            entry["delta"] = self.delta_tracker.write_delta(delta, output_filename)
+        entry.update(self.delta_tracker.summarize(delta))
+        manifest_entries[os.path.basename(output_filename)] = entry
+
+        if delta is not None:
+            print(f"  └─ Delta: {entry['added']} added, {entry['removed']} removed, {entry['changed']} changed")
+
+    def save_season(self, year, dataframes, manifest_entries):
+        """
+        Concatenates a season's combined discipline frames and writes the season dataset.
+
+        Args:
+            year (int or str): The season.
+            dataframes (list): Combined discipline frames, in file name order.
+            manifest_entries (dict): Collects the manifest entry for this file when deltas are enabled.
+
+        Returns:
+            str: Path of the written dataset.
+        """
+        combined_df = pd.concat(dataframes, ignore_index=True)
+        output_filename = self.season_output_path(year)
+        os.makedirs(os.path.dirname(output_filename), exist_ok=True)
+
+        self._save_dataset(combined_df, output_filename, manifest_entries)
+        print(f"Success: Saved {year} data to {output_filename}")
+        return output_filename
+
+    def season_output_path(self, year):
+        """
+        Builds the path of a season dataset under the configured compression.
+
+        Args:
+            year (int or str): The season.
+
+        Returns:
+            str: e.g. "data/datasets/seasons/2025_track_field_performances.csv.zst".
+        """
+        return os.path.join("data/datasets/seasons", csv_filename(f"{year}_track_field_performances", self.compression))
+
+    def stream_season(self, year, paths):
+        """
+        Writes a season dataset by streaming its combined discipline files chunk by chunk, for seasons too large
+        to concatenate in memory.
+
+        Args:
+            year (int or str): The season.
+            paths (list): Combined discipline files, in file name order.
+
+        Returns:
+            str or None: Path of the written dataset, or None if no file could be read.
+        """
+        # Union of columns in first-seen order, as pd.concat would produce
+        columns = []
+        for path in paths:
+            try:
+                columns.extend(c for c in self.ingestor.read_header(path) if c not in columns)
+            except Exception as e:
+                print(f"Error reading {os.path.basename(path)}: {e}")
+
+        output_filename = self.season_output_path(year)
+        os.makedirs(os.path.dirname(output_filename), exist_ok=True)
+        write_header = True
+        with open_text(output_filename, "w") as out:
+            for path in paths:
+                try:
+                    for chunk in self.ingestor.iter_chunks(path, chunksize=self.memory.chunk_rows(path)):
+                        chunk.reindex(columns=columns).to_csv(out, header=write_header, index=False)
+                        write_header = False
+                except Exception as e:
+                    print(f"Error reading {os.path.basename(path)}: {e}")
+
+        if write_header:
+            os.remove(output_filename)
+            print(f"No readable CSV files found for {year}")
+            return None
+        remove_stale_variants(output_filename)
+        print(f"Success: Saved {year} data to {output_filename}")
+        return output_filename
+
+    def _input_fingerprint(self, paths):
+        """
+        Hashes the names and bytes of a season's combined discipline files.
+
+        The Preprocessor rewrites every combined file on each run, so mtimes change even when the content does not;
+        the content hash only changes when a file was added, removed, or actually modified.
+
+        Args:
+            paths (list): Combined discipline files, in file name order.
+
+        Returns:
+            str: SHA-1 hex digest.
+        """
+        digest = hashlib.sha1()
+        for path in paths:
+            digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _load_season_inputs(self, manifest_path):
+        """
+        Loads the input fingerprints recorded for the season datasets.
+
+        Args:
+            manifest_path (str): Path of season_inputs.json.
+
+        Returns:
+            dict: Season mapped to {"file", "inputs"}; empty if there is none or it cannot be read.
+        """
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable {manifest_path}: {e}")
+            return {}
+
+    def _season_is_current(self, year, fingerprint, season_inputs):
+        """
+        Checks whether a season dataset was built from combined files with the same content as now.
+
+        Args:
+            year (str): The season.
+            fingerprint (str): `_input_fingerprint` of the season's current combined files.
+            season_inputs (dict): Fingerprints recorded by earlier runs.
+
+        Returns:
+            bool: True if the season dataset can be kept as it is.
+        """
+        output_filename = self.season_output_path(year)
+        recorded = season_inputs.get(str(year))
+        return (
+            os.path.exists(output_filename) and recorded is not None
+            and recorded.get("file") == os.path.basename(output_filename) and recorded.get("inputs") == fingerprint
+        )
 
     def generate_datasets(self, mode):
         """
@@ -26,36 +210,50 @@ class DatasetGenerator:
         combined_dir = f"data/processing/combined/{mode}"
         output_dataset_dir = f"data/datasets/{mode}"
         os.makedirs(output_dataset_dir, exist_ok=True)
+        manifest_entries = {}
 
         if mode == "seasons":
             if not os.path.exists(combined_dir):
                 print(f"Directory {combined_dir} does not exist.")
                 return
 
+            inputs_path = os.path.join(output_dataset_dir, "season_inputs.json")
+            season_inputs = self._load_season_inputs(inputs_path)
+
             year_dirs = [d for d in os.listdir(combined_dir) if os.path.isdir(os.path.join(combined_dir, d))]
             for year in year_dirs:
                 year_path = os.path.join(combined_dir, year)
-                csv_files = [f for f in os.listdir(year_path) if f.endswith(".csv")]
-                all_dataframes = []
-                
-                # Read files in folder
-                for file in csv_files:
-                    file_path = os.path.join(year_path, file)
-                    try:
-                        df = pd.read_csv(file_path)
-                        all_dataframes.append(df)
-                    except Exception as e:
-                        print(f"Error reading {file}: {e}")
-                        
-                # Combine and save
-                if all_dataframes:
-                    combined_df = pd.concat(all_dataframes, ignore_index=True)
-                    output_filename = os.path.join(output_dataset_dir, f"{year}_track_field_performances.csv")
-                    
-                    combined_df.to_csv(output_filename, index=False)
-                    print(f"Success: Saved {year} data to {output_filename}")
+                csv_files = sorted(f for f in os.listdir(year_path) if is_csv(f))
+                paths = [os.path.join(year_path, f) for f in csv_files]
+                fingerprint = self._input_fingerprint(paths) if csv_files else None
+
+                # Rewriting an unchanged season would also invalidate its segment of the combined file
+                if csv_files and self._season_is_current(year, fingerprint, season_inputs):
+                    print(f"Skipping {year}: season dataset is up to date")
+                    continue
+
+                estimate = self.memory.frame_bytes(paths) if csv_files else 0
+                if not self.memory.fits(estimate) and self.delta_tracker is None:
+                    print(f"[MEMORY] {year} estimated at {format_size(estimate)}; streaming it instead of loading it")
+                    output_filename = self.stream_season(year, paths)
                 else:
-                    print(f"No CSV files found in {year_path}")
+                    if not self.memory.fits(estimate):
+                        print(f"[MEMORY] {year} estimated at {format_size(estimate)} exceeds the budget, but deltas need the full frame")
+
+                    # Read files in folder concurrently
+                    all_dataframes = self.ingestor.read_many(paths)
+
+                    # Combine and save
+                    output_filename = None
+                    if all_dataframes:
+                        output_filename = self.save_season(year, all_dataframes, manifest_entries)
+                    else:
+                        print(f"No CSV files found in {year_path}")
+
+                if output_filename is not None:
+                    season_inputs[str(year)] = {"file": os.path.basename(output_filename), "inputs": fingerprint}
+                    with open(inputs_path, "w") as f:
+                        json.dump(season_inputs, f, indent=1, sort_keys=True)
         
         else:
             if not os.path.exists(combined_dir):
@@ -63,32 +261,85 @@ class DatasetGenerator:
                 return
 
             # List all CSV files
-            csv_files = [f for f in os.listdir(combined_dir) if f.endswith(".csv")]
+            csv_files = sorted(f for f in os.listdir(combined_dir) if is_csv(f))
 
-            # Load and concatenate
-            all_dataframes = []
-            for file in csv_files:
-                try:
-                    df = pd.read_csv(os.path.join(combined_dir, file))
-                    all_dataframes.append(df)
-                except Exception as e:
-                    print(f"Error reading {file}: {e}")
+            # Load concurrently and concatenate
+            all_dataframes = self.ingestor.read_many([os.path.join(combined_dir, f) for f in csv_files])
             if all_dataframes:
                 # Combine into a single DataFrame
                 combined_df = pd.concat(all_dataframes, ignore_index=True)
                 combined_df.drop_duplicates(inplace=True)
 
                 # Save to a new CSV
-                output_filename = os.path.join(output_dataset_dir, "top_track_field_performances_all_time.csv")
-                combined_df.to_csv(output_filename, index=False)
+                output_filename = os.path.join(output_dataset_dir, csv_filename("top_track_field_performances_all_time", self.compression))
+                self._save_dataset(combined_df, output_filename, manifest_entries)
                 print(f"Combined CSV saved as {output_filename}" )
             else:
                 print(f"No CSV files found in {combined_dir}")
 
+        if self.delta_tracker is not None and manifest_entries:
+            manifest_path = self.delta_tracker.update_manifest(output_dataset_dir, manifest_entries)
+            print(f"Build manifest saved as {manifest_path}")
+
+    def _load_combined_manifest(self, manifest_path):
+        """
+        Loads the segment manifest of the combined seasons file.
+
+        Args:
+            manifest_path (str): Path of combined_manifest.json.
+
+        Returns:
+            dict or None: The manifest, or None if there is none or it cannot be read.
+        """
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable {manifest_path}: {e}")
+            return None
+
+    def _reusable_segments(self, manifest, dataset_dir, sources, columns):
+        """
+        Counts the leading segments of the existing combined file that can be kept as they are.
+
+        Segments are kept up to the first season whose file was added, removed, or modified since the last
+        combine. Nothing is kept if the column layout or compression changed, or if the combined file no longer
+        ends where the manifest says it does (e.g. an interrupted append).
+
+        Args:
+            manifest (dict or None): The previous segment manifest.
+            dataset_dir (str): Directory of the season datasets.
+            sources (list): Segment entries of the current season files, oldest first.
+            columns (list): Column layout of the combined file.
+
+        Returns:
+            int: Number of segments to keep.
+        """
+        if manifest is None or manifest.get("compression") != self.compression or manifest.get("columns") != columns:
+            return 0
+        previous_path = os.path.join(dataset_dir, manifest["file"])
+        segments = manifest.get("segments", [])
+        if not os.path.exists(previous_path) or os.path.getsize(previous_path) != (segments[-1]["end"] if segments else 0):
+            return 0
+
+        keep = 0
+        for previous, current in zip(segments, sources):
+            if any(previous.get(field) != current[field] for field in ("file", "size", "mtime_ns")):
+                break
+            keep += 1
+        return keep
+
     def combine_seasons(self):
         """
         Combines all available season datasets into a single aggregated CSV file covering all years.
-        
+
+        The combined file is a series of per-season segments whose byte ranges are recorded in
+        `combined_manifest.json`. Only the segments from the earliest changed season onwards are rewritten: the
+        file is truncated there and the remaining seasons are appended, so refreshing the current season costs
+        about as much as that season's size. Compressed segments are independent gzip members or zstd frames.
+
         Returns:
             None
         """
@@ -100,37 +351,95 @@ class DatasetGenerator:
             print(f"Directories {dataset_dir} do not exist.")
             return
 
-        # List CSV files directly inside the Year folder
-        csv_files = [f for f in os.listdir(dataset_dir) if f.endswith("_track_field_performances.csv")]
-        all_dataframes = []
-
-        min_year = 9999
-        max_year = 0
-
-        # Get earliest year and latest year from season daatasets
-        for files in csv_files:
-            year_label = files.split("_")[0]
-            min_year = min(min_year, int(year_label))
-            max_year = max(max_year, int(year_label))
+        # List per-year season files, oldest first
+        csv_files = sorted(
+            f for f in os.listdir(dataset_dir)
+            if is_csv(f) and strip_csv_suffix(f).endswith("_track_field_performances") and f.split("_")[0].isdigit()
+        )
+        if not csv_files:
+            print(f"No CSV files found in {dataset_dir}")
+            return
 
+        # Get earliest year and latest year from season datasets
+        years = [int(f.split("_")[0]) for f in csv_files]
+        min_year, max_year = min(years), max(years)
 
-        # Loop through files and read them
+        # Union of columns in first-seen order, so every chunk is written with the same layout
+        columns = []
         for file in csv_files:
-            file_path = os.path.join(dataset_dir, file)
             try:
-                df = pd.read_csv(file_path)
-                all_dataframes.append(df)
+                columns.extend(c for c in self.ingestor.read_header(os.path.join(dataset_dir, file)) if c not in columns)
             except Exception as e:
                 print(f"Error reading {file}: {e}")
 
-        # Combine and Save
-        if all_dataframes:
-            combined_df = pd.concat(all_dataframes, ignore_index=True)
-            output_filename = os.path.join(dataset_dir, f"combined_track_field_performances_{min_year}_{max_year}.csv")
-            combined_df.to_csv(output_filename, index=False)
-            print(f"Success: Saved data to {output_filename}")
+        sources = []
+        for file in csv_files:
+            stat = os.stat(os.path.join(dataset_dir, file))
+            sources.append({"file": file, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+
+        output_filename = os.path.join(dataset_dir, csv_filename(f"combined_track_field_performances_{min_year}_{max_year}", self.compression))
+        manifest_path = os.path.join(dataset_dir, "combined_manifest.json")
+        manifest = self._load_combined_manifest(manifest_path)
+        keep = self._reusable_segments(manifest, dataset_dir, sources, columns)
+
+        if keep == len(sources) and len(manifest["segments"]) == keep and manifest["file"] == os.path.basename(output_filename):
+            print(f"Combined dataset {output_filename} is up to date")
+            return
+
+        if keep:
+            # The year range is part of the name; a new season renames the file before it is appended to
+            previous_path = os.path.join(dataset_dir, manifest["file"])
+            if previous_path != output_filename:
+                os.replace(previous_path, output_filename)
+            segments = manifest["segments"][:keep]
+            offset = segments[-1]["end"]
         else:
-            print(f"No CSV files found in {dataset_dir}")
+            if manifest is not None and manifest.get("file") != os.path.basename(output_filename):
+                previous_path = os.path.join(dataset_dir, manifest["file"])
+                if os.path.exists(previous_path):
+                    os.remove(previous_path)
+            segments = []
+            offset = 0
+        if keep < len(sources):
+            print(f"Combining seasons: keeping {keep} of {len(sources)} segments, rewriting from {years[keep]}")
+
+        # Record the truncated state first, so an interrupted append is detected by the size check next time
+        with open(manifest_path, "w") as f:
+            json.dump({"file": os.path.basename(output_filename), "compression": self.compression,
+                       "columns": columns, "segments": segments}, f, indent=1)
+
+        # Stream each season into its segment chunk by chunk instead of concatenating in memory;
+        # the header belongs to whichever segment starts the file
+        write_header = offset == 0
+        with open(output_filename, "r+b" if offset else "wb") as raw:
+            raw.seek(offset)
+            raw.truncate()
+            for source in sources[keep:]:
+                segment = dict(source, start=raw.tell())
+                try:
+                    path = os.path.join(dataset_dir, source["file"])
+                    with open_segment(raw, output_filename) as out:
+                        for chunk in self.ingestor.iter_chunks(path, chunksize=self.memory.chunk_rows(path)):
+                            chunk.reindex(columns=columns).to_csv(out, header=write_header, index=False)
+                            write_header = False
+                except Exception as e:
+                    print(f"Error reading {source['file']}: {e}")
+                    # A partial segment is kept but marked so the next combine rewrites it
+                    segment["size"] = None
+                segment["end"] = raw.tell()
+                segments.append(segment)
+
+        if write_header:
+            os.remove(output_filename)
+            os.remove(manifest_path)
+            print(f"No readable CSV files found in {dataset_dir}")
+            return
+
+        with open(manifest_path, "w") as f:
+            json.dump({"file": os.path.basename(output_filename), "compression": self.compression,
+                       "columns": columns, "segments": segments}, f, indent=1)
+        remove_stale_variants(output_filename)
+        print(f"Success: Saved data to {output_filename}")
 
     def run(self, combine=False):
         """
@@ -153,14 +462,22 @@ class DatasetGenerator:
 
 class DatasetSplitter:
     """Splits unified track and field datasets into more granular subsets by event type, discipline, and gender."""
-    def __init__(self, mode="both"):
+    def __init__(self, mode="both", ingestor=None, compression=None, memory=None):
         """
         Initializes the dataset splitter with the targeted dataset mode.
         
         Args:
             mode (str): "seasons", "all-time", or "both". Defaults to "both".
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor with default settings.
+            compression (str or None): Output compression, "zstd" or "gzip". Defaults to None (plain CSV).
+            memory (MemoryBudget or None): Memory budget; datasets estimated above it are split in a streaming pass
+                instead of being loaded whole. Defaults to None (no limit).
         """
+        check_compression(compression)
         self.mode = mode
+        self.ingestor = ingestor or CSVIngestor()
+        self.compression = compression
+        self.memory = memory or MemoryBudget()
 
     def get_filename_with_years(self, base_name, df, is_seasons):
         """
@@ -172,32 +489,129 @@ class DatasetSplitter:
             is_seasons (bool): Whether the dataset is season-based.
         
         Returns:
-            str: Filename appended with min-max years if applicable.
+            str: Filename appended with min-max years if applicable, with the configured compression extension.
         """
         if is_seasons and "season" in df.columns:
             valid_seasons = df["season"].dropna()
             if not valid_seasons.empty:
-                min_yr = int(valid_seasons.min())
-                max_yr = int(valid_seasons.max())
-                
-                suffix = f"_{min_yr}" if min_yr == max_yr else f"_{min_yr}-{max_yr}"
-                return f"{base_name}{suffix}.csv"
+                return self._filename_for_range(base_name, int(valid_seasons.min()), int(valid_seasons.max()))
                 
-        return f"{base_name}.csv"
+        return csv_filename(base_name, self.compression)
 
-    def split_dataset(self, df, mode_dir, is_seasons=False):
+    def _filename_for_range(self, base_name, min_yr=None, max_yr=None):
         """
-        Splits a DataFrame by event type, discipline, and gender.
-        
+        Builds a split filename from a season range, as `get_filename_with_years` does from a frame.
+
         Args:
-            df (pd.DataFrame): Dataset to split.
-            mode_dir (str): Output directory mode ("seasons" or "all-time").
-            is_seasons (bool): Whether the dataset is season-based.
-        
+            base_name (str): Base filename.
+            min_yr (int or None): Earliest season, or None for no year suffix.
+            max_yr (int or None): Latest season.
+
         Returns:
-            None
+            str: Filename with the year suffix and the configured compression extension.
+        """
+        if min_yr is None:
+            return csv_filename(base_name, self.compression)
+        suffix = f"_{min_yr}" if min_yr == max_yr else f"_{min_yr}-{max_yr}"
+        return csv_filename(f"{base_name}{suffix}", self.compression)
+
+    @staticmethod
+    def partition_hash(df):
+        """
+        Hashes a partition's column names and values, independent of its index and of how it would be compressed.
+
+        Args:
+            df (pd.DataFrame): Partition to hash.
+
+        Returns:
+            str: Hex SHA-1 digest.
+        """
+        digest = hashlib.sha1()
+        digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        return digest.hexdigest()
+
+    def _load_split_manifest(self, mode_dir):
+        """
+        Loads the manifest of split files a previous run wrote under a mode directory.
+
+        Args:
+            mode_dir (str): Output directory of the mode.
+
+        Returns:
+            dict: Path relative to `mode_dir` mapped to {"hash", "rows"}; empty if there is no readable manifest.
+        """
+        manifest_path = os.path.join(mode_dir, "split_manifest.json")
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, "r") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable {manifest_path}: {e}")
+            return {}
+
+    def _write_partition(self, df, filepath, mode_dir, previous, entries):
+        """
+        Writes a split file unless the same content is already on disk from a previous run.
+
+        Skipping unchanged partitions keeps their bytes and mtimes, so downstream caches and rsync leave them alone.
+
+        Args:
+            df (pd.DataFrame): Partition to write.
+            filepath (str): Destination path.
+            mode_dir (str): Output directory of the mode; manifest keys are relative to it.
+            previous (dict): Manifest entries of the previous run.
+            entries (dict): Collects this run's manifest entries.
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged.
+        """
+        key = os.path.relpath(filepath, mode_dir).replace(os.sep, "/")
+        entry = {"hash": self.partition_hash(df), "rows": len(df)}
+        entries[key] = entry
+
+        if previous.get(key, {}).get("hash") == entry["hash"] and os.path.exists(filepath):
+            return False
+        write_csv(df, filepath)
+        return True
+
+    def _finish_manifest(self, mode_dir, previous, entries):
+        """
+        Deletes split files a previous run wrote that this run no longer produces, and saves the new manifest.
+
+        Only files listed in the previous manifest are removed, so anything else under `mode_dir` is left alone.
+
+        Args:
+            mode_dir (str): Output directory of the mode.
+            previous (dict): Manifest entries of the previous run.
+            entries (dict): Manifest entries of this run.
+
+        Returns:
+            int: Number of obsolete files removed.
+        """
+        pruned = 0
+        for key in previous:
+            path = os.path.join(mode_dir, key)
+            if key not in entries and os.path.exists(path):
+                os.remove(path)
+                pruned += 1
+
+        with open(os.path.join(mode_dir, "split_manifest.json"), "w") as f:
+            json.dump({"files": dict(sorted(entries.items()))}, f, indent=1)
+        return pruned
+
+    def _partitions(self, df, mode_dir):
+        """
+        Enumerates the split files of a dataset, or of one chunk of it.
+
+        Args:
+            df (pd.DataFrame): Dataset or chunk to split.
+            mode_dir (str): Output directory of the mode.
+
+        Yields:
+            tuple: (output directory, base file name without year suffix, partition rows).
         """
-        
         individual_df = df[df["type"] != "relays"]
         relay_df = df[df["type"] == "relays"].copy()
 
@@ -205,16 +619,12 @@ class DatasetSplitter:
         if cols_to_drop:
             relay_df = relay_df.drop(columns=cols_to_drop)
 
-        # --- 1. Save global-level splits ---
+        # --- 1. Global-level splits ---
         global_out = os.path.join(mode_dir,"split_global")
-        os.makedirs(global_out, exist_ok=True)
-        
-        ind_filename = self.get_filename_with_years("individual_events", individual_df, is_seasons)
-        individual_df.to_csv(os.path.join(global_out, ind_filename), index=False)
+        yield global_out, "individual_events", individual_df
         
         if not relay_df.empty:
-            relay_filename = self.get_filename_with_years("relay_events", relay_df, is_seasons)
-            relay_df.to_csv(os.path.join(global_out, relay_filename), index=False)
+            yield global_out, "relay_events", relay_df
 
         genders = df["sex"].dropna().unique()
 
@@ -228,26 +638,144 @@ class DatasetSplitter:
             relay_output_dir = os.path.join(mode_dir, gender, "relays")
 
             if not gender_individual.empty:
-                os.makedirs(type_output_dir, exist_ok=True)
                 for event_type, df_group in gender_individual.groupby("type"):
-                    filename = self.get_filename_with_years(event_type, df_group, is_seasons)
-                    filepath_type = os.path.join(type_output_dir, filename)
-                    df_group.to_csv(filepath_type, index=False)
+                    yield type_output_dir, event_type, df_group
 
-                os.makedirs(discipline_output_dir, exist_ok=True)
                 for discipline, df_group in gender_individual.groupby("normalized_discipline"):
-                    filename = self.get_filename_with_years(discipline, df_group, is_seasons)
-                    filepath_disc = os.path.join(discipline_output_dir, filename)
-                    df_group.to_csv(filepath_disc, index=False)
+                    yield discipline_output_dir, discipline, df_group
 
             if not gender_relay.empty:
-                os.makedirs(relay_output_dir, exist_ok=True)
                 for discipline, df_group in gender_relay.groupby("normalized_discipline"):
-                    filename = self.get_filename_with_years(discipline, df_group, is_seasons)
-                    filepath_relay = os.path.join(relay_output_dir, filename)
-                    df_group.to_csv(filepath_relay, index=False)
+                    yield relay_output_dir, discipline, df_group
+
+    def split_dataset(self, df, mode_dir, is_seasons=False):
+        """
+        Splits a DataFrame by event type, discipline, and gender.
+
+        Partitions whose content hash matches `split_manifest.json` are not rewritten, and files from earlier runs
+        that are no longer produced (e.g. after the year range in their name shifted) are removed.
+        
+        Args:
+            df (pd.DataFrame): Dataset to split.
+            mode_dir (str): Output directory mode ("seasons" or "all-time").
+            is_seasons (bool): Whether the dataset is season-based.
+        
+        Returns:
+            None
+        """
+        os.makedirs(mode_dir, exist_ok=True)
+        previous = self._load_split_manifest(mode_dir)
+        entries = {}
+        written = 0
+
+        for directory, base_name, df_part in self._partitions(df, mode_dir):
+            os.makedirs(directory, exist_ok=True)
+            filename = self.get_filename_with_years(base_name, df_part, is_seasons)
+            written += self._write_partition(df_part, os.path.join(directory, filename), mode_dir, previous, entries)
+
+        pruned = self._finish_manifest(mode_dir, previous, entries)
+        print(f"  └─ Successfully generated aggregated splits for: {mode_dir.upper()} "
+              f"({written} written, {len(entries) - written} unchanged, {pruned} obsolete removed)")
+
+    def split_streaming(self, filepath, mode_dir, is_seasons=False, chunksize=500_000):
+        """
+        Splits a dataset file chunk by chunk, for datasets too large to load whole.
+
+        Each chunk's partitions are appended to staging files under `{mode_dir}/.split_staging`, while the
+        partition's row count, season range, and content hash are accumulated. Every column is read with the
+        fixed dtype of `CSVIngestor.file_dtypes`, as `split_file` also does for in-memory splits, so the row
+        hashes match the ones `split_dataset` computes on the whole frame. Unchanged partitions are still
+        recognized and their staging copies discarded.
+
+        Args:
+            filepath (str): Dataset file to split.
+            mode_dir (str): Output directory mode ("seasons" or "all-time").
+            is_seasons (bool): Whether the dataset is season-based.
+            chunksize (int): Rows per chunk. Defaults to 500,000.
+
+        Returns:
+            None
+        """
+        os.makedirs(mode_dir, exist_ok=True)
+        previous = self._load_split_manifest(mode_dir)
+        staging_dir = os.path.join(mode_dir, ".split_staging")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        parts = {}
+
+        dtypes = self.ingestor.file_dtypes(filepath)
+        for chunk in self.ingestor.iter_chunks(filepath, chunksize=chunksize, dtypes=dtypes):
+            for directory, base_name, df_part in self._partitions(chunk, mode_dir):
+                part = parts.get((directory, base_name))
+                if part is None:
+                    staging = os.path.join(staging_dir, os.path.relpath(directory, mode_dir), csv_filename(base_name, self.compression))
+                    os.makedirs(os.path.dirname(staging), exist_ok=True)
+                    digest = hashlib.sha1()
+                    digest.update("\x1f".join(map(str, df_part.columns)).encode("utf-8"))
+                    part = parts[(directory, base_name)] = {
+                        "staging": staging, "digest": digest, "rows": 0, "header": False, "min": None, "max": None,
+                    }
+                elif df_part.empty:
+                    continue
+
+                # Each append is its own gzip member / zstd frame, which reads back as one stream
+                with open(part["staging"], "ab") as raw, open_segment(raw, part["staging"]) as out:
+                    df_part.to_csv(out, header=not part["header"], index=False)
+                part["header"] = True
+                part["digest"].update(pd.util.hash_pandas_object(df_part, index=False).values.tobytes())
+                part["rows"] += len(df_part)
+
+                if is_seasons and "season" in df_part.columns:
+                    valid_seasons = df_part["season"].dropna()
+                    if not valid_seasons.empty:
+                        low, high = int(valid_seasons.min()), int(valid_seasons.max())
+                        part["min"] = low if part["min"] is None else min(part["min"], low)
+                        part["max"] = high if part["max"] is None else max(part["max"], high)
+
+        entries = {}
+        written = 0
+        for (directory, base_name), part in parts.items():
+            filepath_out = os.path.join(directory, self._filename_for_range(base_name, part["min"], part["max"]))
+            key = os.path.relpath(filepath_out, mode_dir).replace(os.sep, "/")
+            entries[key] = {"hash": part["digest"].hexdigest(), "rows": part["rows"]}
+
+            if previous.get(key, {}).get("hash") == entries[key]["hash"] and os.path.exists(filepath_out):
+                os.remove(part["staging"])
+                continue
+            os.makedirs(directory, exist_ok=True)
+            os.replace(part["staging"], filepath_out)
+            remove_stale_variants(filepath_out)
+            written += 1
+
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        pruned = self._finish_manifest(mode_dir, previous, entries)
+        print(f"  └─ Successfully generated aggregated splits for: {mode_dir.upper()} "
+              f"({written} written, {len(entries) - written} unchanged, {pruned} obsolete removed)")
+
+    def split_file(self, filepath, mode_dir, is_seasons=False):
+        """
+        Splits a dataset file, streaming it when its estimated in-memory size exceeds the memory budget.
+
+        Columns are read with fixed dtypes (`CSVIngestor.file_dtypes`) on both paths, so a file gets the same
+        partition hashes whether it is split in memory or streamed.
+
+        Args:
+            filepath (str): Dataset file to split.
+            mode_dir (str): Output directory mode ("seasons" or "all-time").
+            is_seasons (bool): Whether the dataset is season-based.
+
+        Returns:
+            None
+        """
+        estimate = self.memory.frame_bytes(filepath)
+        if self.memory.fits(estimate):
+            df = self.ingestor.read(filepath, dtypes=self.ingestor.file_dtypes(filepath))
+            self.split_dataset(df, mode_dir=mode_dir, is_seasons=is_seasons)
+            return
 
-        print(f"  └─ Successfully generated aggregated splits for: {mode_dir.upper()}")
+        # A chunk is split into several partition copies, so it gets a smaller share of the budget
+        chunksize = self.memory.chunk_rows(filepath, share=0.25)
+        print(f"[MEMORY] {filepath} estimated at {format_size(estimate)}; splitting in chunks of {chunksize:,} rows")
+        self.split_streaming(filepath, mode_dir=mode_dir, is_seasons=is_seasons, chunksize=chunksize)
 
     def execute_splits(self):
         """
@@ -258,20 +786,20 @@ class DatasetSplitter:
         """
         
         if self.mode in ["seasons", "both"]:
-            datasets_dir = os.path.join("seasons", "datasets")
+            datasets_dir = os.path.join("data", "datasets", "seasons")
             os.makedirs(datasets_dir, exist_ok=True)
 
             # Look for a single combined seasons file
-            filepath = os.path.join(datasets_dir, "combined_track_field_performances_*.csv")
-            matching_files = glob.glob(filepath)
+            filepath = os.path.join(datasets_dir, "combined_track_field_performances_*.csv*")
+            matching_files = [f for f in glob.glob(filepath) if is_csv(f)]
             
             # Generates combined dataset if not found (seasons)
             if not matching_files:
                 print(f"[SEASONS] Combined dataset not found at {filepath}. Running generator automatically...")
                 try:
-                    generator = DatasetGenerator(mode="seasons")
+                    generator = DatasetGenerator(mode="seasons", ingestor=self.ingestor, compression=self.compression, memory=self.memory)
                     generator.run(combine=True)
-                    matching_files = glob.glob(filepath) # Check again after running generator
+                    matching_files = [f for f in glob.glob(filepath) if is_csv(f)] # Check again after running generator
                 except Exception as e:
                     print(f"[ERROR] Generator failed to run: {e}")
                     return
@@ -280,34 +808,34 @@ class DatasetSplitter:
                 filepath = matching_files[0]
                 print(f"\n[SEASONS] Loading {filepath} for splitting...")
                 try:
-                    df = pd.read_csv(filepath)
-                    self.split_dataset(df, mode_dir="data/datasets/seasons", is_seasons=True)
+                    self.split_file(filepath, mode_dir="data/datasets/seasons", is_seasons=True)
                 except Exception as e:
                     print(f"Error reading {filepath}: {e}")
             else:
                 print("[SEASONS] Still no dataset found after running generator. Is there raw data to combine?")
 
         if self.mode in ["all-time", "both"]:
-            datasets_dir = os.path.join("all-time", "datasets")
+            datasets_dir = os.path.join("data", "datasets", "all-time")
             os.makedirs(datasets_dir, exist_ok=True)
             
-            filepath = os.path.join(datasets_dir, "top_track_field_performances_all_time.csv")
+            base_path = os.path.join(datasets_dir, "top_track_field_performances_all_time")
+            filepath = find_csv(base_path)
             
             # Generates combined dataset if not found (all-time)
-            if not os.path.exists(filepath):
-                print(f"[ALL-TIME] Combined dataset not found at {filepath}. Running generator automatically...")
+            if filepath is None:
+                print(f"[ALL-TIME] Combined dataset not found at {base_path}.csv. Running generator automatically...")
                 try:
-                    generator = DatasetGenerator(mode="all-time")
+                    generator = DatasetGenerator(mode="all-time", ingestor=self.ingestor, compression=self.compression, memory=self.memory)
                     generator.run()
+                    filepath = find_csv(base_path) # Check again after running generator
                 except Exception as e:
                     print(f"[ERROR] Generator failed to run: {e}")
                     return
 
-            if os.path.exists(filepath):
+            if filepath is not None:
                 print(f"\n[ALL-TIME] Loading {filepath} for splitting...")
                 try:
-                    df = pd.read_csv(filepath)
-                    self.split_dataset(df, mode_dir="data/datasets/all-time", is_seasons=False)
+                    self.split_file(filepath, mode_dir="data/datasets/all-time", is_seasons=False)
                 except Exception as e:
                      print(f"Error reading {filepath}: {e}")
             else:
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+
+import numpy as np
+
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix
+from athletistat.core.preprocessing import Preprocessor
+from athletistat.core.sketches import DEDUPE_COLUMNS
+
+class RankIndexBuilder:
+    """Writes the sorted per-list mark arrays and offsets table read by `rankindex.RankIndex`."""
+    def __init__(self, mode="both", input_root="data/processing/combined", index_dir="data/index", ingestor=None):
+        """
+        Initializes the builder.
+
+        Args:
+            mode (str): "both", "seasons", or "all-time". Defaults to "both".
+            input_root (str): Root of the Preprocessor's combined files. Defaults to "data/processing/combined".
+            index_dir (str): Directory the index files are written to. Defaults to "data/index".
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor.
+        """
+        self.mode = mode
+        self.input_root = input_root
+        self.index_dir = index_dir
+        self.ingestor = ingestor or CSVIngestor()
+
+    def _list_files(self, current_mode):
+        """
+        Finds the combined files of a mode and the list each one belongs to.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            list: (season label, sex, type_slug, discipline, path) tuples, sorted by path.
+        """
+        input_dir = os.path.join(self.input_root, current_mode)
+        files = []
+        for root, _, names in os.walk(input_dir):
+            for name in sorted(names):
+                if not is_csv(name):
+                    continue
+                # {year}_{gender}_{type_slug}_{discipline} for seasons, {gender}_{type_slug}_{discipline} for all-time
+                parts = strip_csv_suffix(name).split("_", 3 if current_mode == "seasons" else 2)
+                if current_mode == "seasons" and len(parts) == 4 and parts[0].isdigit():
+                    files.append((parts[0], parts[1], parts[2], parts[3], os.path.join(root, name)))
+                elif current_mode == "all-time" and len(parts) == 3:
+                    files.append(("all-time", parts[0], parts[1], parts[2], os.path.join(root, name)))
+        return sorted(files, key=lambda item: item[-1])
+
+    def build(self, current_mode):
+        """
+        Builds the index of one mode, one list at a time.
+
+        Performances repeated across age-category lists are counted once, and marks that could not be parsed are left out.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            str or None: Path of the offsets table, or None if there is no input.
+        """
+        files = self._list_files(current_mode)
+        if not files:
+            print(f"[INDEX] No combined files found in {os.path.join(self.input_root, current_mode)}")
+            return None
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        data_path = os.path.join(self.index_dir, f"{current_mode}.f64")
+        table_path = os.path.join(self.index_dir, f"{current_mode}.json")
+
+        entries = {}
+        offset = 0
+        # Written under temporary names and swapped in, so open readers keep a consistent pair
+        with open(data_path + ".tmp", "wb") as out:
+            for season, sex, type_slug, discipline, path in files:
+                header = self.ingestor.read_header(path)
+                if "mark_numeric" not in header:
+                    continue
+                df = self.ingestor.read(path, usecols=[c for c in header if c in DEDUPE_COLUMNS + ["mark_numeric"]])
+                df = df.drop_duplicates(subset=[c for c in DEDUPE_COLUMNS if c in df.columns])
+
+                marks = df["mark_numeric"].to_numpy(dtype="float64", na_value=np.nan)
+                marks = marks[np.isfinite(marks)]
+                ascending = type_slug in Preprocessor.ascending_types
+                keys = np.sort(marks if ascending else -marks)
+                keys.tofile(out)
+
+                # The type is part of the key, so disciplines normalized to the same name under two types stay apart
+                entries[f"{season}|{sex}|{type_slug}|{discipline}"] = {
+                    "type": type_slug, "ascending": ascending, "offset": offset, "length": len(keys),
+                }
+                offset += len(keys)
+
+        with open(table_path + ".tmp", "w") as f:
+            json.dump({"byteorder": sys.byteorder, "dtype": "float64", "entries": entries}, f, indent=1, sort_keys=True)
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(table_path + ".tmp", table_path)
+
+        print(f"[INDEX] {current_mode}: {len(entries)} lists, {offset} marks -> {data_path}")
+        return table_path
+
+    def run(self):
+        """
+        Builds the index for 'seasons', 'all-time', or both based on the selected mode.
+
+        Returns:
+            None
+        """
+        if self.mode in ["seasons", "both"]:
+            self.build("seasons")
+
+        if self.mode in ["all-time", "both"]:
+            self.build("all-time")
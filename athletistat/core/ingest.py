@@ -0,0 +1,328 @@
+import io
+import os
+import gzip
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Output compression codecs and the suffix appended after ".csv"
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+CSV_SUFFIXES = (".csv",) + tuple(f".csv{suffix}" for suffix in COMPRESSION_SUFFIXES.values())
+
+# Known columns of the preprocessed/generated datasets. Declaring them up front skips pandas'
+# per-column type inference, which dominates read time on the multi-hundred-MB season files.
+DTYPES = {
+    "rank": "Int64",
+    "mark": "str",
+    "wind": "str",
+    "competitor": "str",
+    "dob": "str",
+    "nationality": "str",
+    "position": "str",
+    "venue": "str",
+    "date": "str",
+    "result_score": "Int64",
+    "discipline": "str",
+    "type": "str",
+    "sex": "str",
+    "age_cat": "str",
+    "normalized_discipline": "str",
+    "track_field": "str",
+    "mark_numeric": "float64",
+    "nat_full": "str",
+    "venue_country": "str",
+    "age_at_event": "Int64",
+    "season": "Int64",
+    "mark_int": "Int32",
+    "wind_int": "Int16",
+    "mark_flags": "UInt8",
+    "rank_legal": "Int64",
+    "rank_athlete": "Int64",
+}
+
+def check_compression(compression):
+    """
+    Validates an output compression setting.
+
+    Args:
+        compression (str or None): "zstd", "gzip", or None for plain CSV.
+
+    Raises:
+        ValueError: If the codec is unknown.
+        ImportError: If "zstd" is requested but the zstandard package is not installed.
+    """
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression '{compression}'. Expected one of: {', '.join(COMPRESSION_SUFFIXES)}")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+
+
+def is_csv(filename):
+    """
+    Checks whether a filename is a plain or compressed CSV file.
+
+    Args:
+        filename (str): File name or path.
+
+    Returns:
+        bool: True for .csv, .csv.gz, and .csv.zst files.
+    """
+    return filename.endswith(CSV_SUFFIXES)
+
+
+def strip_csv_suffix(filename):
+    """
+    Removes the .csv extension and any compression suffix from a filename.
+
+    Args:
+        filename (str): File name or path.
+
+    Returns:
+        str: The filename without its CSV suffix, or unchanged if it has none.
+    """
+    # Longest suffix first so ".csv.gz" is not treated as ".csv"
+    for suffix in sorted(CSV_SUFFIXES, key=len, reverse=True):
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+
+def csv_filename(base_name, compression=None):
+    """
+    Builds a CSV filename with the extension matching the compression codec.
+
+    Args:
+        base_name (str): Filename or path without extension.
+        compression (str or None): "zstd", "gzip", or None.
+
+    Returns:
+        str: e.g. "2025_track_field_performances.csv.zst".
+    """
+    return f"{base_name}.csv{COMPRESSION_SUFFIXES.get(compression, '')}"
+
+
+def find_csv(base_name):
+    """
+    Finds an existing CSV file for a base path in any of the supported compressions.
+
+    Args:
+        base_name (str): Path without extension.
+
+    Returns:
+        str or None: The first existing path (plain CSV preferred), or None.
+    """
+    for suffix in CSV_SUFFIXES:
+        if os.path.exists(base_name + suffix):
+            return base_name + suffix
+    return None
+
+
+def remove_stale_variants(path):
+    """
+    Deletes copies of a CSV file written under a different compression, so readers don't pick up both.
+
+    Args:
+        path (str): The path that was just written.
+    """
+    base_name = strip_csv_suffix(path)
+    for suffix in CSV_SUFFIXES:
+        other = base_name + suffix
+        if other != path and os.path.exists(other):
+            os.remove(other)
+
+
+def open_text(path, mode="r"):
+    """
+    Opens a plain, gzip, or zstd CSV file as a text stream, picking the codec from the extension.
+
+    Writes go straight through the compressor, so no second in-memory copy of the data is made.
+
+    Args:
+        path (str): File path.
+        mode (str): "r", "w", or "a". Defaults to "r".
+
+    Returns:
+        file object: Text-mode handle suitable for the csv module and DataFrame.to_csv.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", newline="", encoding="utf-8")
+    if path.endswith(".zst"):
+        check_compression("zstd")
+        return zstandard.open(path, f"{mode}t", newline="", encoding="utf-8")
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+@contextlib.contextmanager
+def open_segment(raw, path):
+    """
+    Opens a text stream that writes one self-contained segment at the current position of an open binary file.
+
+    Compressed segments are complete gzip members or zstd frames. Readers decompress concatenated members and
+    frames as one stream, so a file can be truncated at a segment boundary and appended to without rewriting
+    what comes before.
+
+    Args:
+        raw (file object): Binary file opened for writing, positioned where the segment starts.
+        path (str): Path of the file, used to pick the codec from its extension.
+
+    Yields:
+        file object: Text-mode handle suitable for DataFrame.to_csv. `raw` stays open afterwards.
+    """
+    if path.endswith(".gz"):
+        stream = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+    elif path.endswith(".zst"):
+        check_compression("zstd")
+        stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+    else:
+        stream = raw
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        yield text
+    finally:
+        text.flush()
+        text.detach()
+        # Closing the compressor ends the member/frame; the underlying file is left open
+        if stream is not raw:
+            stream.close()
+
+
+def write_csv(df, path):
+    """
+    Writes a DataFrame as CSV, compressing according to the path's extension.
+
+    Gzip output is written with a fixed timestamp so identical data produces identical bytes.
+
+    Args:
+        df (pd.DataFrame): Data to write.
+        path (str): Destination path (.csv, .csv.gz, or .csv.zst).
+    """
+    if path.endswith(".gz"):
+        compression = {"method": "gzip", "mtime": 0}
+    elif path.endswith(".zst"):
+        check_compression("zstd")
+        compression = {"method": "zstd"}
+    else:
+        compression = None
+    df.to_csv(path, index=False, compression=compression)
+    remove_stale_variants(path)
+
+
+class CSVIngestor:
+    """Shared CSV reading layer: explicit dtypes, concurrent multi-file reads, and chunked streaming.
+
+    Compressed inputs (.csv.gz, .csv.zst) are detected from their extension and decompressed transparently.
+    """
+    def __init__(self, max_workers=None, engine=None, dtypes=None):
+        """
+        Initializes the ingestor with its thread count, CSV engine, and column dtypes.
+
+        Args:
+            max_workers (int or None): Threads used by `read_many`. Defaults to min(8, CPU count).
+            engine (str or None): pandas CSV engine. Defaults to "pyarrow" (multithreaded) when installed, otherwise "c".
+            dtypes (dict or None): Column dtypes to apply. Defaults to `DTYPES`.
+        """
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.engine = engine or ("pyarrow" if HAS_PYARROW else "c")
+        self.dtypes = DTYPES if dtypes is None else dtypes
+
+    def read_header(self, path):
+        """
+        Reads only the column names of a CSV file.
+
+        Args:
+            path (str): Path to the CSV file.
+
+        Returns:
+            list: Column names in file order.
+        """
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    def file_dtypes(self, path):
+        """
+        Fixes the dtype of every column of a file: the configured dtype, or str for columns it doesn't list.
+
+        Inferred dtypes depend on which rows are read together, so a column that is empty in the first chunk
+        of a file comes back as float64 there and as str later. Reading with these dtypes gives the same
+        values whether the file is read whole or in chunks.
+
+        Args:
+            path (str): Path to the CSV file.
+
+        Returns:
+            dict: Column name mapped to its dtype.
+        """
+        return {column: self.dtypes.get(column, "str") for column in self.read_header(path)}
+
+    def read(self, path, usecols=None, dtypes=None):
+        """
+        Reads a whole CSV file into a DataFrame.
+
+        Args:
+            path (str): Path to the CSV file.
+            usecols (list or None): Subset of columns to load. Defaults to all columns.
+            dtypes (dict or None): Column dtypes for this read, e.g. from `file_dtypes`. Defaults to the configured dtypes.
+
+        Returns:
+            pd.DataFrame: The loaded data.
+        """
+        return pd.read_csv(path, usecols=usecols, dtype=self.dtypes if dtypes is None else dtypes, engine=self.engine)
+
+    def read_many(self, paths, usecols=None):
+        """
+        Reads several CSV files concurrently, keeping the order of `paths`.
+
+        Files that fail to parse are reported and left out, matching the behaviour of the serial loops this replaces.
+
+        Args:
+            paths (list): Paths to the CSV files.
+            usecols (list or None): Subset of columns to load. Defaults to all columns.
+
+        Returns:
+            list: DataFrames of the files that were read successfully.
+        """
+        def _read(path):
+            try:
+                return self.read(path, usecols=usecols)
+            except Exception as e:
+                print(f"Error reading {os.path.basename(path)}: {e}")
+                return None
+
+        if len(paths) <= 1 or self.max_workers <= 1:
+            frames = [_read(path) for path in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+                frames = list(executor.map(_read, paths))
+
+        return [df for df in frames if df is not None]
+
+    def iter_chunks(self, path, chunksize=500_000, usecols=None, dtypes=None):
+        """
+        Streams a CSV file as a sequence of DataFrames.
+
+        The pyarrow engine cannot stream, so chunked reads always go through the C engine.
+
+        Args:
+            path (str): Path to the CSV file.
+            chunksize (int): Rows per chunk. Defaults to 500,000.
+            usecols (list or None): Subset of columns to load. Defaults to all columns.
+            dtypes (dict or None): Column dtypes for this read, e.g. from `file_dtypes`. Defaults to the configured dtypes.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the file.
+        """
+        dtypes = self.dtypes if dtypes is None else dtypes
+        with pd.read_csv(path, usecols=usecols, dtype=dtypes, engine="c", chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
@@ -0,0 +1,154 @@
+import os
+import json
+import heapq
+import threading
+from statistics import median
+
+class JobStats:
+    """Per-job page counts and durations from previous scrapes, used to schedule the longest jobs first."""
+    def __init__(self, path="queues/job_stats.json", smoothing=0.5, default_request_seconds=0.5):
+        """
+        Loads the stats store from disk.
+
+        Args:
+            path (str): Path to the JSON stats file. Defaults to "queues/job_stats.json".
+            smoothing (float): Weight of the newest run in the moving average (0-1). Defaults to 0.5.
+            default_request_seconds (float): Assumed response time per request for jobs without history. Defaults to 0.5.
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self.default_request_seconds = default_request_seconds
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.updated = set()
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r") as f:
+                self.stats = json.load(f)
+
+    @staticmethod
+    def job_key(job):
+        """
+        Builds the year-independent key of a scrape job.
+
+        Args:
+            job (tuple): (gender, age_category, discipline_slug, type_slug, output_dir, mode, year).
+
+        Returns:
+            str: "{mode}|{gender}|{age_category}|{type_slug}|{discipline_slug}".
+        """
+        gender, age_category, discipline_slug, type_slug, _, mode = job[:6]
+        return f"{mode}|{gender}|{age_category}|{type_slug}|{discipline_slug}"
+
+    def record(self, job, requests, seconds):
+        """
+        Folds a completed job's request count and duration into its moving averages.
+
+        Args:
+            job (tuple): The scrape job.
+            requests (int): Page requests made, including the final empty page.
+            seconds (float): Wall time of the job.
+
+        Returns:
+            None
+        """
+        key = self.job_key(job)
+        with self.lock:
+            previous = self.stats.get(key)
+            if previous is None:
+                self.stats[key] = {"requests": float(requests), "seconds": float(seconds), "runs": 1}
+            else:
+                a = self.smoothing
+                previous["requests"] = a * requests + (1 - a) * previous["requests"]
+                previous["seconds"] = a * seconds + (1 - a) * previous["seconds"]
+                previous["runs"] += 1
+            self.updated.add(key)
+
+    def save(self):
+        """
+        Writes the stats store to disk, merging in entries other processes saved since it was loaded.
+
+        Returns:
+            None
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            on_disk = {}
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, "r") as f:
+                    on_disk = json.load(f)
+            on_disk.update({key: self.stats[key] for key in self.updated})
+            self.stats = on_disk
+            with open(self.path, "w") as f:
+                json.dump(self.stats, f, indent=1, sort_keys=True)
+
+    def estimate(self, job, page_delay=1.5):
+        """
+        Estimates a job's request count and duration.
+
+        Jobs without history are assumed to need the median request count of known jobs in the same mode
+        (or 2 requests, one page plus the empty page that ends pagination).
+
+        Args:
+            job (tuple): The scrape job.
+            page_delay (float): Scraper sleep between pages, used for jobs without history. Defaults to 1.5.
+
+        Returns:
+            tuple: (requests, seconds, known) where known is False for a fallback estimate.
+        """
+        key = self.job_key(job)
+        entry = self.stats.get(key)
+        if entry is not None:
+            return entry["requests"], entry["seconds"], True
+
+        mode = key.split("|", 1)[0]
+        known = [e["requests"] for k, e in self.stats.items() if k.startswith(f"{mode}|")]
+        requests = median(known) if known else 2.0
+        seconds = requests * self.default_request_seconds + (requests - 1) * page_delay
+        return requests, seconds, False
+
+    def order(self, jobs, page_delay=1.5):
+        """
+        Sorts jobs longest-expected-first, so large events start early instead of finishing last.
+
+        Args:
+            jobs (list): Scrape jobs.
+            page_delay (float): Scraper sleep between pages. Defaults to 1.5.
+
+        Returns:
+            list: The jobs in scheduling order.
+        """
+        return sorted(jobs, key=lambda job: self.estimate(job, page_delay)[1], reverse=True)
+
+    def plan(self, jobs, max_workers, page_delay=1.5):
+        """
+        Estimates the total requests and wall time of running the jobs longest-first on a thread pool.
+
+        Args:
+            jobs (list): Scrape jobs.
+            max_workers (int): Number of threads.
+            page_delay (float): Scraper sleep between pages. Defaults to 1.5.
+
+        Returns:
+            dict: Job counts, total requests, serial seconds, estimated wall seconds, and the longest job.
+        """
+        estimates = [(self.estimate(job, page_delay), job) for job in self.order(jobs, page_delay)]
+
+        # Greedy longest-processing-time schedule: each job goes to the thread that frees up first
+        workers = [0.0] * max(1, min(max_workers, len(jobs) or 1))
+        heapq.heapify(workers)
+        for (requests, seconds, _), _job in estimates:
+            heapq.heappush(workers, heapq.heappop(workers) + seconds)
+
+        longest = estimates[0] if estimates else None
+        return {
+            "jobs": len(jobs),
+            "known": sum(1 for (_, _, known), _ in estimates if known),
+            "requests": round(sum(requests for (requests, _, _), _ in estimates)),
+            "serial_seconds": sum(seconds for (_, seconds, _), _ in estimates),
+            "wall_seconds": max(workers) if estimates else 0.0,
+            "longest_job": self.job_key(longest[1]) if longest else None,
+            "longest_seconds": longest[0][1] if longest else 0.0,
+        }
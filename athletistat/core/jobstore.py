@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import sqlite3
+import contextlib
+
+class JobStore:
+    """SQLite-backed scrape job queue that several scraper processes or hosts can lease jobs from."""
+    def __init__(self, path="queues/jobs.sqlite", lease_seconds=300, max_attempts=5):
+        """
+        Opens (and creates if needed) the shared job store.
+
+        The default rollback journal is used rather than WAL, because WAL needs shared memory and is
+        not safe on network filesystems, which is where a store shared between hosts usually lives.
+
+        Args:
+            path (str): Path to the SQLite database file. Defaults to "queues/jobs.sqlite".
+            lease_seconds (float): How long a lease stays valid without a heartbeat. Defaults to 300.
+            max_attempts (int): Leases per job before it is marked failed for the run. Defaults to 5.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    run_key TEXT NOT NULL,
+                    job_key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    priority REAL NOT NULL DEFAULT 0,
+                    not_before REAL,
+                    updated REAL,
+                    PRIMARY KEY (run_key, job_key)
+                );
+                CREATE INDEX IF NOT EXISTS jobs_status ON jobs (run_key, status);
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_key TEXT PRIMARY KEY,
+                    finalized_by TEXT,
+                    finalized_at REAL
+                );
+            """)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the store safe to use from any thread
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conn.execute("PRAGMA busy_timeout = 60000")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def job_key(job):
+        """
+        Builds the stable key of a scrape job tuple.
+
+        Args:
+            job (tuple): (gender, age_category, discipline_slug, type_slug, output_dir, mode, year).
+
+        Returns:
+            str: Key unique within a run.
+        """
+        gender, age_category, discipline_slug, type_slug = job[:4]
+        return f"{gender}|{age_category}|{type_slug}|{discipline_slug}"
+
+    def seed(self, run_key, jobs, priorities=None):
+        """
+        Adds a run's jobs to the store. Jobs that are already present (seeded by another worker) are left untouched,
+        except failed ones: run keys of historical seasons persist across invocations, so a new invocation puts
+        the jobs that used up their attempts in an earlier one back in the queue with fresh attempts.
+
+        Args:
+            run_key (str): Identifier of the run, e.g. "seasons:2022".
+            jobs (list): Scrape job tuples.
+            priorities (list or None): Per-job priority, parallel to `jobs`; higher is leased first. Defaults to None (all 0).
+
+        Returns:
+            int: Number of jobs newly inserted or requeued.
+        """
+        now = time.time()
+        priorities = priorities or [0.0] * len(jobs)
+        rows = [(run_key, self.job_key(job), json.dumps(list(job)), priority, now) for job, priority in zip(jobs, priorities)]
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_key, job_key, payload, priority, updated) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, worker = NULL, lease_expires = NULL, not_before = NULL, "
+                "updated = ? WHERE run_key = ? AND status = 'failed'",
+                (now, run_key),
+            )
+            conn.execute("COMMIT")
+            return conn.total_changes - before
+
+    def lease(self, run_key, worker_id):
+        """
+        Atomically leases one pending job, or one whose lease expired because its worker stopped heartbeating.
+        Pending jobs released with a retry delay are skipped until the delay has passed.
+
+        Args:
+            run_key (str): Identifier of the run.
+            worker_id (str): Identifier of the leasing worker.
+
+        Returns:
+            tuple or None: The job tuple, or None if nothing is available right now.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # Jobs whose worker died on their last allowed attempt are given up on
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', worker = NULL, lease_expires = NULL, updated = ? "
+                "WHERE run_key = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, run_key, now, self.max_attempts),
+            )
+            row = conn.execute(
+                """
+                SELECT job_key, payload FROM jobs
+                WHERE run_key = ? AND (
+                    (status = 'pending' AND (not_before IS NULL OR not_before <= ?))
+                    OR (status = 'leased' AND lease_expires < ?)
+                )
+                ORDER BY attempts, priority DESC, rowid LIMIT 1
+                """,
+                (run_key, now, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1,
+                    not_before = NULL, updated = ?
+                WHERE run_key = ? AND job_key = ?
+                """,
+                (worker_id, now + self.lease_seconds, now, run_key, row[0]),
+            )
+            conn.execute("COMMIT")
+        return tuple(json.loads(row[1]))
+
+    def heartbeat(self, run_key, worker_id):
+        """
+        Extends every lease currently held by a worker.
+
+        Args:
+            run_key (str): Identifier of the run.
+            worker_id (str): Identifier of the worker.
+
+        Returns:
+            int: Number of leases renewed.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE run_key = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, run_key, worker_id),
+            )
+            return cursor.rowcount
+
+    def complete(self, run_key, job, worker_id):
+        """
+        Marks a leased job as done.
+
+        Args:
+            run_key (str): Identifier of the run.
+            job (tuple): The job tuple.
+            worker_id (str): Worker that held the lease.
+
+        Returns:
+            None
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', lease_expires = NULL, updated = ? WHERE run_key = ? AND job_key = ? AND worker = ?",
+                (time.time(), run_key, self.job_key(job), worker_id),
+            )
+
+    def release(self, run_key, job, worker_id, retry_delay=None):
+        """
+        Returns a failed job to the queue, or marks it failed once it has used all of its attempts.
+
+        Args:
+            run_key (str): Identifier of the run.
+            job (tuple): The job tuple.
+            worker_id (str): Worker that held the lease.
+            retry_delay (callable or None): Maps the job's attempt count to the seconds it must wait before it can
+                be leased again. Defaults to None (available immediately).
+
+        Returns:
+            str: The job's new status, "pending" or "failed".
+        """
+        now = time.time()
+        key = self.job_key(job)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts FROM jobs WHERE run_key = ? AND job_key = ? AND worker = ?", (run_key, key, worker_id)
+            ).fetchone()
+            if row is not None:
+                attempts = row[0]
+                status = "failed" if attempts >= self.max_attempts else "pending"
+                not_before = now + retry_delay(attempts) if retry_delay and status == "pending" else None
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, not_before = ?, updated = ?
+                    WHERE run_key = ? AND job_key = ?
+                    """,
+                    (status, not_before, now, run_key, key),
+                )
+            status = conn.execute("SELECT status FROM jobs WHERE run_key = ? AND job_key = ?", (run_key, key)).fetchone()
+            conn.execute("COMMIT")
+        return status[0] if status else "pending"
+
+    def counts(self, run_key):
+        """
+        Counts a run's jobs by status.
+
+        Args:
+            run_key (str): Identifier of the run.
+
+        Returns:
+            dict: {"pending": int, "leased": int, "done": int, "failed": int}
+        """
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        with self._connect() as conn:
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs WHERE run_key = ? GROUP BY status", (run_key,)):
+                counts[status] = count
+        return counts
+
+    def finalize(self, run_key, worker_id):
+        """
+        Claims the run's one-time completion bookkeeping once every job is done.
+
+        Exactly one worker gets True, so shared files such as completed_seasons.json are updated once.
+
+        Args:
+            run_key (str): Identifier of the run.
+            worker_id (str): Identifier of the claiming worker.
+
+        Returns:
+            bool: True if this worker should perform the completion bookkeeping.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            unfinished = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_key = ? AND status != 'done'", (run_key,)
+            ).fetchone()[0]
+            total = conn.execute("SELECT COUNT(*) FROM jobs WHERE run_key = ?", (run_key,)).fetchone()[0]
+            if unfinished or not total:
+                conn.execute("COMMIT")
+                return False
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO runs (run_key, finalized_by, finalized_at) VALUES (?, ?, ?)",
+                (run_key, worker_id, time.time()),
+            )
+            conn.execute("COMMIT")
+            return cursor.rowcount == 1
@@ -0,0 +1,304 @@
+import os
+import re
+import sys
+import time
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from athletistat.core.ingest import open_text
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+# Typical uncompressed/compressed size ratios of the pipeline's CSV files
+COMPRESSION_RATIOS = {".gz": 5.0, ".zst": 6.0}
+
+def parse_size(value):
+    """
+    Parses a memory size such as "8G", "512MB", "1.5g", or a plain byte count.
+
+    Args:
+        value (str or int): Size to parse. Units are binary (1K = 1024 bytes).
+
+    Returns:
+        int: Size in bytes.
+
+    Raises:
+        ValueError: If the size cannot be parsed.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)I?B?\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid memory size '{value}'. Expected e.g. 8G, 512M, or a byte count")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def format_size(nbytes):
+    """
+    Formats a byte count for log output.
+
+    Args:
+        nbytes (int or None): Byte count.
+
+    Returns:
+        str: e.g. "1.50 GB", or "n/a" for None.
+    """
+    if nbytes is None:
+        return "n/a"
+    for unit in ["B", "KB", "MB", "GB"]:
+        if nbytes < 1024 or unit == "GB":
+            return f"{nbytes:.2f} {unit}" if unit != "B" else f"{nbytes} B"
+        nbytes /= 1024
+
+
+def reset_peak_rss():
+    """
+    Resets the kernel's peak RSS counter of this process, so the next `peak_rss` covers only what follows.
+
+    Only Linux supports this (writing "5" to /proc/self/clear_refs); elsewhere it is a no-op.
+
+    Returns:
+        bool: True if the counter was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of this process.
+
+    Returns:
+        int or None: Bytes, or None if the platform does not report it.
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class MemoryBudget:
+    """Memory limit shared by the pipeline stages: footprint estimates, chunk sizes, worker throttling, and peak RSS reports."""
+    def __init__(self, limit=None, expansion=8.0, headroom=0.25, max_workers=None):
+        """
+        Initializes the budget.
+
+        Args:
+            limit (str, int, or None): Memory the pipeline may use, e.g. "8G". Defaults to None (no limit: stages
+                keep their default chunk sizes and serial processing, and only peak RSS is reported).
+            expansion (float): In-memory DataFrame bytes per uncompressed CSV byte. Mostly-string rows take several
+                times their CSV size as Python objects. Defaults to 8.0.
+            headroom (float): Share of the limit kept free for the interpreter, libraries, and estimate error.
+                Defaults to 0.25.
+            max_workers (int or None): Most concurrent tasks in `map`. Defaults to min(8, CPU count).
+        """
+        self.limit = parse_size(limit) if limit is not None else None
+        self.expansion = expansion
+        self.usable = int(self.limit * (1 - headroom)) if self.limit is not None else None
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.stages = []
+
+    def csv_bytes(self, path):
+        """
+        Estimates the uncompressed size of a CSV file.
+
+        Args:
+            path (str): Plain or compressed CSV path.
+
+        Returns:
+            int: Estimated bytes of CSV text.
+        """
+        size = os.path.getsize(path)
+        for suffix, ratio in COMPRESSION_RATIOS.items():
+            if path.endswith(suffix):
+                return int(size * ratio)
+        return size
+
+    def row_bytes(self, path, sample_rows=1000):
+        """
+        Measures the average CSV line length from the first rows of a file.
+
+        Args:
+            path (str): Plain or compressed CSV path.
+            sample_rows (int): Rows to sample after the header. Defaults to 1000.
+
+        Returns:
+            float: Average bytes per row (at least 1).
+        """
+        total = rows = 0
+        with open_text(path, "r") as f:
+            f.readline()
+            for line in f:
+                total += len(line.encode("utf-8"))
+                rows += 1
+                if rows >= sample_rows:
+                    break
+        return max(total / rows, 1.0) if rows else 100.0
+
+    def frame_bytes(self, paths):
+        """
+        Estimates the memory of loading one or more CSV files as a single DataFrame.
+
+        Args:
+            paths (str or list): CSV path(s).
+
+        Returns:
+            int: Estimated bytes.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        return int(sum(self.csv_bytes(path) for path in paths) * self.expansion)
+
+    def fits(self, nbytes):
+        """
+        Checks whether an allocation of the estimated size fits in the budget.
+
+        Args:
+            nbytes (int): Estimated bytes.
+
+        Returns:
+            bool: True if there is no limit or the estimate is within it.
+        """
+        return self.usable is None or nbytes <= self.usable
+
+    def chunk_rows(self, path, share=0.5, default=500_000, minimum=10_000):
+        """
+        Picks the rows per chunk for streaming a CSV file within the budget.
+
+        Args:
+            path (str): CSV path.
+            share (float): Share of the budget one chunk may take; the rest covers the chunk's derived copies
+                (reindexing, formatting, groupby). Defaults to 0.5.
+            default (int): Chunk size without a limit, and the most rows per chunk. Defaults to 500,000.
+            minimum (int): Fewest rows per chunk. Defaults to 10,000.
+
+        Returns:
+            int: Rows per chunk.
+        """
+        if self.usable is None:
+            return default
+        rows = int(self.usable * share / (self.row_bytes(path) * self.expansion))
+        return max(minimum, min(default, rows))
+
+    def workers(self, item_bytes, max_workers=None):
+        """
+        Number of tasks of a given estimated size that can run at once within the budget.
+
+        Args:
+            item_bytes (int): Estimated bytes per task.
+            max_workers (int or None): Upper bound. Defaults to `self.max_workers`.
+
+        Returns:
+            int: At least 1.
+        """
+        max_workers = max_workers or self.max_workers
+        if self.usable is None:
+            return max_workers
+        return max(1, min(max_workers, self.usable // max(item_bytes, 1)))
+
+    def map(self, fn, items, weights):
+        """
+        Runs `fn` over items on a thread pool, admitting a task only while the estimated memory of the running
+        tasks stays within the budget. A task larger than the budget runs on its own.
+
+        Without a limit the tasks run one at a time, in order.
+
+        Args:
+            fn (callable): Function of one item.
+            items (list): Items to process.
+            weights (list): Estimated bytes of each item, parallel to `items`.
+
+        Yields:
+            tuple: (item, result) in completion order.
+        """
+        if self.usable is None or self.max_workers <= 1:
+            for item in items:
+                yield item, fn(item)
+            return
+
+        # Largest first, so big tasks are not left to run alone at the end
+        pending = sorted(zip(items, weights), key=lambda pair: pair[1], reverse=True)
+        running = {}
+        in_use = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Admit the biggest pending task that fits next to the running ones
+                admitted = True
+                while pending and len(running) < self.max_workers and admitted:
+                    admitted = False
+                    for index, (item, weight) in enumerate(pending):
+                        if not running or in_use + weight <= self.usable:
+                            if weight > self.usable:
+                                print(f"[MEMORY] Task estimated at {format_size(weight)} exceeds the budget; running it alone")
+                            running[executor.submit(fn, item)] = (item, weight)
+                            in_use += weight
+                            pending.pop(index)
+                            admitted = True
+                            break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item, weight = running.pop(future)
+                    in_use -= weight
+                    yield item, future.result()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Measures a pipeline stage's wall time and peak RSS.
+
+        On Linux the peak counter is reset at the start of the stage, so the peak covers the stage alone;
+        elsewhere it is the process peak up to the end of the stage.
+
+        Args:
+            name (str): Stage label for the report.
+
+        Yields:
+            None
+        """
+        isolated = reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            peak = peak_rss()
+            self.stages.append({
+                "stage": name,
+                "seconds": time.perf_counter() - start,
+                "peak_rss": peak,
+                "isolated": isolated,
+            })
+            over = self.limit is not None and peak is not None and peak > self.limit
+            print(f"[MEMORY] {name}: peak RSS {format_size(peak)}{'' if isolated else ' (process peak)'}"
+                  f"{' — over the ' + format_size(self.limit) + ' limit' if over else ''}")
+
+    def report(self):
+        """
+        Prints the peak RSS and wall time of every measured stage.
+
+        Returns:
+            None
+        """
+        if not self.stages:
+            return
+        limit = f" (limit {format_size(self.limit)})" if self.limit is not None else ""
+        print(f"\n[MEMORY] Peak RSS per stage{limit}:")
+        for entry in self.stages:
+            print(f"  {entry['stage']:<24} {format_size(entry['peak_rss']):>10}   {entry['seconds']:.1f}s")
@@ -0,0 +1,183 @@
+import os
+import csv
+import math
+import heapq
+from collections import defaultdict
+
+from athletistat.core.ingest import check_compression, csv_filename, is_csv, open_text, remove_stale_variants, strip_csv_suffix
+from athletistat.core.preprocessing import Preprocessor
+from athletistat.core.reranker import StreamRanker
+from athletistat.core.sketches import DEDUPE_COLUMNS
+
+class RankedMerger:
+    """Streams pre-sorted per-season discipline files into globally ranked multi-season lists."""
+    def __init__(self, input_dir="data/processing/combined/seasons", output_dir="data/datasets/seasons/ranked", compression=None):
+        """
+        Initializes the merger with the preprocessed seasons directory and the ranked output directory.
+
+        Args:
+            input_dir (str): Root of the per-year combined files written by the Preprocessor.
+            output_dir (str): Directory the ranked multi-season files are written to.
+            compression (str or None): Output compression, "zstd" or "gzip". Defaults to None (plain CSV).
+        """
+        check_compression(compression)
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.compression = compression
+
+    def _get_files_by_discipline(self):
+        """
+        Groups the per-season combined files by gender, type, and normalized discipline.
+
+        Returns:
+            dict or None: (gender, type_slug, discipline) mapped to a year-ordered list of (year, path), or None if the input directory doesn't exist.
+        """
+        if not os.path.exists(self.input_dir):
+            print(f"[RANKED] Input directory not found: {self.input_dir}")
+            return None
+
+        files_by_discipline = defaultdict(list)
+        years = sorted(d for d in os.listdir(self.input_dir) if os.path.isdir(os.path.join(self.input_dir, d)) and d.isdigit())
+        for year in years:
+            year_path = os.path.join(self.input_dir, year)
+            for file in sorted(os.listdir(year_path)):
+                if not is_csv(file):
+                    continue
+                # {year}_{gender}_{type_slug}_{normalized_discipline}.csv
+                parts = strip_csv_suffix(file).split("_", 3)
+                if len(parts) != 4:
+                    continue
+                _, gender, type_slug, discipline = parts
+                files_by_discipline[(gender, type_slug, discipline)].append((int(year), os.path.join(year_path, file)))
+
+        return files_by_discipline
+
+    def _sort_key(self, type_slug):
+        """
+        Builds the merge key for a type, matching the order the Preprocessor sorted each file in.
+
+        Args:
+            type_slug (str): WA type slug of the discipline.
+
+        Marks are compared as the Preprocessor's fixed-point `mark_int`, so equal marks tie exactly. Files
+        preprocessed without that column fall back to `mark_numeric` at the same scale. Unparseable marks sort
+        last in either direction.
+
+        Returns:
+            callable: Function mapping a row dict to a number where smaller sorts first.
+        """
+        sign = 1 if type_slug in Preprocessor.ascending_types else -1
+        scale = 1 if type_slug == "combined-events" else 100
+
+        def key(row):
+            try:
+                if row.get("mark_int") not in (None, ""):
+                    return sign * int(row["mark_int"])
+                mark = float(row["mark_numeric"]) * scale
+                return sign * round(mark) if math.isfinite(mark) else float("inf")
+            except (KeyError, TypeError, ValueError):
+                return float("inf")
+
+        return key
+
+    def _read_sorted(self, path, key):
+        """
+        Yields the rows of a pre-sorted file, verifying the order as it streams.
+
+        Args:
+            path (str): Path to a combined per-season file.
+            key (callable): Merge key returned by `_sort_key`.
+
+        Yields:
+            dict: One CSV row at a time.
+
+        Raises:
+            ValueError: If the file is not sorted by the merge key.
+        """
+        last = float("-inf")
+        with open_text(path) as f:
+            for row in csv.DictReader(f):
+                current = key(row)
+                if current < last:
+                    raise ValueError(f"{path} is not sorted by mark_int")
+                last = current
+                yield row
+
+    def merge_discipline(self, gender, type_slug, discipline, season_files):
+        """
+        K-way merges the season files of one discipline into a single ranked file.
+
+        Only one row per input file is held in memory at a time, so the merge runs in O(n log k)
+        for n rows across k seasons. Ranks use standard competition ranking (equal marks share a
+        rank and the next rank is skipped), by the same rules as the Preprocessor's `competition_rank`.
+        A performance listed under several age categories is written once. Unparseable marks are kept, in
+        the Preprocessor's order, without a rank.
+
+        Args:
+            gender (str): male or female.
+            type_slug (str): WA type slug of the discipline.
+            discipline (str): Normalized discipline name.
+            season_files (list): Year-ordered list of (year, path) tuples.
+
+        Returns:
+            str: Path of the written ranked file.
+        """
+        # Union of headers, so seasons that are missing a column still line up
+        fieldnames = ["rank"]
+        for _, path in season_files:
+            with open_text(path) as f:
+                header = next(csv.reader(f), [])
+            fieldnames.extend(col for col in header if col not in fieldnames)
+
+        min_year = season_files[0][0]
+        max_year = season_files[-1][0]
+        suffix = f"_{min_year}" if min_year == max_year else f"_{min_year}-{max_year}"
+
+        target_dir = os.path.join(self.output_dir, gender)
+        os.makedirs(target_dir, exist_ok=True)
+        output_path = os.path.join(target_dir, csv_filename(f"{discipline}{suffix}", self.compression))
+
+        key = self._sort_key(type_slug)
+        streams = [self._read_sorted(path, key) for _, path in season_files]
+
+        ranker = StreamRanker()
+        try:
+            with open_text(output_path, "w") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
+                writer.writeheader()
+                for row in heapq.merge(*streams, key=key):
+                    rank, repeated = ranker.add(key(row), tuple(row.get(c, "") for c in DEDUPE_COLUMNS))
+                    if repeated:
+                        continue
+                    row["rank"] = rank if rank is not None else ""
+                    writer.writerow(row)
+        except Exception:
+            # Don't leave a half-ranked file behind
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        remove_stale_variants(output_path)
+        return output_path
+
+    def run(self):
+        """
+        Merges every discipline found in the seasons input directory into its ranked multi-season file.
+
+        Returns:
+            None
+        """
+        files_by_discipline = self._get_files_by_discipline()
+        if not files_by_discipline:
+            return
+
+        for (gender, type_slug, discipline), season_files in files_by_discipline.items():
+            try:
+                output_path = self.merge_discipline(gender, type_slug, discipline, season_files)
+                print(f"[RANKED] Saved: {output_path}")
+            except Exception as e:
+                print(f"[RANKED] Error merging {gender} {discipline}: {e}")
+
+if __name__ == "__main__":
+    merger = RankedMerger()
+    merger.run()
@@ -1,20 +1,43 @@
 import os
 import re
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 import json
 
+from athletistat.core.ingest import check_compression, csv_filename, is_csv, strip_csv_suffix, write_csv
+from athletistat.core.sketches import SketchStore
+from athletistat.core.reranker import LEGAL_WIND, WIND_DISCIPLINES, competition_rank, performance_identity
+from athletistat.core.memory import MemoryBudget
+
 class Preprocessor:
     """Handles data preprocessing, cleaning, and normalization for raw track and field dataset files."""
-    def __init__(self, mode="both", options_file="athletistat/options.json"):
+    # Sort direction per event type: lower marks are better for timed events, higher for measured/scored ones
+    ascending_types = {"sprints", "middlelong", "hurdles", "relays", "road-running", "race-walks"}
+    descending_types = {"throws", "jumps", "combined-events"}
+
+    # Bits of the `mark_flags` column
+    FLAG_HAND_TIMED = 1
+    FLAG_WIND_ASSISTED = 2
+    FLAG_INVALID = 4
+
+    def __init__(self, mode="both", options_file="athletistat/options.json", compression=None, sketches=True, memory=None):
         """
         Initializes the Preprocessor with running mode and loads regional configuration data.
 
         Args:
             mode (str): "both", "seasons", or "all-time". Defaults to "both".
             options_file (str): Path to the config file. Defaults to "athletistat/athletistat-options.json".
+            compression (str or None): Output compression, "zstd" or "gzip". Defaults to None (plain CSV).
+            sketches (bool): Whether to update the per-season summary sketches in data/stats. Defaults to True.
+            memory (MemoryBudget or None): Memory budget; with a limit, groups are processed concurrently as far as
+                their estimated size allows. Defaults to None (one group at a time).
         """
+        check_compression(compression)
         self.mode = mode
+        self.compression = compression
+        self.sketches = sketches
+        self.memory = memory or MemoryBudget()
         
         # Load configs
         try:
@@ -24,9 +47,6 @@ class Preprocessor:
             print(f"Error: '{options_file}' not found. Ensure it is in the root directory.")
             options_data = []
 
-        self.ascending_types = {"sprints", "middlelong", "hurdles", "relays", "road-running", "race-walks"}
-        self.descending_types = {"throws", "jumps", "combined-events"}
-
         self.track_types = {"sprints", "middlelong", "hurdles", "relays", "road-running", "race-walks"}
         self.field_types = {"throws", "jumps"}
         self.mixed_types = {"combined-events"} 
@@ -96,6 +116,54 @@ class Preprocessor:
         except:
             return float("inf")
 
+    def encode_marks(self, df, discipline_key):
+        """
+        Adds the fixed-point mark columns: `mark_int`, `wind_int`, and `mark_flags`.
+
+        `mark_int` is `mark_numeric` in hundredths of a second (track), centimetres (field), or points (mixed),
+        as an Int32 that is missing for unparseable marks. `wind_int` is the wind reading in tenths of a metre
+        per second (Int16). `mark_flags` combines FLAG_HAND_TIMED (an "h" in the mark), FLAG_WIND_ASSISTED
+        (over +2.0 m/s in a wind-affected event), and FLAG_INVALID.
+
+        Args:
+            df (pd.DataFrame): Rows with `mark`, `mark_numeric`, and `track_field` columns.
+            discipline_key (str): Normalized discipline of the rows.
+
+        Returns:
+            pd.DataFrame: The frame with the three columns added.
+        """
+        marks = df["mark_numeric"].to_numpy(dtype="float64", na_value=np.nan)
+        scale = np.where(df["track_field"].to_numpy() == "mixed", 1.0, 100.0)
+        with np.errstate(invalid="ignore", over="ignore"):
+            scaled = np.rint(marks * scale)
+        # Marks that don't fit an int32 can only be parse errors
+        scaled[~np.isfinite(scaled) | (np.abs(scaled) > np.iinfo(np.int32).max)] = np.nan
+        df["mark_int"] = pd.array(scaled, dtype="Float64").astype("Int32")
+
+        wind = self.parse_wind(df["wind"]) if "wind" in df.columns else pd.Series(np.nan, index=df.index)
+        df["wind_int"] = pd.array(np.rint(wind.to_numpy(dtype="float64") * 10), dtype="Float64").astype("Int16")
+
+        flags = np.zeros(len(df), dtype="uint8")
+        flags[df["mark"].astype("str").str.contains("h", case=False, regex=False).to_numpy()] |= self.FLAG_HAND_TIMED
+        if discipline_key in WIND_DISCIPLINES:
+            flags[(df["wind_int"] > LEGAL_WIND * 10).fillna(False).to_numpy()] |= self.FLAG_WIND_ASSISTED
+        flags[np.isnan(scaled)] |= self.FLAG_INVALID
+        df["mark_flags"] = flags
+        return df
+
+    def parse_wind(self, wind):
+        """
+        Converts wind readings (e.g., "+1.5", "-0.3", "0,8") into metres per second.
+
+        Args:
+            wind (pd.Series): Wind column as scraped.
+
+        Returns:
+            pd.Series: Float readings; NaN where the reading is missing or not a number.
+        """
+        text = wind.astype("str").str.strip().str.replace(",", ".", regex=False)
+        return pd.to_numeric(text, errors="coerce")
+
     def extract_country_code_from_venue(self, venue):
         """
         Extracts three-letter country codes from venue strings using regex.
@@ -137,8 +205,8 @@ class Preprocessor:
                         continue
                         
                     for file in os.listdir(gender_path):
-                        if file.endswith(".csv"):
-                            parts = file.replace(".csv", "").split("_")
+                        if is_csv(file):
+                            parts = strip_csv_suffix(file).split("_")
                             if len(parts) >= 4:
                                 type_slug = parts[1]
                                 discipline_slug = "_".join(parts[2:-1]) 
@@ -155,8 +223,8 @@ class Preprocessor:
                     continue
                 
                 for file in os.listdir(gender_path):
-                    if file.endswith(".csv"):
-                        parts = file.replace(".csv", "").split("_")
+                    if is_csv(file):
+                        parts = strip_csv_suffix(file).split("_")
                         if len(parts) >= 3:
                             type_slug = parts[0]
                             discipline_slug = "_".join(parts[1:-1]) 
@@ -167,82 +235,143 @@ class Preprocessor:
 
         return files_by_key
 
-    def process_data(self, current_mode):
+    def transform_group(self, df, type_slug, discipline_key):
         """
-        Processes and combines scraped CSV files, normalizing disciplines, parsing marks, and augmenting demographics.
+        Applies the cleaning and normalization steps to the concatenated raw rows of one discipline.
 
         Args:
-            current_mode (str): The mode being processed ("seasons" or "all-time").
+            df (pd.DataFrame): Raw rows of every file sharing one (year, gender, type, discipline) key.
+            type_slug (str): WA type slug of the discipline.
+            discipline_key (str): Normalized discipline.
 
         Returns:
-            None: Writes the combined files to disk.
+            pd.DataFrame or None: The transformed rows sorted by `mark_int`, or None if there is no mark column.
         """
-        files_by_key = self._get_files_by_key(current_mode)
-        if files_by_key is None:
-            return
+        df["normalized_discipline"] = discipline_key
+
+        if type_slug in self.field_types:
+            df["track_field"] = "field"
+        elif type_slug in self.track_types:
+            df["track_field"] = "track"
+        elif type_slug in self.mixed_types:
+            df["track_field"] = "mixed"
+        else:
+            df["track_field"] = "unknown"
+
+        if "mark" not in df.columns:
+            print(f"[Skipping] {discipline_key} — missing 'Mark'")
+            return None
 
-        output_root = os.path.join("data","processing", "combined", current_mode)
+        sort_ascending = type_slug in self.ascending_types
+        df["mark_numeric"] = df["mark"].apply(self.parse_mark_to_number)
+        df = self.encode_marks(df, discipline_key)
+        # Integer marks sort exactly; invalid marks go last in either direction
+        df = df.sort_values("mark_int", ascending=sort_ascending, na_position="last", kind="stable").reset_index(drop=True)
+
+        # The scraped ranks come from separate age-category and alias lists, so rank the merged list again,
+        # counting a performance listed in several of them once
+        key = df["mark_int"] if sort_ascending else -df["mark_int"]
+        identity = performance_identity(df)
+        df["rank"] = competition_rank(key, identity=identity)
+        
+        df["nat_full"] = (
+            df["nationality"]
+            .str.lower()
+            .map(self.country_lookup)
+            .fillna("Unknown")
+        )
+
+        if "venue" in df.columns:
+            df["venue_country"] = (
+                df["venue"]
+                .apply(self.extract_country_code_from_venue).str.lower()
+                .map(self.country_lookup)
+                .fillna("Unknown")
+            )
 
-        for (out_label, gender, type_slug, discipline_key), file_list in files_by_key.items():
-            df = pd.concat([pd.read_csv(f) for f in file_list], ignore_index=True)
+        for col in ["dob", "date"]:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col], format="%d %b %Y", errors="coerce")
 
-            df["normalized_discipline"] = discipline_key
+        if "dob" in df.columns and "date" in df.columns:
+            df["age_at_event"] = (df["date"] - df["dob"]).dt.days // 365
 
-            if type_slug in self.field_types:
-                df["track_field"] = "field"
-            elif type_slug in self.track_types:
-                df["track_field"] = "track"
-            elif type_slug in self.mixed_types:
-                df["track_field"] = "mixed"
-            else:
-                df["track_field"] = "unknown"
+        if "date" in df.columns:
+            df["season"] = df["date"].dt.year
 
-            if "mark" not in df.columns:
-                print(f"[Skipping] {discipline_key} — missing 'Mark'")
-                continue
+        return df
 
-            sort_ascending = type_slug in self.ascending_types
-            df["mark_numeric"] = df["mark"].apply(self.parse_mark_to_number)
-            df = df.sort_values("mark_numeric", ascending=sort_ascending).reset_index(drop=True)
+    def process_group(self, current_mode, key, file_list, sketch_store=None):
+        """
+        Reads, transforms, and writes the combined file of one (year, gender, type, discipline) key.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+            key (tuple): (year or None, gender, type_slug, normalized discipline) from `_get_files_by_key`.
+            file_list (list): Raw files sharing the key.
+            sketch_store (SketchStore or None): Store to add the group's summary to. Defaults to None.
+
+        Returns:
+            tuple or None: (output path, transformed DataFrame), or None if the group was skipped.
+        """
+        out_label, gender, type_slug, discipline_key = key
+        df = pd.concat([pd.read_csv(f) for f in file_list], ignore_index=True)
+        df = self.transform_group(df, type_slug, discipline_key)
+        if df is None:
+            return None
+
+        output_root = os.path.join("data","processing", "combined", current_mode)
+        if current_mode == "seasons":
+            target_dir = os.path.join(output_root, str(out_label))
+        else:
+            target_dir = os.path.join(output_root)
             
-            df["nat_full"] = (
-                df["nationality"]
-                .str.lower()
-                .map(self.country_lookup)
-                .fillna("Unknown")
-            )
+        os.makedirs(target_dir, exist_ok=True)
 
-            if "venue" in df.columns:
-                df["venue_country"] = (
-                    df["venue"]
-                    .apply(self.extract_country_code_from_venue).str.lower()
-                    .map(self.country_lookup)
-                    .fillna("Unknown")
-                )
+        prefix = f"{out_label}_" if current_mode == "seasons" else ""
+        output_filename = csv_filename(f"{prefix}{gender}_{type_slug}_{discipline_key}", self.compression)
+        output_path = os.path.join(target_dir, output_filename)
+        
+        write_csv(df, output_path)
+        print(f"[{current_mode.upper()}] Saved: {output_path}")
 
-            for col in ["dob", "date"]:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], format="%d %b %Y", errors="coerce")
+        if sketch_store is not None:
+            season = int(out_label) if current_mode == "seasons" else None
+            sketch_store.add_frame(df, gender, discipline_key, type_slug, type_slug in self.ascending_types, season)
 
-            if "dob" in df.columns and "date" in df.columns:
-                df["age_at_event"] = (df["date"] - df["dob"]).dt.days // 365
+        return output_path, df
 
-            if "date" in df.columns:
-                df["season"] = df["date"].dt.year
-            
-            if current_mode == "seasons":
-                target_dir = os.path.join(output_root, str(out_label))
-            else:
-                target_dir = os.path.join(output_root)
-                
-            os.makedirs(target_dir, exist_ok=True)
+    def process_data(self, current_mode):
+        """
+        Processes and combines scraped CSV files, normalizing disciplines, parsing marks, and augmenting demographics.
 
-            prefix = f"{out_label}_" if current_mode == "seasons" else ""
-            output_filename = f"{prefix}{gender}_{type_slug}_{discipline_key}.csv"
-            output_path = os.path.join(target_dir, output_filename)
-            
-            df.to_csv(output_path, index=False)
-            print(f"[{current_mode.upper()}] Saved: {output_path}")
+        Args:
+            current_mode (str): The mode being processed ("seasons" or "all-time").
+
+        Returns:
+            None: Writes the combined files to disk.
+        """
+        files_by_key = self._get_files_by_key(current_mode)
+        if files_by_key is None:
+            return
+
+        sketch_store = SketchStore(current_mode) if self.sketches else None
+
+        # Groups may run concurrently, so their summaries are added here rather than from the workers
+        def process(key):
+            return self.process_group(current_mode, key, files_by_key[key])
+
+        keys = list(files_by_key)
+        weights = [self.memory.frame_bytes(files_by_key[key]) for key in keys]
+        for key, result in self.memory.map(process, keys, weights):
+            if result is not None and sketch_store is not None:
+                out_label, gender, type_slug, discipline_key = key
+                season = int(out_label) if current_mode == "seasons" else None
+                sketch_store.add_frame(result[1], gender, discipline_key, type_slug, type_slug in self.ascending_types, season)
+
+        if sketch_store is not None:
+            for path in sketch_store.save():
+                print(f"[{current_mode.upper()}] Updated stats: {path}")
 
     def run(self):
         """
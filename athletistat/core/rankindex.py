@@ -0,0 +1,145 @@
+import os
+import sys
+import json
+import mmap
+from bisect import bisect_left, bisect_right
+
+class RankIndex:
+    """Memory-mapped rank-of-mark lookups over the sorted mark arrays written by `indexer.RankIndexBuilder`."""
+    def __init__(self, mode="seasons", index_dir="data/index"):
+        """
+        Opens the index of a mode. Only the standard library is used, so lookups don't pay for importing pandas.
+
+        Every list is stored as a contiguous run of native float64 keys in `{index_dir}/{mode}.f64`, sorted best
+        first: the mark itself for timed events, the negated mark for measured and scored events.
+        `{index_dir}/{mode}.json` maps "{season}|{sex}|{type_slug}|{discipline}" to the run's offset and length.
+
+        Args:
+            mode (str): "seasons" or "all-time". Defaults to "seasons".
+            index_dir (str): Directory of the index files. Defaults to "data/index".
+
+        Raises:
+            FileNotFoundError: If the index has not been built.
+            ValueError: If the index was built on a machine with a different byte order.
+        """
+        self.mode = mode
+        with open(os.path.join(index_dir, f"{mode}.json"), "r") as f:
+            self.table = json.load(f)
+        if self.table["byteorder"] != sys.byteorder:
+            raise ValueError(f"Index was built with {self.table['byteorder']}-endian floats; rebuild it on this machine")
+        self.entries = self.table["entries"]
+
+        # "{season}|{sex}|{discipline}" mapped to the types it is indexed under
+        self.types = {}
+        for key in self.entries:
+            season, sex, type_slug, discipline = key.split("|", 3)
+            self.types.setdefault(f"{season}|{sex}|{discipline}", []).append(type_slug)
+
+        self._file = open(os.path.join(index_dir, f"{mode}.f64"), "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.keys = memoryview(self._mmap).cast("d")
+        else:
+            self._mmap = None
+            self.keys = []
+
+    def close(self):
+        """Releases the memory map."""
+        if self._mmap is not None:
+            self.keys.release()
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, sex, discipline, season=None, type_slug=None):
+        season_label = season if season is not None else "all-time"
+        label = f"{season_label}|{sex}|{discipline}"
+        if type_slug is None:
+            types = self.types.get(label, [])
+            if len(types) > 1:
+                raise KeyError(f"{label} is indexed under several types ({', '.join(sorted(types))}); pass type_slug")
+            type_slug = types[0] if types else None
+        entry = self.entries.get(f"{season_label}|{sex}|{type_slug}|{discipline}")
+        if entry is None:
+            raise KeyError(f"No {self.mode} index for {label}" + (f" ({type_slug})" if type_slug else ""))
+        return entry
+
+    def lookup(self, sex, discipline, mark, season=None, type_slug=None):
+        """
+        Places a mark in a list by binary search.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            mark (float): Mark in `mark_numeric` units (seconds, metres, or points).
+            season (int or None): Season for the seasons index; None for the all-time index.
+            type_slug (str or None): WA type slug of the list. Only needed when the discipline is indexed under
+                several types. Defaults to None.
+
+        Returns:
+            dict: `rank` (competition rank the mark would have had), `better` (performances strictly better),
+                `tied` (performances with exactly this mark), `total`, and `percentile` (share of the list
+                that is not better than the mark, 0-100).
+
+        Raises:
+            KeyError: If the list is not in the index, or `type_slug` is needed and missing.
+        """
+        entry = self._entry(sex, discipline, season, type_slug)
+        lo, hi = entry["offset"], entry["offset"] + entry["length"]
+        key = mark if entry["ascending"] else -mark
+        better = bisect_left(self.keys, key, lo, hi) - lo
+        tied = bisect_right(self.keys, key, lo + better, hi) - lo - better
+        total = entry["length"]
+        return {
+            "rank": better + 1,
+            "better": better,
+            "tied": tied,
+            "total": total,
+            "percentile": 100.0 * (total - better) / total if total else 0.0,
+        }
+
+    def rank(self, sex, discipline, mark, season=None, type_slug=None):
+        """
+        Returns the competition rank a mark would have had in a list.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            mark (float): Mark in `mark_numeric` units.
+            season (int or None): Season; None for all-time.
+            type_slug (str or None): WA type slug, for disciplines indexed under several types. Defaults to None.
+
+        Returns:
+            int: 1 + the number of strictly better performances.
+        """
+        return self.lookup(sex, discipline, mark, season, type_slug)["rank"]
+
+    def mark_at(self, sex, discipline, rank, season=None, type_slug=None):
+        """
+        Returns the mark at a 1-based position of a list.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            rank (int): 1-based position.
+            season (int or None): Season; None for all-time.
+            type_slug (str or None): WA type slug, for disciplines indexed under several types. Defaults to None.
+
+        Returns:
+            float or None: The mark, or None if the list is shorter than `rank`.
+        """
+        entry = self._entry(sex, discipline, season, type_slug)
+        if not 1 <= rank <= entry["length"]:
+            return None
+        key = self.keys[entry["offset"] + rank - 1]
+        return key if entry["ascending"] else -key
+
+    def lists(self):
+        """Lists the "{season}|{sex}|{type_slug}|{discipline}" keys in the index."""
+        return sorted(self.entries)
+
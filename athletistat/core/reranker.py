@@ -0,0 +1,240 @@
+import os
+import math
+import numpy as np
+import pandas as pd
+
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix, write_csv
+from athletistat.core.sketches import DEDUPE_COLUMNS
+
+# Events whose marks only count for records and lists with a tailwind of at most LEGAL_WIND m/s
+WIND_DISCIPLINES = {"100-metres", "200-metres", "100-metres-hurdles", "110-metres-hurdles", "long-jump", "triple-jump"}
+LEGAL_WIND = 2.0
+
+def performance_identity(df, extra_columns=()):
+    """
+    Hashes each row's performance identity (`DEDUPE_COLUMNS`), which is the same for every age-category list
+    a result appears in.
+
+    Args:
+        df (pd.DataFrame): Rows to identify; identity columns the frame lacks are skipped.
+        extra_columns (iterable): Columns to include as well, e.g. the keys of the list. Defaults to none.
+
+    Returns:
+        pd.Series: uint64 identity per row.
+    """
+    columns = [c for c in dict.fromkeys(list(extra_columns) + DEDUPE_COLUMNS) if c in df.columns]
+    return pd.util.hash_pandas_object(df[columns], index=False)
+
+
+def competition_rank(key, groups=None, identity=None):
+    """
+    Ranks a sort key with standard competition ranking ("1224"), where smaller keys are better.
+
+    `StreamRanker` applies the same rules to rows that arrive one at a time.
+
+    Args:
+        key (pd.Series): Sort key per row; NaN and infinite keys are left unranked.
+        groups (list or None): Series to rank within (e.g. sex and discipline). Defaults to None (one list).
+        identity (pd.Series or None): Per-row identity of a performance. Rows sharing an identity with an
+            earlier row (the same result listed under several age categories) get that row's rank instead of
+            counting again. Defaults to None (every row counts).
+
+    Returns:
+        pd.Series: Int64 ranks aligned with `key`.
+    """
+    valid = np.isfinite(key.to_numpy(dtype="float64", na_value=np.nan))
+    counted = valid if identity is None else valid & ~identity.duplicated().to_numpy()
+
+    counted_key = key[counted]
+    if groups:
+        ranks = counted_key.groupby([g[counted] for g in groups], dropna=False, sort=False).rank(method="min")
+    else:
+        ranks = counted_key.rank(method="min")
+
+    result = ranks.reindex(key.index)
+    if identity is not None:
+        # Duplicates take the rank of the first occurrence of their performance
+        first_rank = pd.Series(ranks.to_numpy(), index=identity[counted].to_numpy())
+        result = result.fillna(identity[valid].map(first_rank))
+    return result.astype("Int64")
+
+
+class StreamRanker:
+    """Competition ranking of rows arriving best first, one at a time; the streaming form of `competition_rank`."""
+    def __init__(self):
+        self.position = 0
+        self.rank = None
+        self.last_key = None
+        self.identities = set()
+
+    def add(self, key, identity):
+        """
+        Ranks the next row.
+
+        A performance repeats an earlier row only at the same key, so only the identities of the current run of
+        equal keys are kept.
+
+        Args:
+            key (float): Sort key of the row, no smaller than the previous one; non-finite keys are left unranked.
+            identity (hashable): Performance identity of the row, e.g. a tuple of its `DEDUPE_COLUMNS` values.
+
+        Returns:
+            tuple: (rank or None, True if the row repeats a performance already ranked).
+        """
+        if not math.isfinite(key):
+            return None, False
+        if key != self.last_key:
+            self.last_key = key
+            self.rank = self.position + 1
+            self.identities = set()
+        if identity in self.identities:
+            return self.rank, True
+        self.identities.add(identity)
+        self.position += 1
+        return self.rank, False
+
+
+class Reranker:
+    """Recomputes integer competition ranks of the generated datasets with vectorized groupby ranking."""
+    def __init__(self, mode="both", legal_wind=False, best_per_athlete=False, ingestor=None):
+        """
+        Initializes the reranker.
+
+        Args:
+            mode (str): "seasons", "all-time", or "both". Defaults to "both".
+            legal_wind (bool): Whether to add `rank_legal`, the rank among wind-legal marks only. Defaults to False.
+            best_per_athlete (bool): Whether to add `rank_athlete`, the rank of each athlete's best mark among
+                athletes' best marks. Defaults to False.
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor with default settings.
+        """
+        self.mode = mode
+        self.legal_wind = legal_wind
+        self.best_per_athlete = best_per_athlete
+        self.ingestor = ingestor or CSVIngestor()
+
+        # Imported here because the Preprocessor itself ranks with `competition_rank`
+        from athletistat.core.preprocessing import Preprocessor
+        self.preprocessor = Preprocessor(mode="seasons", sketches=False)
+
+    def sort_key(self, df):
+        """
+        Builds a per-row sort key where smaller is better, from the integer `mark_int` (or `mark_numeric` in
+        datasets preprocessed without it) and each row's event type.
+
+        Args:
+            df (pd.DataFrame): Rows with `mark_int` or `mark_numeric`, and `type` columns.
+
+        Returns:
+            pd.Series: The mark for timed events and the negated mark for measured and scored events.
+        """
+        sign = np.where(df["type"].isin(self.preprocessor.ascending_types), 1.0, -1.0)
+        column = "mark_int" if "mark_int" in df.columns else "mark_numeric"
+        return pd.Series(df[column].to_numpy(dtype="float64", na_value=np.nan) * sign, index=df.index)
+
+    def legal_mask(self, df):
+        """
+        Flags the rows whose wind reading is legal.
+
+        Marks in events without wind measurement are always legal. In wind-affected events a mark without a
+        reading is not counted as legal.
+
+        Args:
+            df (pd.DataFrame): Rows with `normalized_discipline`, and `wind_int` and `mark_flags` or `wind` columns.
+
+        Returns:
+            np.ndarray: Boolean mask.
+        """
+        if "wind_int" in df.columns and "mark_flags" in df.columns:
+            assisted = (df["mark_flags"].fillna(0).to_numpy(dtype="uint8") & self.preprocessor.FLAG_WIND_ASSISTED) != 0
+            affected = df["normalized_discipline"].isin(WIND_DISCIPLINES).to_numpy()
+            return ~affected | (df["wind_int"].notna().to_numpy() & ~assisted)
+
+        wind = self.preprocessor.parse_wind(df["wind"]) if "wind" in df.columns else pd.Series(np.nan, index=df.index)
+        affected = df["normalized_discipline"].isin(WIND_DISCIPLINES).to_numpy()
+        return ~affected | (wind <= LEGAL_WIND).to_numpy()
+
+    def rank_frame(self, df, keys):
+        """
+        Rewrites `rank`, and adds the enabled variant columns, for every list in a frame.
+
+        Args:
+            df (pd.DataFrame): Preprocessed rows.
+            keys (list): Columns identifying one list, e.g. ["sex", "type", "normalized_discipline"].
+
+        Returns:
+            pd.DataFrame: The frame with integer ranks.
+        """
+        key = self.sort_key(df)
+        groups = [df[k] for k in keys]
+        identity = performance_identity(df, keys)
+
+        df["rank"] = competition_rank(key, groups, identity)
+
+        if self.legal_wind:
+            df["rank_legal"] = competition_rank(key.where(self.legal_mask(df)), groups, identity)
+
+        if self.best_per_athlete:
+            athlete_cols = [c for c in dict.fromkeys(keys + ["competitor", "dob"]) if c in df.columns]
+            valid = key[np.isfinite(key.to_numpy(dtype="float64", na_value=np.nan))]
+            # Each athlete's best performance; ties keep the earlier row, and its copies in other age-category
+            # lists share its rank
+            best_rows = valid.groupby([df[c][valid.index] for c in athlete_cols], dropna=False, sort=False).idxmin()
+            best = identity.isin(identity.loc[best_rows.to_numpy()]).to_numpy()
+            df["rank_athlete"] = competition_rank(key.where(best), groups, identity)
+
+        return df
+
+    def _dataset_files(self, current_mode):
+        """
+        Lists the generated per-season or all-time dataset files of a mode.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            list: Paths of the dataset files.
+        """
+        dataset_dir = os.path.join("data", "datasets", current_mode)
+        if not os.path.isdir(dataset_dir):
+            print(f"[RERANK] Dataset directory not found: {dataset_dir}")
+            return []
+        if current_mode == "seasons":
+            names = [
+                f for f in os.listdir(dataset_dir)
+                if is_csv(f) and f.split("_")[0].isdigit() and strip_csv_suffix(f).endswith("_track_field_performances")
+            ]
+        else:
+            names = [f for f in os.listdir(dataset_dir) if is_csv(f) and strip_csv_suffix(f) == "top_track_field_performances_all_time"]
+        return [os.path.join(dataset_dir, f) for f in sorted(names)]
+
+    def rerank_file(self, path):
+        """
+        Re-ranks a dataset file in place. A season file holds one season, so its lists are keyed by sex, type,
+        and discipline, as is the all-time file.
+
+        Args:
+            path (str): Dataset file.
+
+        Returns:
+            int: Rows re-ranked.
+        """
+        df = self.ingestor.read(path)
+        df = self.rank_frame(df, ["sex", "type", "normalized_discipline"])
+        write_csv(df, path)
+        return len(df)
+
+    def run(self):
+        """
+        Re-ranks the generated datasets of the configured mode(s).
+
+        Returns:
+            None
+        """
+        modes = ["seasons", "all-time"] if self.mode == "both" else [self.mode]
+        for current_mode in modes:
+            for path in self._dataset_files(current_mode):
+                try:
+                    rows = self.rerank_file(path)
+                    print(f"[RERANK] {path}: {rows:,} rows")
+                except Exception as e:
+                    print(f"[RERANK] Error re-ranking {path}: {e}")
@@ -0,0 +1,212 @@
+import os
+import json
+import math
+import zlib
+import shutil
+import numpy as np
+import pandas as pd
+
+from athletistat.core.ingest import is_csv, strip_csv_suffix, write_csv
+
+# Columns a generated dataset is stratified by; raw list files are already one stratum each
+DATASET_STRATA = ["season", "sex", "type", "normalized_discipline", "age_cat"]
+
+class DatasetSampler:
+    """Writes a reproducible, stratified subset of the raw or generated data under a separate root for fast development runs."""
+    def __init__(self, mode="both", source="raw", output_root="sample", fraction=0.01, max_rows=None, min_rows=10,
+                 seed=0, years=None, options_file="athletistat/options.json"):
+        """
+        Initializes the sampler.
+
+        The subset keeps the directory layout and file names of the source and gets a copy of the options file,
+        so every stage runs unchanged from inside `output_root` (e.g. `cd sample && ../AthletiStat --preprocessing seasons`).
+
+        Args:
+            mode (str): "seasons", "all-time", or "both". Defaults to "both".
+            source (str): "raw" for data/processing/output, "datasets" for the per-season and all-time files in
+                data/datasets. Defaults to "raw".
+            output_root (str): Directory the subset is written under. Defaults to "sample".
+            fraction (float): Share of each stratum to keep (0-1). Defaults to 0.01.
+            max_rows (int or None): Most rows kept per stratum. Defaults to None (no cap).
+            min_rows (int): Fewest rows kept per stratum, so small disciplines are still exercised. Defaults to 10.
+            seed (int): Base random seed. Defaults to 0.
+            years (list or None): Seasons to sample in seasons mode. Defaults to None (every season).
+            options_file (str): Config file copied into the subset. Defaults to "athletistat/options.json".
+
+        Raises:
+            ValueError: If the source is unknown, the fraction is out of range, or `output_root` is the working directory.
+        """
+        if source not in ("raw", "datasets"):
+            raise ValueError(f"Unknown sample source '{source}'. Expected 'raw' or 'datasets'")
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+        if os.path.abspath(output_root) == os.path.abspath("."):
+            raise ValueError("The sample root must not be the working directory")
+
+        self.mode = mode
+        self.source = source
+        self.output_root = output_root
+        self.fraction = fraction
+        self.max_rows = max_rows
+        self.min_rows = min_rows
+        self.seed = seed
+        self.years = {str(year) for year in years} if years else None
+        self.options_file = options_file
+
+    def _source_files(self, current_mode):
+        """
+        Lists the files to sample, relative to the working directory.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            list: Sorted relative paths.
+        """
+        if self.source == "raw":
+            input_root = os.path.join("data", "processing", "output", current_mode)
+            files = []
+            for directory, _, names in os.walk(input_root):
+                files.extend(os.path.join(directory, name) for name in names if is_csv(name))
+        else:
+            input_root = os.path.join("data", "datasets", current_mode)
+            names = os.listdir(input_root) if os.path.isdir(input_root) else []
+            # Only the generated base files; combined files and splits are rebuilt from them on the subset
+            files = [
+                os.path.join(input_root, name) for name in names
+                if is_csv(name) and (
+                    (name.split("_")[0].isdigit() and strip_csv_suffix(name).endswith("_track_field_performances"))
+                    or strip_csv_suffix(name) == "top_track_field_performances_all_time"
+                )
+            ]
+
+        if current_mode == "seasons" and self.years is not None:
+            files = [path for path in files if self._season_of(path, input_root) in self.years]
+        return sorted(files)
+
+    def _season_of(self, path, input_root):
+        if self.source == "raw":
+            return os.path.relpath(path, input_root).split(os.sep)[0]
+        return os.path.basename(path).split("_")[0]
+
+    def stratum_size(self, rows):
+        """
+        Number of rows kept from a stratum.
+
+        Args:
+            rows (int): Rows in the stratum.
+
+        Returns:
+            int: ceil(fraction * rows), raised to `min_rows` and capped by `max_rows` and `rows`.
+        """
+        size = max(math.ceil(self.fraction * rows), self.min_rows)
+        if self.max_rows is not None:
+            size = min(size, self.max_rows)
+        return min(size, rows)
+
+    def sample_frame(self, df, rng, strata=None):
+        """
+        Samples every stratum of a frame without replacement, keeping the original row order.
+
+        Keeping the order matters for the raw lists, which are sorted by rank.
+
+        Args:
+            df (pd.DataFrame): Frame to sample.
+            rng (np.random.Generator): Random generator.
+            strata (list or None): Columns defining the strata. Defaults to None (the frame is one stratum).
+
+        Returns:
+            pd.DataFrame: The sampled rows.
+        """
+        if df.empty:
+            return df
+        if not strata:
+            groups = [np.arange(len(df))]
+        else:
+            groups = df.groupby(strata, dropna=False, sort=True).indices.values()
+
+        keep = [rng.choice(positions, size=self.stratum_size(len(positions)), replace=False) for positions in groups]
+        return df.iloc[np.sort(np.concatenate(keep))]
+
+    def sample_file(self, path):
+        """
+        Samples one file into the same relative path under the output root.
+
+        Each file gets its own generator seeded from the base seed and the CRC32 of its path, so a file's sample
+        does not depend on which other files exist or the order they are visited in.
+
+        Args:
+            path (str): Relative path of the source file.
+
+        Returns:
+            tuple: (rows read, rows written).
+        """
+        # Values are copied through as text so the subset parses exactly like the source
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        key = path.replace(os.sep, "/").encode("utf-8")
+        rng = np.random.default_rng([self.seed, zlib.crc32(key)])
+
+        strata = [c for c in DATASET_STRATA if c in df.columns] if self.source == "datasets" else None
+        sample = self.sample_frame(df, rng, strata)
+
+        output_path = os.path.join(self.output_root, path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        write_csv(sample, output_path)
+        return len(df), len(sample)
+
+    def sample_mode(self, current_mode):
+        """
+        Samples every source file of a mode.
+
+        Args:
+            current_mode (str): "seasons" or "all-time".
+
+        Returns:
+            dict: Files, rows read, and rows written.
+        """
+        files = self._source_files(current_mode)
+        if not files:
+            print(f"[SAMPLE] No {self.source} files found for {current_mode}")
+            return {"files": 0, "rows_in": 0, "rows_out": 0}
+
+        rows_in = rows_out = 0
+        for path in files:
+            try:
+                read, written = self.sample_file(path)
+            except Exception as e:
+                print(f"[SAMPLE] Error sampling {path}: {e}")
+                continue
+            rows_in += read
+            rows_out += written
+
+        print(f"[SAMPLE] {current_mode}: {len(files)} files, {rows_out:,} of {rows_in:,} rows")
+        return {"files": len(files), "rows_in": rows_in, "rows_out": rows_out}
+
+    def run(self):
+        """
+        Writes the subset for the configured mode(s), the options file, and a `sample.json` describing the subset.
+
+        Returns:
+            None
+        """
+        if os.path.exists(self.options_file):
+            options_copy = os.path.join(self.output_root, self.options_file)
+            os.makedirs(os.path.dirname(options_copy), exist_ok=True)
+            shutil.copyfile(self.options_file, options_copy)
+
+        modes = ["seasons", "all-time"] if self.mode == "both" else [self.mode]
+        results = {current_mode: self.sample_mode(current_mode) for current_mode in modes}
+
+        info = {
+            "source": self.source,
+            "fraction": self.fraction,
+            "max_rows": self.max_rows,
+            "min_rows": self.min_rows,
+            "seed": self.seed,
+            "years": sorted(self.years) if self.years else None,
+            "modes": results,
+        }
+        os.makedirs(self.output_root, exist_ok=True)
+        with open(os.path.join(self.output_root, "sample.json"), "w") as f:
+            json.dump(info, f, indent=1)
+        print(f"[SAMPLE] Subset written under {self.output_root}/")
@@ -2,9 +2,13 @@ import os
 import json
 import time
 import glob
+import heapq
+import random
+import itertools
+import socket
 import threading
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 import requests
 import pandas as pd
@@ -14,36 +18,59 @@ from urllib3.util.retry import Retry
 import urllib3
 from urllib3.exceptions import InsecureRequestWarning
 
+from athletistat.core.jobstats import JobStats
+from athletistat.core.jobstore import JobStore
+
 # Disable insecure request warnings
 urllib3.disable_warnings(InsecureRequestWarning)
 
 class Scraper:
     """Scrapes track and field records from the World Athletics website."""
     BASE_URL_ALL_TIME = (
-        "https://worldathletics.org/records/all-time-toplists/{type_slug}/{discipline_slug}/all/{gender}/{age_category}"
+        "{base_url}/records/all-time-toplists/{type_slug}/{discipline_slug}/all/{gender}/{age_category}"
         "?regionType=world&page={page}&bestResultsOnly=false&firstDay=1900-01-01&lastDay={today}&maxResultsByCountry=all&ageCategory={age_category}"
     )
 
     BASE_URL_SEASONS = (
-        "https://worldathletics.org/records/toplists/{type_slug}/{discipline_slug}/all/{gender}/{age_category}/{year}"
+        "{base_url}/records/toplists/{type_slug}/{discipline_slug}/all/{gender}/{age_category}/{year}"
         "?regionType=world&timing=all&windReading=all&page={page}&bestResultsOnly=false&maxResultsByCountry=all&ageCategory={age_category}"
     )
 
-    def __init__(self, mode="both", options_file="athletistat/options.json"):
+    def __init__(self, mode="both", options_file="athletistat/options.json", base_url="https://worldathletics.org",
+                 page_delay=1.5, max_retries=5, backoff_factor=1, stats_file="queues/job_stats.json",
+                 max_job_attempts=3, retry_base_delay=10.0, retry_max_delay=300.0):
         """
         Initializes the scraper, configures request retry sessions, and loads configurations.
 
         Args:
             mode (str): "both", "seasons", or "all-time". Defaults to "both".
             options_file (str): Path to config file. Defaults to "athletistat/options.json".
+            base_url (str): Scheme and host the record tables are fetched from. Defaults to "https://worldathletics.org".
+            page_delay (float): Seconds to sleep between paginated requests. Defaults to 1.5.
+            max_retries (int): Total urllib3 retries per request. Defaults to 5.
+            backoff_factor (float): urllib3 exponential backoff factor. Defaults to 1.
+            stats_file (str): Per-job page count and duration history used for scheduling. Defaults to "queues/job_stats.json".
+            max_job_attempts (int): Attempts per job within one run before it is moved to the dead-letter file. Defaults to 3.
+            retry_base_delay (float): Base of the exponential, jittered delay before a failed job is retried. Defaults to 10.
+            retry_max_delay (float): Upper bound of the retry delay. Defaults to 300.
         """
         self.mode = mode
         self.options_file = options_file
         self.mappings = self._load_mappings(self.options_file)
+        self.base_url = base_url.rstrip("/")
+        self.page_delay = page_delay
+        self.max_job_attempts = max_job_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+
+        # Counters for benchmarking; updated under self.lock
+        self.stats = {"pages": 0, "failed_jobs": 0, "queue_writes": 0, "queue_write_seconds": 0.0}
+        self.job_stats = JobStats(stats_file)
+
+        # Pages already fetched by failed jobs, keyed by job tuple, so a retry resumes at the failed page
+        self.progress = {}
             
-        self.today = datetime.now().strftime("%Y-%m-%d")
-        self.current_time = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-        self.current_year = int(datetime.now().strftime("%Y"))
+        self.refresh_dates()
         
         # Threading lock for safe file writing
         self.lock = threading.Lock()
@@ -51,8 +78,8 @@ class Scraper:
         # Configure requests session with built-in retries
         self.session = requests.Session()
         retries = Retry(
-            total=5,
-            backoff_factor=1,
+            total=max_retries,
+            backoff_factor=backoff_factor,
             status_forcelist=(429, 500, 502, 503, 504),
             allowed_methods=("GET", "HEAD", "OPTIONS"),
         )
@@ -60,6 +87,19 @@ class Scraper:
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
+    def refresh_dates(self):
+        """
+        Sets the date, log timestamp, and current year used for queue keys and URLs.
+
+        Called on init, and again by long-running callers before each run.
+
+        Returns:
+            None
+        """
+        self.today = datetime.now().strftime("%Y-%m-%d")
+        self.current_time = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        self.current_year = int(datetime.now().strftime("%Y"))
+
     def _load_mappings(self, config_file):
         """
         Parses the provided configuration file to extract mappings between discipline code slugs.
@@ -85,13 +125,14 @@ class Scraper:
                     ]
         return mappings
 
-    def build_jobs(self, mode, year=None):
+    def build_jobs(self, mode, year=None, create_dirs=True):
         """
         Constructs a list of scraping jobs containing URL parameters for targeted disciplines.
 
         Args:
             mode (str): "seasons" or "all-time".
             year (int or None): Target year (for "seasons" mode).
+            create_dirs (bool): Whether to create the output directories. Defaults to True.
 
         Returns:
             list: List of scrape jobs.
@@ -104,11 +145,115 @@ class Scraper:
             else:
                 output_dir = os.path.join(f"data/processing/output/{mode}", gender)
             
-            os.makedirs(output_dir, exist_ok=True)    
+            if create_dirs:
+                os.makedirs(output_dir, exist_ok=True)
             for discipline_slug, type_slug in discipline_list:
                 jobs.append((gender, age_category, discipline_slug, type_slug, output_dir, mode, year))
         return jobs
 
+    def page_url(self, job, page):
+        """
+        Builds the URL of one page of a job's toplist.
+
+        Args:
+            job (tuple): (gender, age_category, discipline_slug, type_slug, output_dir, mode, year).
+            page (int): 1-based page number.
+
+        Returns:
+            str: The page URL.
+        """
+        gender, age_category, discipline_slug, type_slug, _, mode, year = job
+        if mode == "seasons":
+            return self.BASE_URL_SEASONS.format(
+                base_url=self.base_url, type_slug=type_slug, discipline_slug=discipline_slug,
+                gender=gender, age_category=age_category, page=page, year=year
+            )
+        return self.BASE_URL_ALL_TIME.format(
+            base_url=self.base_url, type_slug=type_slug, discipline_slug=discipline_slug,
+            gender=gender, age_category=age_category, page=page, today=self.today
+        )
+
+    def output_path(self, job):
+        """
+        Returns the raw CSV path a job's rows are saved to.
+
+        Args:
+            job (tuple): The scrape job.
+
+        Returns:
+            str: Path under the job's output directory.
+        """
+        gender, age_category, discipline_slug, type_slug, output_dir, mode, year = job
+        prefix = f"{year}_" if mode == "seasons" else ""
+        filename = f"{prefix}{type_slug}_{discipline_slug}_{age_category}.csv".replace(" ", "_").replace("/", "-")
+        return os.path.join(output_dir, filename)
+
+    def fetch_page(self, job, page):
+        """
+        Fetches and parses one page of a job's toplist.
+
+        Args:
+            job (tuple): The scrape job.
+            page (int): 1-based page number.
+
+        Returns:
+            list: Row dicts; empty once pagination has run past the last page.
+
+        Raises:
+            requests.RequestException: If the request still fails after the session's retries.
+        """
+        return self._fetch_page(job, page)[0]
+
+    def _fetch_page(self, job, page):
+        """
+        Fetches and parses one page of a job's toplist, also reporting how many table rows the page had.
+
+        Args:
+            job (tuple): The scrape job.
+            page (int): 1-based page number.
+
+        Returns:
+            tuple: (row dicts, number of table rows including malformed ones). Pagination has run past the last
+                page when the table has no rows at all.
+
+        Raises:
+            requests.RequestException: If the request still fails after the session's retries.
+        """
+        gender, age_category, discipline_slug, type_slug = job[:4]
+        headers = {"User-Agent": "Mozilla/5.0"}
+        response = self.session.get(self.page_url(job, page), headers=headers, timeout=(5, 30), verify=True)
+        response.raise_for_status()
+
+        soup = BeautifulSoup(response.text, 'html.parser')
+        table = soup.find("table", class_="records-table")
+        if not table:
+            return [], 0
+
+        data = []
+        rows = table.find("tbody").find_all("tr") if table.find("tbody") else []
+        for row in rows:
+            cols = row.find_all("td")
+            if len(cols) < 11:
+                continue
+
+            data.append({
+                "rank": cols[0].text.strip(),
+                "mark": cols[1].text.strip(),
+                "wind": cols[2].text.strip(),
+                "competitor": cols[3].text.strip(),
+                "dob": cols[4].text.strip(),
+                "nationality": cols[5].text.strip(),
+                "position": cols[6].text.strip(),
+                "venue": cols[8].text.strip(),
+                "date": cols[9].text.strip(),
+                "result_score": cols[10].text.strip(),
+                "discipline": discipline_slug,
+                "type": type_slug,
+                "sex": gender,
+                "age_cat": age_category
+            })
+        return data, len(rows)
+
     def scrape_event(self, gender, age_category, discipline_slug, type_slug, output_dir, mode="seasons", year=None):
         """
         Scrapes individual event record tables from World Athletics, parsing rows into tabular data and saving as a CSV.
@@ -125,87 +270,73 @@ class Scraper:
         Returns:
             bool: True if completed, False if error.
         """
-        page = 1
-        data = []
+        job = (gender, age_category, discipline_slug, type_slug, output_dir, mode, year)
+        with self.lock:
+            progress = self.progress.pop(job, None)
+        page = progress["page"] if progress else 1
+        data = progress["data"] if progress else []
+        start_time = time.perf_counter()
 
         
         log_dir = os.path.join(f"logs/{mode}", self.today)
         os.makedirs(log_dir, exist_ok=True)
 
         while True:
-            if mode == "seasons":
-                url = self.BASE_URL_SEASONS.format(
-                    type_slug=type_slug, discipline_slug=discipline_slug,
-                    gender=gender, age_category=age_category, page=page, year=year
-                )
-            else:
-                url = self.BASE_URL_ALL_TIME.format(
-                    type_slug=type_slug, discipline_slug=discipline_slug,
-                    gender=gender, age_category=age_category, page=page, today=self.today
-                )
-            
-            headers = {"User-Agent": "Mozilla/5.0"}
-            
+            url = self.page_url(job, page)
             try:
-                response = self.session.get(url, headers=headers, timeout=(5, 30), verify=True)
-                response.raise_for_status()
+                rows, table_rows = self._fetch_page(job, page)
             except Exception as e:
                 with self.lock:
+                    self.stats["failed_jobs"] += 1
+                    self.progress[job] = {"page": page, "data": data, "error": repr(e)}
                     with open(os.path.join(log_dir, f"scrape_errors_{self.current_time}.log"), "a") as log_file:
                         log_file.write(f"FAILED: {url} | {repr(e)}\n")
                 # Must return False so the queue doesn't remove the job
-                return False 
+                return False
 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            table = soup.find("table", class_="records-table")
-            
-            if not table:
-                break
-                
-            rows = table.find("tbody").find_all("tr") if table.find("tbody") else []
-            if not rows:
-                break
+            with self.lock:
+                self.stats["pages"] += 1
 
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) < 11:
-                    continue
-                    
-                data.append({
-                    "rank": cols[0].text.strip(),
-                    "mark": cols[1].text.strip(),
-                    "wind": cols[2].text.strip(),
-                    "competitor": cols[3].text.strip(),
-                    "dob": cols[4].text.strip(),
-                    "nationality": cols[5].text.strip(),
-                    "position": cols[6].text.strip(),
-                    "venue": cols[8].text.strip(),
-                    "date": cols[9].text.strip(),
-                    "result_score": cols[10].text.strip(),
-                    "discipline": discipline_slug,
-                    "type": type_slug,
-                    "sex": gender,
-                    "age_cat": age_category
-                })
+            # Only a page without table rows ends pagination; one whose rows were all malformed does not
+            if not table_rows:
+                break
+            data.extend(rows)
 
             page += 1
             # Do not give too low of a value, will overwhelm server.
-            time.sleep(1.5) 
+            time.sleep(self.page_delay)
 
         # Save to CSV
         if data:
             os.makedirs(output_dir, exist_ok=True)
-            prefix = f"{year}_" if mode == "seasons" else ""
-            filename = f"{prefix}{type_slug}_{discipline_slug}_{age_category}.csv".replace(" ", "_").replace("/", "-")
-            filepath = os.path.join(output_dir, filename)
-            
+            filepath = self.output_path(job)
+
             df = pd.DataFrame(data)
             with self.lock:
                 df.to_csv(filepath, index=False)
                 print(f"Saved {filepath}")
 
+        # `page` is now the number of requests made, including the empty page that ended pagination
+        self.job_stats.record(job, page, time.perf_counter() - start_time)
         return True # Returns True when complete
 
+    def _write_queue(self, queue_file, jobs):
+        """
+        Persists the pending job list to its queue file, recording the write count and time in `stats`.
+
+        Args:
+            queue_file (str): Path to the queue JSON file.
+            jobs (list): Pending jobs.
+
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        with open(queue_file, "w") as f:
+            json.dump(jobs, f)
+        self.stats["queue_writes"] += 1
+        self.stats["queue_write_seconds"] += time.perf_counter() - start
+
     def _get_queue_info(self, mode, year=None):
         """
         Determines the queue file path specific to the scraper mode and target year.
@@ -255,14 +386,19 @@ class Scraper:
                     return None, queue_file, completed_years
 
                 os.makedirs(os.path.dirname(queue_file), exist_ok=True)
+                dead_jobs = [tuple(entry["job"]) for entry in self._load_dead_letters(mode, year)]
                 if os.path.exists(queue_file) and os.path.getsize(queue_file) > 0:
                     with open(queue_file, "r") as f:
                         jobs = [tuple(job) for job in json.load(f)] 
                     print(f"Resuming {len(jobs)} incomplete jobs from {queue_file}...")
+                elif dead_jobs:
+                    # The rest of the season was scraped; only its dead-lettered jobs are left
+                    jobs = dead_jobs
+                    self._write_queue(queue_file, jobs)
+                    print(f"Retrying {len(jobs)} dead-lettered jobs for historical year {year}.")
                 else:
                     jobs = self.build_jobs(mode, year)
-                    with open(queue_file, "w") as f:
-                        json.dump(jobs, f)
+                    self._write_queue(queue_file, jobs)
                     print(f"Created new queue with {len(jobs)} jobs for historical year {year}.")
             else:
                 jobs = self.build_jobs(mode, year)
@@ -286,12 +422,207 @@ class Scraper:
                 print(f"Resuming {len(jobs)} incomplete jobs from {queue_file}...")
             else:
                 jobs = self.build_jobs(mode)
-                with open(queue_file, "w") as f:
-                    json.dump(jobs, f)
+                self._write_queue(queue_file, jobs)
                 print(f"Created new queue with {len(jobs)} jobs for all-time ({self.today}).")
                 
             return jobs, queue_file, []
 
+    def _dead_letter_file(self, mode):
+        return f"queues/{mode}/dead_letter.json"
+
+    @staticmethod
+    def _dead_letter_key(job):
+        # Entries are grouped by the job's season; all-time jobs have no year
+        year = job[6]
+        return str(year) if year is not None else "all-time"
+
+    def _read_dead_letter_file(self, mode):
+        """
+        Reads a mode's dead-letter file as entries grouped by season.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+
+        Returns:
+            dict: Season key ("2020", or "all-time") mapped to its list of entries.
+        """
+        dead_letter_file = self._dead_letter_file(mode)
+        if not (os.path.exists(dead_letter_file) and os.path.getsize(dead_letter_file) > 0):
+            return {}
+        with open(dead_letter_file, "r") as f:
+            return json.load(f)
+
+    def _load_dead_letters(self, mode, year=None):
+        """
+        Reads the dead-letter entries of a mode.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            year (int or None): Season to read. Defaults to None (every season).
+
+        Returns:
+            list: Entries with "job", "attempts", "failed_page", "error", and "failed_at".
+        """
+        grouped = self._read_dead_letter_file(mode)
+        if year is not None:
+            return list(grouped.get(str(year), []))
+        return [entry for key in sorted(grouped) for entry in grouped[key]]
+
+    def _update_dead_letters(self, mode, add=None, remove=None):
+        """
+        Adds or removes a job in the mode's dead-letter file.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            add (dict or None): Entry to add; replaces an existing entry for the same job.
+            remove (tuple or None): Job to remove.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            grouped = self._read_dead_letter_file(mode)
+            job = add["job"] if add else list(remove)
+            key = self._dead_letter_key(job)
+            entries = [entry for entry in grouped.get(key, []) if entry["job"] != job]
+            if add:
+                entries.append(add)
+            if entries:
+                grouped[key] = entries
+            else:
+                grouped.pop(key, None)
+            os.makedirs(os.path.dirname(self._dead_letter_file(mode)), exist_ok=True)
+            with open(self._dead_letter_file(mode), "w") as f:
+                json.dump(dict(sorted(grouped.items())), f, indent=1)
+
+    def _dead_letter(self, mode, job, attempts):
+        """
+        Moves a job that used up its attempts to the dead-letter file, dropping its partially fetched pages.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            job (tuple): The scrape job.
+            attempts (int): Attempts made so far, including earlier runs.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            progress = self.progress.pop(job, None) or {}
+        self._update_dead_letters(mode, add={
+            "job": list(job),
+            "attempts": attempts,
+            "failed_page": progress.get("page"),
+            "error": progress.get("error"),
+            "failed_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def _retry_delay(self, attempt):
+        # Exponential backoff with jitter, so jobs failed by the same outage don't all retry at once
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _run_with_retries(self, mode, jobs, max_workers, on_success, previous_attempts=None):
+        """
+        Scrapes jobs on a thread pool, re-enqueueing failed jobs after a jittered backoff.
+
+        A retried job resumes at the page that failed. Jobs that fail `max_job_attempts` times in this run are
+        moved to the dead-letter file.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            jobs (list): Scrape jobs, in submission order.
+            max_workers (int): Number of threads.
+            on_success (callable): Called with each job that completes.
+            previous_attempts (dict or None): Attempts per job from earlier runs, added to the dead-letter count.
+
+        Returns:
+            list: Jobs moved to the dead-letter file.
+        """
+        log_dir = os.path.join(f"logs/{mode}", self.today)
+        previous_attempts = previous_attempts or {}
+        attempts = {}
+        retries = []  # heap of (ready time, sequence, job)
+        sequence = itertools.count()
+        dead = []
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {executor.submit(self.scrape_event, *job): job for job in jobs}
+
+            while running or retries:
+                while retries and retries[0][0] <= time.monotonic():
+                    job = heapq.heappop(retries)[2]
+                    running[executor.submit(self.scrape_event, *job)] = job
+
+                timeout = max(0.0, retries[0][0] - time.monotonic()) if retries else None
+                if not running:
+                    time.sleep(timeout)
+                    continue
+
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        success = future.result()
+                    except Exception as e:
+                        success = False
+                        with self.lock:
+                            with open(os.path.join(log_dir, f"scrape_errors_{self.current_time}.log"), "a") as log_file:
+                                log_file.write(f"UNCAUGHT ERROR in job {job}: {repr(e)}\n")
+
+                    if success:
+                        on_success(job)
+                        continue
+
+                    attempts[job] = attempts.get(job, 0) + 1
+                    if attempts[job] >= self.max_job_attempts:
+                        self._dead_letter(mode, job, previous_attempts.get(job, 0) + attempts[job])
+                        dead.append(job)
+                    else:
+                        delay = self._retry_delay(attempts[job])
+                        heapq.heappush(retries, (time.monotonic() + delay, next(sequence), job))
+
+        return dead
+
+    def run_jobs(self, mode, jobs, max_workers=10, on_success=None):
+        """
+        Scrapes a given list of jobs with in-run retries, without touching the resume queues.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            jobs (list): Scrape jobs.
+            max_workers (int): Number of threads. Defaults to 10.
+            on_success (callable or None): Called with each job that completes.
+
+        Returns:
+            list: Jobs moved to the dead-letter file.
+        """
+        os.makedirs(os.path.join(f"logs/{mode}", self.today), exist_ok=True)
+        dead = self._run_with_retries(mode, self.job_stats.order(jobs, self.page_delay), max_workers, on_success or (lambda job: None))
+        self.job_stats.save()
+        return dead
+
+    def _mark_season_completed(self, year):
+        """
+        Adds a historical year to completed_seasons.json.
+
+        Args:
+            year (int): The completed year.
+
+        Returns:
+            None
+        """
+        completed_file = "queues/seasons/completed_seasons.json"
+        completed_years = []
+        if os.path.exists(completed_file):
+            with open(completed_file, "r") as f:
+                completed_years = json.load(f)
+        if year not in completed_years:
+            completed_years.append(year)
+            os.makedirs(os.path.dirname(completed_file), exist_ok=True)
+            with open(completed_file, "w") as f:
+                json.dump(completed_years, f)
+
     def run_scraper(self, mode, max_workers=10, year=None):
         """
         Executes the scraper for a given mode processing the compiled jobs concurrently utilizing a threadpool.
@@ -315,38 +646,46 @@ class Scraper:
             return  # Skipped
         jobs, queue_file, completed_years = info
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_job = {executor.submit(self.scrape_event, *job): job for job in jobs}
-            
-            for future in as_completed(future_to_job):
-                job = future_to_job[future]
-                try:
-                    success = future.result()
-                    
-                    if success:
-                        if (mode == "seasons" and year != self.current_year) or (mode == "all-time"):
-                            jobs.remove(job)
-                            with open(queue_file, "w") as f:
-                                json.dump(jobs, f)
-                            
-                except Exception as e:
-                    with self.lock:
-                        with open(os.path.join(log_dir, f"scrape_errors_{self.current_time}.log"), "a") as log_file:
-                            log_file.write(f"UNCAUGHT ERROR in job {job}: {repr(e)}\n")
+        # Longest-expected jobs first so large events don't start last and leave one thread running alone
+        jobs = self.job_stats.order(jobs, self.page_delay)
+
+        uses_queue = (mode == "seasons" and year != self.current_year) or (mode == "all-time")
+
+        # Jobs dead-lettered by an earlier run keep counting their attempts, and leave the file once they succeed
+        previous_attempts = {tuple(entry["job"]): entry["attempts"] for entry in self._load_dead_letters(mode, year)}
+
+        def _finished(job):
+            if uses_queue:
+                jobs.remove(job)
+                self._write_queue(queue_file, jobs)
+            if job in previous_attempts:
+                self._update_dead_letters(mode, remove=job)
+
+        dead = self._run_with_retries(mode, list(jobs), max_workers, _finished, previous_attempts)
+
+        # Dead-lettered jobs leave the resume queue. --retry-failed, or the next run of the season once its
+        # queue is gone, picks them up from the dead-letter file
+        if uses_queue and dead:
+            for job in dead:
+                jobs.remove(job)
+            self._write_queue(queue_file, jobs)
+
+        self.job_stats.save()
 
         # Final Cleanup & Logging
-        if (mode == "seasons" and year != self.current_year) or (mode == "all-time"):
+        if dead:
+            print(f"{len(dead)} jobs failed {self.max_job_attempts} times and were moved to {self._dead_letter_file(mode)}. "
+                  f"Run with --retry-failed {mode} to retry them.")
+
+        if uses_queue:
             if not jobs:
-                print(f"All jobs for {mode} completed successfully! Updating logs.")
                 if os.path.exists(queue_file):
                     os.remove(queue_file)
-                
-                if mode == "seasons" and year not in completed_years:
-                    completed_years.append(year)
-                    completed_file = f"queues/seasons/completed_seasons.json"
-                    os.makedirs(os.path.dirname(completed_file), exist_ok=True)
-                    with open(completed_file, "w") as f:
-                        json.dump(completed_years, f)
+
+                if not dead and not (mode == "seasons" and self._load_dead_letters(mode, year)):
+                    print(f"All jobs for {mode} completed successfully! Updating logs.")
+                    if mode == "seasons" and year not in completed_years:
+                        self._mark_season_completed(year)
             else:
                 print(f"Scrape paused or encountered errors. {len(jobs)} jobs remaining in queue.")
 
@@ -355,13 +694,206 @@ class Scraper:
         print("-" * 38)
         print(f"{mode.capitalize()} scraping finished in {total_time:.1f} seconds ({total_time / 60:.2f} minutes)\n")
 
-    def run(self, max_workers=10, year=None):
+    def _run_key(self, mode, year=None):
+        """
+        Names a run in the shared job store, mirroring the JSON queue keys.
+
+        Historical seasons share one run across days so a backfill can be resumed. The current season and
+        all-time lists change daily, so they get a fresh run per day.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            year (int or None): Target year.
+
+        Returns:
+            str: The run key.
+        """
+        if mode == "seasons":
+            return f"seasons:{year}" if year != self.current_year else f"seasons:{year}:{self.today}"
+        return f"all-time:{self.today}"
+
+    def run_worker(self, mode, job_store, worker_id=None, max_workers=10, year=None, poll_interval=5.0):
+        """
+        Runs this process as one of several workers sharing a job store, leasing jobs until the run is finished.
+
+        Every worker seeds the same job list (duplicates are ignored), leases one job per thread, and renews its
+        leases from a heartbeat thread. Jobs held by a worker that stops heartbeating become available again once
+        their lease expires. A failed job goes back to the store with the same jittered backoff as a single-process
+        run, and no worker leases it again before that delay has passed. The worker that finishes the run updates
+        completed_seasons.json.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            job_store (JobStore or str): Shared store, or the path of its SQLite file.
+            worker_id (str or None): Identifier of this worker. Defaults to "{hostname}-{pid}".
+            max_workers (int): Number of threads. Defaults to 10.
+            year (int or None): Target year.
+            poll_interval (float): Seconds to wait before re-checking when other workers still hold leases or failed
+                jobs are waiting out their retry delay. Defaults to 5.
+
+        Returns:
+            None
+        """
+        store = job_store if isinstance(job_store, JobStore) else JobStore(job_store)
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        run_key = self._run_key(mode, year)
+
+        print(f"Starting {mode.upper()} worker {worker_id} on {store.path} ({run_key}) using {max_workers} threads...")
+        start_time = time.time()
+
+        log_dir = os.path.join(f"logs/{mode}", self.today)
+        os.makedirs(log_dir, exist_ok=True)
+
+        completed_file = "queues/seasons/completed_seasons.json"
+        if mode == "seasons" and year != self.current_year and os.path.exists(completed_file):
+            with open(completed_file, "r") as f:
+                if year in json.load(f):
+                    print(f"Data for the year {year} is already completely retrieved. Skipping scrape.")
+                    return
+
+        jobs = self.job_stats.order(self.build_jobs(mode, year), self.page_delay)
+        dead_jobs = {tuple(entry["job"]) for entry in self._load_dead_letters(mode, year)}
+        added = store.seed(run_key, jobs, [self.job_stats.estimate(job, self.page_delay)[1] for job in jobs])
+        print(f"Seeded {added} new or requeued jobs. Queue: {store.counts(run_key)}")
+
+        stop = threading.Event()
+
+        def _heartbeat():
+            while not stop.wait(store.lease_seconds / 3):
+                store.heartbeat(run_key, worker_id)
+
+        def _work():
+            while True:
+                job = store.lease(run_key, worker_id)
+                if job is None:
+                    counts = store.counts(run_key)
+                    if counts["pending"] == 0 and counts["leased"] == 0:
+                        return
+                    # Other workers still hold leases, or failed jobs are backing off; wait for either to free up
+                    time.sleep(poll_interval)
+                    continue
+                try:
+                    success = self.scrape_event(*job)
+                except Exception as e:
+                    success = False
+                    with self.lock:
+                        with open(os.path.join(log_dir, f"scrape_errors_{self.current_time}.log"), "a") as log_file:
+                            log_file.write(f"UNCAUGHT ERROR in job {job}: {repr(e)}\n")
+                if success:
+                    store.complete(run_key, job, worker_id)
+                    if job in dead_jobs:
+                        self._update_dead_letters(mode, remove=job)
+                elif store.release(run_key, job, worker_id, retry_delay=self._retry_delay) == "failed":
+                    self._dead_letter(mode, job, store.max_attempts)
+
+        heartbeat = threading.Thread(target=_heartbeat, daemon=True)
+        heartbeat.start()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for future in [executor.submit(_work) for _ in range(max_workers)]:
+                    future.result()
+        finally:
+            stop.set()
+            self.job_stats.save()
+
+        counts = store.counts(run_key)
+        if store.finalize(run_key, worker_id):
+            print(f"All jobs for {mode} completed successfully! Updating logs.")
+            if mode == "seasons" and year != self.current_year:
+                self._mark_season_completed(year)
+        elif counts["failed"]:
+            print(f"{counts['failed']} jobs failed after {store.max_attempts} attempts. Queue: {counts}. "
+                  f"Failed jobs are listed in {self._dead_letter_file(mode)}.")
+
+        total_time = time.time() - start_time
+        print("-" * 38)
+        print(f"{mode.capitalize()} worker {worker_id} finished in {total_time:.1f} seconds ({total_time / 60:.2f} minutes)\n")
+
+    def retry_failed(self, mode, max_workers=10):
+        """
+        Drains a mode's dead-letter file, scraping its jobs again with the usual in-run retries.
+
+        Jobs that succeed are removed from the file; jobs that fail again stay with their attempt count increased.
+        A historical season is marked complete once it has no pending queue and no dead-lettered jobs left.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            max_workers (int): Number of threads. Defaults to 10.
+
+        Returns:
+            None
+        """
+        entries = self._load_dead_letters(mode)
+        if not entries:
+            print(f"No dead-lettered {mode} jobs to retry.")
+            return
+
+        print(f"Retrying {len(entries)} dead-lettered {mode.upper()} jobs using {max_workers} workers...")
+        start_time = time.time()
+        os.makedirs(os.path.join(f"logs/{mode}", self.today), exist_ok=True)
+
+        jobs = [tuple(entry["job"]) for entry in entries]
+        previous_attempts = {tuple(entry["job"]): entry["attempts"] for entry in entries}
+        recovered = []
+
+        def _recovered(job):
+            self._update_dead_letters(mode, remove=job)
+            recovered.append(job)
+
+        dead = self._run_with_retries(mode, self.job_stats.order(jobs, self.page_delay), max_workers, _recovered, previous_attempts)
+        self.job_stats.save()
+
+        if mode == "seasons":
+            remaining_years = {entry["job"][6] for entry in self._load_dead_letters(mode)}
+            for year in sorted({job[6] for job in recovered}):
+                if year != self.current_year and year not in remaining_years and not os.path.exists(self._get_queue_info(mode, year)):
+                    self._mark_season_completed(year)
+
+        total_time = time.time() - start_time
+        print("-" * 38)
+        print(f"Recovered {len(recovered)} jobs, {len(dead)} still failing, in {total_time:.1f} seconds ({total_time / 60:.2f} minutes)\n")
+
+    def plan(self, mode, max_workers=10, year=None):
+        """
+        Estimates the requests and wall time of a scrape from recorded job history, without scraping anything.
+
+        Pending jobs are taken from the resume queue when one exists, otherwise the full job list is used.
+
+        Args:
+            mode (str): "seasons" or "all-time".
+            max_workers (int): Number of threads. Defaults to 10.
+            year (int or None): Target year.
+
+        Returns:
+            dict: Output of `JobStats.plan`.
+        """
+        queue_file = self._get_queue_info(mode, year)
+        if os.path.exists(queue_file) and os.path.getsize(queue_file) > 0 and not (mode == "seasons" and year == self.current_year):
+            with open(queue_file, "r") as f:
+                jobs = [tuple(job) for job in json.load(f)]
+        else:
+            jobs = self.build_jobs(mode, year, create_dirs=False)
+
+        plan = self.job_stats.plan(jobs, max_workers, self.page_delay)
+        label = f"{mode.upper()} {year}" if mode == "seasons" else mode.upper()
+        print(f"Plan for {label} with {max_workers} workers:")
+        print(f"  Jobs:            {plan['jobs']} ({plan['known']} with history)")
+        print(f"  Requests:        ~{plan['requests']}")
+        print(f"  Serial time:     {plan['serial_seconds'] / 60:.1f} minutes")
+        print(f"  Estimated wall:  {plan['wall_seconds'] / 60:.1f} minutes")
+        if plan["longest_job"]:
+            print(f"  Longest job:     {plan['longest_job']} ({plan['longest_seconds'] / 60:.1f} minutes)")
+        return plan
+
+    def run(self, max_workers=10, year=None, job_store=None, worker_id=None):
         """
         Wrapper that runs the scraper across designated modes utilizing max configured workers.
 
         Args:
             max_workers (int): Number of threads. Defaults to 10.
             year (int or None): Target year.
+            job_store (JobStore, str, or None): Shared job store to run as a distributed worker. Defaults to None (local JSON queues).
+            worker_id (str or None): Identifier of this worker in distributed mode.
 
         Returns:
             None
@@ -370,10 +902,16 @@ class Scraper:
             year = self.current_year
 
         if self.mode in ["seasons", "both"]:
-            self.run_scraper("seasons", max_workers=max_workers, year=year)
+            if job_store is not None:
+                self.run_worker("seasons", job_store, worker_id=worker_id, max_workers=max_workers, year=year)
+            else:
+                self.run_scraper("seasons", max_workers=max_workers, year=year)
             
         if self.mode in ["all-time", "both"]:
-            self.run_scraper("all-time", max_workers=max_workers)
+            if job_store is not None:
+                self.run_worker("all-time", job_store, worker_id=worker_id, max_workers=max_workers)
+            else:
+                self.run_scraper("all-time", max_workers=max_workers)
 
 if __name__ == "__main__":
     scraper = Scraper(mode="seasons")
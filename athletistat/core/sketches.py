@@ -0,0 +1,488 @@
+import os
+import json
+import glob
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from athletistat.core.delta import IDENTITY_COLUMNS
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix
+
+# The same performance is listed once per age-category list it appears in (e.g. senior and u20), so rows are
+# deduplicated on everything but the age category before they are counted.
+DEDUPE_COLUMNS = [c for c in IDENTITY_COLUMNS if c != "age_cat"] + ["mark"]
+
+class QuantileSketch:
+    """Mergeable t-digest style quantile sketch of a stream of marks."""
+    def __init__(self, compression=200):
+        """
+        Initializes an empty sketch.
+
+        Identical values are always pooled exactly, so events with few distinct marks (most timed events,
+        measured to the hundredth) stay exact. Beyond `compression` distinct values, neighbouring values are
+        pooled into centroids on a logit scale, which keeps the best and worst marks close to exact.
+
+        Args:
+            compression (int): Approximate maximum number of centroids kept. Defaults to 200.
+        """
+        self.compression = compression
+        self.means = np.array([], dtype="float64")
+        self.weights = np.array([], dtype="float64")
+
+    @property
+    def count(self):
+        """Number of values added to the sketch."""
+        return float(self.weights.sum())
+
+    def _compress(self, means, weights):
+        # Pool identical values exactly, then pool neighbours that fall into the same logit bin
+        means, inverse = np.unique(means, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights)
+        if len(means) <= self.compression:
+            return means, weights
+
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        scale = self.compression / (2 * np.log(2 * total))
+        bins = np.floor(scale * np.log(q / (1 - q)))
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        pooled = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / pooled, pooled
+
+    def update(self, values):
+        """
+        Adds values to the sketch. Non-finite values are ignored.
+
+        Args:
+            values (array-like): Marks to add.
+
+        Returns:
+            QuantileSketch: The sketch itself.
+        """
+        values = np.asarray(values, dtype="float64")
+        values = values[np.isfinite(values)]
+        if len(values):
+            self.means, self.weights = self._compress(
+                np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))])
+            )
+        return self
+
+    def merge(self, other):
+        """
+        Folds another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch to merge.
+
+        Returns:
+            QuantileSketch: The sketch itself.
+        """
+        if len(other.means):
+            self.means, self.weights = self._compress(
+                np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights])
+            )
+        return self
+
+    def _curve(self):
+        # Cumulative count at each centroid; a single-value centroid sits exactly at its cumulative count
+        return self.means, np.cumsum(self.weights) - (self.weights - 1) / 2
+
+    def quantile(self, q):
+        """
+        Estimates the value at one or more quantiles.
+
+        Args:
+            q (float or array-like): Quantile(s) between 0 and 1.
+
+        Returns:
+            float or np.ndarray: Estimated value(s); NaN for an empty sketch.
+        """
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        xp, fp = self._curve()
+        result = np.interp(np.asarray(q, dtype="float64") * self.count, fp, xp)
+        return result if np.ndim(q) else float(result)
+
+    def rank(self, value):
+        """
+        Estimates how many values are less than or equal to a value.
+
+        Args:
+            value (float): The value.
+
+        Returns:
+            float: Estimated count.
+        """
+        if not len(self.means) or value < self.means[0]:
+            return 0.0
+        xp, fp = self._curve()
+        return float(np.interp(value, xp, fp))
+
+    def to_dict(self):
+        """Serializes the sketch to JSON-compatible types."""
+        return {"compression": self.compression, "means": self.means.tolist(), "weights": self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a sketch written by `to_dict`."""
+        sketch = cls(data.get("compression", 200))
+        sketch.means = np.asarray(data["means"], dtype="float64")
+        sketch.weights = np.asarray(data["weights"], dtype="float64")
+        return sketch
+
+
+class MarkSummary:
+    """Counts, extremes, a quantile sketch of `mark_numeric`, and nationality counts for one discipline."""
+    def __init__(self, type_slug, ascending=True, compression=200):
+        """
+        Initializes an empty summary.
+
+        Args:
+            type_slug (str): WA type slug of the discipline.
+            ascending (bool): Whether lower marks are better (timed events). Defaults to True.
+            compression (int): Compression of the quantile sketch. Defaults to 200.
+        """
+        self.type_slug = type_slug
+        self.ascending = ascending
+        self.count = 0
+        self.invalid = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sketch = QuantileSketch(compression)
+        self.nationalities = Counter()
+
+    def update(self, df):
+        """
+        Adds the performances of a DataFrame with `mark_numeric` and `nationality` columns.
+
+        Args:
+            df (pd.DataFrame): Rows of a single discipline and sex.
+
+        Returns:
+            MarkSummary: The summary itself.
+        """
+        marks = pd.to_numeric(df["mark_numeric"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        valid = np.isfinite(marks)
+        self.invalid += int((~valid).sum())
+        marks = marks[valid]
+        if len(marks):
+            self.count += len(marks)
+            self.total += float(marks.sum())
+            self.min = min(self.min, float(marks.min()))
+            self.max = max(self.max, float(marks.max()))
+            self.sketch.update(marks)
+        if "nationality" in df.columns:
+            self.nationalities.update(df["nationality"].dropna().astype(str).value_counts().to_dict())
+        return self
+
+    def merge(self, other):
+        """
+        Folds another summary of the same discipline into this one.
+
+        Args:
+            other (MarkSummary): Summary to merge.
+
+        Returns:
+            MarkSummary: The summary itself.
+        """
+        self.count += other.count
+        self.invalid += other.invalid
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        self.nationalities.update(other.nationalities)
+        return self
+
+    def percentiles(self, percentiles=(1, 10, 25, 50, 75, 90, 99)):
+        """
+        Estimates marks at percentiles of the field, where percentile 1 is near the best mark.
+
+        Args:
+            percentiles (iterable): Percentiles between 0 and 100.
+
+        Returns:
+            dict: Percentile mapped to its estimated mark.
+        """
+        percentiles = list(percentiles)
+        q = np.asarray(percentiles, dtype="float64") / 100
+        marks = self.sketch.quantile(q if self.ascending else 1 - q)
+        return {p: float(m) for p, m in zip(percentiles, np.atleast_1d(marks))}
+
+    def depth(self, mark):
+        """
+        Estimates how many performances are at least as good as a mark.
+
+        Args:
+            mark (float): Mark in `mark_numeric` units (seconds, metres, or points).
+
+        Returns:
+            int: Estimated number of performances equal to or better than the mark.
+        """
+        if self.ascending:
+            return int(round(self.sketch.rank(mark)))
+        # Performances >= mark are those not strictly below it
+        below = self.sketch.rank(np.nextafter(mark, -np.inf))
+        return int(round(self.count - below))
+
+    def describe(self, percentiles=(1, 10, 25, 50, 75, 90, 99), marks=(), top_nationalities=10):
+        """
+        Builds a printable summary.
+
+        Args:
+            percentiles (iterable): Percentiles to report.
+            marks (iterable): Marks to report the depth of field at.
+            top_nationalities (int): Number of nationalities to list. Defaults to 10.
+
+        Returns:
+            dict: Counts, best/worst/mean mark, percentiles, depth, and top nationalities.
+        """
+        best, worst = (self.min, self.max) if self.ascending else (self.max, self.min)
+        return {
+            "count": self.count,
+            "invalid": self.invalid,
+            "best": best if self.count else None,
+            "worst": worst if self.count else None,
+            "mean": self.total / self.count if self.count else None,
+            "percentiles": self.percentiles(percentiles) if self.count else {},
+            "depth": {mark: self.depth(mark) for mark in marks},
+            "nationalities": dict(self.nationalities.most_common(top_nationalities)),
+        }
+
+    def to_dict(self):
+        """Serializes the summary to JSON-compatible types."""
+        return {
+            "type": self.type_slug,
+            "ascending": self.ascending,
+            "count": self.count,
+            "invalid": self.invalid,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "sketch": self.sketch.to_dict(),
+            "nationalities": dict(self.nationalities),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a summary written by `to_dict`."""
+        summary = cls(data["type"], data["ascending"])
+        summary.count = data["count"]
+        summary.invalid = data["invalid"]
+        summary.total = data["total"]
+        summary.min = data["min"] if data["min"] is not None else float("inf")
+        summary.max = data["max"] if data["max"] is not None else float("-inf")
+        summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        summary.nationalities = Counter(data["nationalities"])
+        return summary
+
+
+class SketchStore:
+    """Persists one MarkSummary per (season, sex, type_slug, normalized_discipline) and merges them on demand."""
+    def __init__(self, mode="seasons", root="data/stats", compression=200):
+        """
+        Initializes the store for a mode.
+
+        Summaries are kept in one JSON file per season: `{root}/{mode}/{season}.json`.
+
+        Args:
+            mode (str): "seasons" or "all-time". Defaults to "seasons".
+            root (str): Root directory of the stats files. Defaults to "data/stats".
+            compression (int): Compression of new quantile sketches. Defaults to 200.
+        """
+        self.mode = mode
+        self.directory = os.path.join(root, mode)
+        self.compression = compression
+        self.pending = {}
+
+    def _season_path(self, season):
+        return os.path.join(self.directory, f"{season}.json")
+
+    def add_frame(self, df, sex, discipline, type_slug, ascending, season=None):
+        """
+        Summarizes the rows of one discipline, replacing any stored summary of the same key on `save`.
+
+        Args:
+            df (pd.DataFrame): Preprocessed rows of the discipline.
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            type_slug (str): WA type slug of the discipline.
+            ascending (bool): Whether lower marks are better.
+            season (int or None): Season of every row. Defaults to None (grouped by the `season` column).
+
+        Returns:
+            None
+        """
+        df = df.drop_duplicates(subset=[c for c in DEDUPE_COLUMNS if c in df.columns])
+        if season is not None:
+            groups = [(season, df)]
+        elif "season" in df.columns:
+            seasons = pd.to_numeric(df["season"], errors="coerce")
+            groups = df[seasons.notna()].groupby(seasons[seasons.notna()].astype(int))
+        else:
+            return
+
+        for group_season, group in groups:
+            summary = MarkSummary(type_slug, ascending, self.compression).update(group)
+            self.pending.setdefault(int(group_season), {})[f"{sex}|{type_slug}|{discipline}"] = summary
+
+    def save(self):
+        """
+        Writes the summaries added since the last save into their season files.
+
+        Returns:
+            list: Paths of the season files written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        written = []
+        for season, summaries in sorted(self.pending.items()):
+            stored = self.load_season(season)
+            stored.update(summaries)
+            path = self._season_path(season)
+            with open(path, "w") as f:
+                json.dump({key: summary.to_dict() for key, summary in sorted(stored.items())}, f)
+            written.append(path)
+        self.pending = {}
+        return written
+
+    def seasons(self):
+        """Lists the seasons with a stats file."""
+        return sorted(int(os.path.basename(p)[:-5]) for p in glob.glob(os.path.join(self.directory, "*.json")) if os.path.basename(p)[:-5].isdigit())
+
+    def load_season(self, season):
+        """
+        Reads every summary of a season.
+
+        Args:
+            season (int): The season.
+
+        Returns:
+            dict: "{sex}|{type_slug}|{discipline}" mapped to its MarkSummary.
+        """
+        path = self._season_path(season)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return {key: MarkSummary.from_dict(data) for key, data in json.load(f).items()}
+
+    def _season_summaries(self, sex, discipline, seasons=None, type_slug=None):
+        """
+        Reads the stored summaries of one discipline list, season by season.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            seasons (iterable or None): Seasons to include. Defaults to None (every stored season).
+            type_slug (str or None): WA type slug of the list. Only needed when the discipline is stored under
+                several types. Defaults to None.
+
+        Returns:
+            list: (season, MarkSummary) pairs of the seasons that have the list, oldest first.
+
+        Raises:
+            KeyError: If `type_slug` is needed and missing.
+        """
+        found = {}
+        for season in (sorted(seasons) if seasons is not None else self.seasons()):
+            for key, summary in self.load_season(season).items():
+                key_sex, key_type, key_discipline = key.split("|", 2)
+                if key_sex == sex and key_discipline == discipline and type_slug in (None, key_type):
+                    found.setdefault(key_type, []).append((season, summary))
+        if len(found) > 1:
+            raise KeyError(f"{sex}|{discipline} is stored under several types ({', '.join(sorted(found))}); pass type_slug")
+        return next(iter(found.values()), [])
+
+    def summary(self, sex, discipline, seasons=None, type_slug=None):
+        """
+        Merges the stored summaries of a discipline across seasons, without reading any rows.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            seasons (iterable or None): Seasons to include. Defaults to None (every stored season).
+            type_slug (str or None): WA type slug, for disciplines stored under several types. Defaults to None.
+
+        Returns:
+            MarkSummary or None: The merged summary, or None if no season has the discipline.
+
+        Raises:
+            KeyError: If `type_slug` is needed and missing.
+        """
+        merged = None
+        for _, summary in self._season_summaries(sex, discipline, seasons, type_slug):
+            merged = summary if merged is None else merged.merge(summary)
+        return merged
+
+    def print_summary(self, sex, discipline, seasons=None, marks=(), type_slug=None):
+        """
+        Prints the merged summary of a discipline.
+
+        Args:
+            sex (str): "male" or "female".
+            discipline (str): Normalized discipline.
+            seasons (iterable or None): Seasons to include. Defaults to None (every stored season).
+            marks (iterable): Marks to report the depth of field at.
+            type_slug (str or None): WA type slug, for disciplines stored under several types. Defaults to None.
+
+        Returns:
+            dict or None: Output of `MarkSummary.describe`, or None if nothing is stored.
+
+        Raises:
+            KeyError: If `type_slug` is needed and missing.
+        """
+        found = self._season_summaries(sex, discipline, seasons, type_slug)
+        if not found:
+            print(f"[STATS] No stored summary for {sex} {discipline} in {self.directory}")
+            return None
+
+        summary = found[0][1]
+        for _, season_summary in found[1:]:
+            summary = summary.merge(season_summary)
+        description = summary.describe(marks=marks)
+        print(f"{sex} {discipline} ({summary.type_slug}), seasons {found[0][0]}-{found[-1][0]}")
+        print(f"  Performances:  {description['count']} ({description['invalid']} without a numeric mark)")
+        best, worst, mean = (f"{description[k]:.2f}" if description[k] is not None else "n/a" for k in ("best", "worst", "mean"))
+        print(f"  Best / worst:  {best} / {worst}   mean {mean}")
+        print("  Percentiles:   " + ("  ".join(f"p{p}={m:.2f}" for p, m in description["percentiles"].items()) or "n/a"))
+        for mark, depth in description["depth"].items():
+            print(f"  At or better than {mark}: {depth}")
+        print("  Nationalities: " + ", ".join(f"{nat} {count}" for nat, count in description["nationalities"].items()))
+        return description
+
+    def build(self, input_dir=None, ingestor=None):
+        """
+        Rebuilds the store in one pass over the Preprocessor's combined files, one discipline file at a time.
+
+        Args:
+            input_dir (str or None): Combined files root. Defaults to "data/processing/combined/{mode}".
+            ingestor (CSVIngestor or None): CSV reading layer. Defaults to a CSVIngestor.
+
+        Returns:
+            list: Paths of the season files written.
+        """
+        # Imported here: the Preprocessor imports this module to build sketches as it writes
+        from athletistat.core.preprocessing import Preprocessor
+
+        input_dir = input_dir or os.path.join("data", "processing", "combined", self.mode)
+        ingestor = ingestor or CSVIngestor()
+        if not os.path.exists(input_dir):
+            print(f"[STATS] Input directory not found: {input_dir}")
+            return []
+
+        paths = sorted(p for p in glob.glob(os.path.join(input_dir, "**", "*.csv*"), recursive=True) if is_csv(p))
+        for path in paths:
+            # {year}_{gender}_{type_slug}_{discipline} for seasons, {gender}_{type_slug}_{discipline} for all-time
+            parts = strip_csv_suffix(os.path.basename(path)).split("_", 3 if self.mode == "seasons" else 2)
+            if len(parts) != (4 if self.mode == "seasons" else 3):
+                continue
+            season = int(parts[0]) if self.mode == "seasons" else None
+            sex, type_slug, discipline = parts[-3:]
+
+            usecols = [c for c in ingestor.read_header(path) if c in DEDUPE_COLUMNS + ["mark_numeric", "season"]]
+            df = ingestor.read(path, usecols=usecols)
+            self.add_frame(df, sex, discipline, type_slug, type_slug in Preprocessor.ascending_types, season)
+            print(f"[STATS] Summarized: {path}")
+
+        return self.save()
@@ -0,0 +1,85 @@
+import os
+import time
+
+import click
+import pandas as pd
+
+from athletistat.core.ingest import CSVIngestor, is_csv, strip_csv_suffix
+
+seasons_dir = "./data/datasets/seasons"
+
+
+def _size_mb(paths):
+    return sum(os.path.getsize(p) for p in paths) / (1024 * 1024)
+
+
+def _report(label, seconds, rows, size_mb):
+    print(f"{label:<42} {seconds:>8.2f} s {rows:>12,} rows {size_mb / seconds if seconds else 0:>8.1f} MB/s")
+
+
+def _time(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+@click.command()
+@click.option('--workers', type=int, default=None, help='Threads for concurrent reads. Defaults to min(8, CPU count).')
+@click.option('--engine', type=click.Choice(['c', 'pyarrow']), default=None, help='CSV engine for whole-file reads. Defaults to pyarrow when installed.')
+@click.option('--chunksize', type=int, default=500_000, help='Rows per chunk for the streaming read.')
+@click.option('--skip-combined', is_flag=True, help='Skip the combined-file benchmarks.')
+def benchmark(workers, engine, chunksize, skip_combined):
+    """Compares serial pd.read_csv against CSVIngestor on the season and combined datasets."""
+    names = sorted(os.listdir(seasons_dir)) if os.path.isdir(seasons_dir) else []
+    season_files = [
+        os.path.join(seasons_dir, f) for f in names
+        if is_csv(f) and f.split("_")[0].isdigit() and strip_csv_suffix(f).endswith("_track_field_performances")
+    ]
+    combined_files = [
+        os.path.join(seasons_dir, f) for f in names
+        if is_csv(f) and f.startswith("combined_track_field_performances_")
+    ]
+
+    if not season_files:
+        print(f"No season datasets found in {seasons_dir}. Run --create-dataset seasons first.")
+        return
+
+    ingestor = CSVIngestor(max_workers=workers, engine=engine)
+    size = _size_mb(season_files)
+    print(f"{len(season_files)} season files, {size:.1f} MB | engine={ingestor.engine} workers={ingestor.max_workers}")
+    print("-" * 90)
+
+    seconds, frames = _time(lambda: [pd.read_csv(f) for f in season_files])
+    _report("seasons: serial pd.read_csv (inferred)", seconds, sum(len(df) for df in frames), size)
+    del frames
+
+    seconds, frames = _time(lambda: [ingestor.read(f) for f in season_files])
+    _report("seasons: serial CSVIngestor.read (dtypes)", seconds, sum(len(df) for df in frames), size)
+    del frames
+
+    seconds, frames = _time(lambda: ingestor.read_many(season_files))
+    _report("seasons: CSVIngestor.read_many", seconds, sum(len(df) for df in frames), size)
+    del frames
+
+    if skip_combined or not combined_files:
+        return
+
+    combined = combined_files[0]
+    size = _size_mb([combined])
+    print("-" * 90)
+    print(f"{os.path.basename(combined)}, {size:.1f} MB")
+
+    seconds, df = _time(lambda: pd.read_csv(combined))
+    _report("combined: pd.read_csv (inferred)", seconds, len(df), size)
+    del df
+
+    seconds, df = _time(lambda: ingestor.read(combined))
+    _report("combined: CSVIngestor.read", seconds, len(df), size)
+    del df
+
+    seconds, rows = _time(lambda: sum(len(chunk) for chunk in ingestor.iter_chunks(combined, chunksize=chunksize)))
+    _report("combined: CSVIngestor.iter_chunks", seconds, rows, size)
+
+
+if __name__ == "__main__":
+    benchmark()
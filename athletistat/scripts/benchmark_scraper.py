@@ -0,0 +1,97 @@
+import os
+import time
+import shutil
+import tempfile
+import contextlib
+from itertools import islice
+
+import click
+
+from athletistat.core.scraper import Scraper
+from athletistat.scripts.mock_server import MockWorldAthletics
+
+options_file = os.path.abspath("athletistat/options.json")
+
+
+@contextlib.contextmanager
+def _scratch_dir():
+    # The scraper writes data/, logs/ and queues/ relative to the working directory
+    previous = os.getcwd()
+    path = tempfile.mkdtemp(prefix="athletistat_bench_")
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _limit_events(scraper, events):
+    if not events:
+        return
+    remaining = events
+    limited = {}
+    for key, disciplines in scraper.mappings.items():
+        if remaining <= 0:
+            break
+        limited[key] = list(islice(disciplines, remaining))
+        remaining -= len(limited[key])
+    scraper.mappings = limited
+
+
+@click.command()
+@click.option('--workers', type=str, default="10", help='Comma-separated worker counts to compare, e.g. "4,10,16".')
+@click.option('--events', type=int, default=20, help='Number of events (jobs) to scrape; 0 for all configured events.')
+@click.option('--mode', type=click.Choice(['seasons', 'all-time']), default='seasons', help='URL shape and queue handling to exercise.')
+@click.option('--year', type=int, default=2020, help='Historical year for seasons mode (uses the persistent queue).')
+@click.option('--fixture-dir', type=click.Path(exists=True, file_okay=False), help='Raw scrape tree to serve rows from.')
+@click.option('--max-pages', type=int, default=5, help='Maximum pages for synthetic events.')
+@click.option('--latency', type=float, default=0.05, help='Server latency per response in seconds.')
+@click.option('--jitter', type=float, default=0.0, help='Extra random server latency of up to this many seconds.')
+@click.option('--error-rate', type=float, default=0.0, help='Probability of a 500 response.')
+@click.option('--burst-every', type=int, default=0, help='Start a 429 burst every N requests (0 disables).')
+@click.option('--burst-length', type=int, default=0, help='Consecutive 429 responses per burst.')
+@click.option('--page-delay', type=float, default=0.0, help='Scraper sleep between pages (production: 1.5).')
+@click.option('--max-retries', type=int, default=5, help='urllib3 total retries.')
+@click.option('--backoff', type=float, default=0.1, help='urllib3 backoff factor (production: 1).')
+@click.option('--retry-delay', type=float, default=0.5, help='Base delay before a failed job is retried in-run (production: 10).')
+def benchmark(workers, events, mode, year, fixture_dir, max_pages, latency, jitter, error_rate, burst_every, burst_length,
+              page_delay, max_retries, backoff, retry_delay):
+    """Drives Scraper.run_scraper against the local mock server and reports throughput."""
+    if fixture_dir:
+        fixture_dir = os.path.abspath(fixture_dir)
+
+    header = f"{'workers':>7} {'wall s':>8} {'pages':>7} {'pages/s':>8} {'requests':>9} {'429':>6} {'500':>6} {'retry ovh':>9} {'q writes':>8} {'q write ms':>10} {'failed':>6}"
+    print(header)
+    print("-" * len(header))
+
+    for worker_count in [int(w) for w in workers.split(",")]:
+        server = MockWorldAthletics(fixture_dir=fixture_dir, max_pages=max_pages, latency=latency, jitter=jitter,
+                                    error_rate=error_rate, burst_every=burst_every, burst_length=burst_length).start()
+        try:
+            with _scratch_dir():
+                scraper = Scraper(mode=mode, options_file=options_file, base_url=server.base_url,
+                                  page_delay=page_delay, max_retries=max_retries, backoff_factor=backoff,
+                                  retry_base_delay=retry_delay, retry_max_delay=retry_delay * 8)
+                _limit_events(scraper, events)
+
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    scraper.run_scraper(mode, max_workers=worker_count, year=year if mode == "seasons" else None)
+                    wall = time.perf_counter() - start
+        finally:
+            server.stop()
+
+        # Every page fetch ends in exactly one 200 (or a failed job); everything else was a retry
+        pages = scraper.stats["pages"]
+        requests = server.stats["requests"]
+        retry_overhead = (requests - pages) / pages if pages else 0.0
+        print(
+            f"{worker_count:>7} {wall:>8.2f} {pages:>7} {pages / wall if wall else 0:>8.1f} {requests:>9} "
+            f"{server.stats['throttled_429']:>6} {server.stats['errors_500']:>6} {retry_overhead:>8.1%} "
+            f"{scraper.stats['queue_writes']:>8} {scraper.stats['queue_write_seconds'] * 1000:>10.1f} {scraper.stats['failed_jobs']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,7 +1,10 @@
 import pathlib
 import os
+import gzip
 from prettytable import PrettyTable
 
+from athletistat.core.ingest import is_csv, zstandard
+
 dataset_dir = "./data/datasets"
 all_time_dir = os.path.join(dataset_dir,"all-time")
 seasons_dir = os.path.join(dataset_dir, "seasons")
@@ -11,26 +14,41 @@ info_file = os.path.join(dataset_dir, "dataset_info.txt")
 class DatasetInfo:
     def __init__(self):
         self.table = PrettyTable()
-        self.table.field_names = ["File Name", "File Size", "Row Count"]
+        self.table.field_names = ["File Name", "File Size", "Uncompressed Size", "Row Count"]
         self.table.align["Row Count"] = "r"
 
     
-    def count_rows(self,filename):
+    def _open_binary(self, filename):
+        # Decompress transparently based on the extension
+        filename = str(filename)
+        if filename.endswith(".gz"):
+            return gzip.open(filename, 'rb')
+        if filename.endswith(".zst"):
+            if zstandard is None:
+                raise ImportError("Reading .zst files requires the 'zstandard' package (pip install zstandard)")
+            return zstandard.open(filename, 'rb')
+        return open(filename, 'rb')
+
+    def scan_file(self, filename):
         def _make_gen(reader):
             while True:
                 b = reader(1024 * 1024) # Read in 1MB chunks
                 if not b: break
                 yield b
 
-        with open(filename, 'rb') as f:
-            # Count the number of newline characters
-            count = sum(buf.count(b'\n') for buf in _make_gen(f.read))
-        return count - 1
+        count = 0
+        uncompressed_bytes = 0
+        with self._open_binary(filename) as f:
+            # Count the number of newline characters and decompressed bytes in one pass
+            for buf in _make_gen(f.read):
+                count += buf.count(b'\n')
+                uncompressed_bytes += len(buf)
+        return count - 1, uncompressed_bytes
 
+    def count_rows(self,filename):
+        return self.scan_file(filename)[0]
 
-    def get_file_size(self,filepath):
-        size_in_bytes = os.path.getsize(filepath)
-        
+    def format_size(self, size_in_bytes):
         # Convert to Megabytes (1 MB = 1024 * 1024 bytes)
         size_in_mb = size_in_bytes / (1024 * 1024)
         
@@ -41,17 +59,26 @@ class DatasetInfo:
         else:
             return f"{size_in_mb:.2f} MB"
 
+    def get_file_size(self,filepath):
+        return self.format_size(os.path.getsize(filepath))
+
+    def add_file(self, file):
+        row_count, uncompressed_bytes = self.scan_file(file)
+        self.table.add_row([file.name, self.get_file_size(file), self.format_size(uncompressed_bytes), row_count])
+
     def run(self):
         
         # Process all-time datasets
         if os.path.exists(all_time_dir):
-            for file in pathlib.Path(all_time_dir).glob('*.csv'):
-                self.table.add_row([file.name, self.get_file_size(file), self.count_rows(file)])
+            for file in pathlib.Path(all_time_dir).glob('*.csv*'):
+                if is_csv(file.name):
+                    self.add_file(file)
 
         # Process seasons datasets
         if os.path.exists(seasons_dir):
-            for file in pathlib.Path(seasons_dir).glob('**/*.csv'):
-                self.table.add_row([file.name, self.get_file_size(file), self.count_rows(file)])
+            for file in pathlib.Path(seasons_dir).glob('**/*.csv*'):
+                if is_csv(file.name):
+                    self.add_file(file)
         self.table.sortby = "Row Count"
         self.table.reversesort = True
 
@@ -0,0 +1,226 @@
+import os
+import re
+import time
+import html
+import random
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import click
+import pandas as pd
+
+# Same path shapes as Scraper.BASE_URL_SEASONS / Scraper.BASE_URL_ALL_TIME
+SEASONS_PATH = re.compile(r"^/records/toplists/(?P<type_slug>[^/]+)/(?P<discipline_slug>[^/]+)/all/(?P<gender>[^/]+)/(?P<age_category>[^/]+)/(?P<year>\d+)$")
+ALL_TIME_PATH = re.compile(r"^/records/all-time-toplists/(?P<type_slug>[^/]+)/(?P<discipline_slug>[^/]+)/all/(?P<gender>[^/]+)/(?P<age_category>[^/]+)$")
+
+RAW_COLUMNS = ["rank", "mark", "wind", "competitor", "dob", "nationality", "position", "venue", "date", "result_score"]
+PAGE_SIZE = 100
+
+
+class MockWorldAthletics:
+    """Local stand-in for the World Athletics toplist pages, with configurable latency and failures."""
+    def __init__(self, host="127.0.0.1", port=0, fixture_dir=None, max_pages=5, latency=0.0, jitter=0.0,
+                 error_rate=0.0, burst_every=0, burst_length=0, seed=0):
+        """
+        Initializes the mock server. Call `start()` to begin serving.
+
+        Args:
+            host (str): Interface to bind. Defaults to "127.0.0.1".
+            port (int): Port to bind; 0 picks a free port. Defaults to 0.
+            fixture_dir (str or None): Raw scrape tree (like data/processing/output) to serve rows from. Events
+                without a fixture file get synthetic rows. Defaults to None (all synthetic).
+            max_pages (int): Upper bound of pages for a synthetic event. Defaults to 5.
+            latency (float): Seconds added to every response. Defaults to 0.
+            jitter (float): Extra random latency of up to this many seconds. Defaults to 0.
+            error_rate (float): Probability (0-1) of answering a request with a 500. Defaults to 0.
+            burst_every (int): Start a 429 burst every this many requests; 0 disables bursts. Defaults to 0.
+            burst_length (int): Number of consecutive 429 responses per burst. Defaults to 0.
+            seed (int): Seed for synthetic data and injected failures. Defaults to 0.
+        """
+        self.fixture_dir = fixture_dir
+        self.max_pages = max_pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.seed = seed
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.stats = {"requests": 0, "ok": 0, "errors_500": 0, "throttled_429": 0, "not_found": 0}
+        self._burst_remaining = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """Scheme and host to pass as `Scraper(base_url=...)`."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves requests on a background thread and returns the server."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _fixture_path(self, params):
+        if self.fixture_dir is None:
+            return None
+        if "year" in params:
+            return os.path.join(
+                self.fixture_dir, "seasons", params["year"], params["gender"],
+                f"{params['year']}_{params['type_slug']}_{params['discipline_slug']}_{params['age_category']}.csv",
+            )
+        return os.path.join(
+            self.fixture_dir, "all-time", params["gender"],
+            f"{params['type_slug']}_{params['discipline_slug']}_{params['age_category']}.csv",
+        )
+
+    def _synthetic_rows(self, key, params):
+        # Deterministic per event so repeated runs serve identical pages
+        rnd = random.Random(zlib.crc32(f"{self.seed}|{key}".encode()))
+        # Skewed page counts: most events are small, a few are very large, as on the real site
+        pages = max(1, min(self.max_pages, int(rnd.paretovariate(1.2))))
+        rows = []
+        year = params.get("year", "2020")
+        for i in range(pages * PAGE_SIZE - rnd.randint(0, PAGE_SIZE - 1)):
+            rows.append([
+                str(i + 1), f"{10 + i * 0.01:.2f}", f"{rnd.uniform(-2, 2):+.1f}", f"Athlete {rnd.randint(1, 5000)}",
+                "01 JAN 2000", rnd.choice(["JAM", "USA", "KEN", "GER", "GBR"]), "1", "Stadium, City (USA)",
+                f"{rnd.randint(1, 28)} JUN {year}", str(rnd.randint(900, 1300)),
+            ])
+        return rows
+
+    def _rows_for(self, params):
+        key = "|".join(f"{k}={v}" for k, v in sorted(params.items()))
+        with self.lock:
+            if key in self.cache:
+                return self.cache[key]
+
+        path = self._fixture_path(params)
+        if path and os.path.exists(path):
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
+            rows = df.reindex(columns=RAW_COLUMNS, fill_value="").values.tolist()
+        else:
+            rows = self._synthetic_rows(key, params)
+
+        with self.lock:
+            self.cache[key] = rows
+        return rows
+
+    def _render(self, rows):
+        body = []
+        for row in rows:
+            cells = [html.escape(str(v)) for v in row]
+            # Column 7 is the flag image on the real site; the scraper skips it
+            cells = cells[:7] + [""] + cells[7:]
+            body.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+        return (
+            "<html><body><table class=\"records-table\"><thead><tr><th>Rank</th></tr></thead>"
+            f"<tbody>{''.join(body)}</tbody></table></body></html>"
+        )
+
+    def _injected_failure(self):
+        with self.lock:
+            self.stats["requests"] += 1
+            if self._burst_remaining > 0:
+                self._burst_remaining -= 1
+                self.stats["throttled_429"] += 1
+                return 429
+            if self.burst_every and self.stats["requests"] % self.burst_every == 0:
+                self._burst_remaining = self.burst_length - 1
+                self.stats["throttled_429"] += 1
+                return 429
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.stats["errors_500"] += 1
+                return 500
+        return None
+
+    def handle(self, request_path):
+        """
+        Builds the response for a request path.
+
+        Args:
+            request_path (str): Path and query string of the request.
+
+        Returns:
+            tuple: (HTTP status, HTML body).
+        """
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        status = self._injected_failure()
+        if status is not None:
+            return status, ""
+
+        parsed = urlparse(request_path)
+        match = SEASONS_PATH.match(parsed.path) or ALL_TIME_PATH.match(parsed.path)
+        if not match:
+            with self.lock:
+                self.stats["not_found"] += 1
+            return 404, ""
+
+        page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+        rows = self._rows_for(match.groupdict())
+        start = (page - 1) * PAGE_SIZE
+        with self.lock:
+            self.stats["ok"] += 1
+        return 200, self._render(rows[start:start + PAGE_SIZE])
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = server.handle(self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+@click.command()
+@click.option('--port', type=int, default=8765, help='Port to listen on.')
+@click.option('--fixture-dir', type=click.Path(exists=True, file_okay=False), help='Raw scrape tree to serve rows from.')
+@click.option('--max-pages', type=int, default=5, help='Maximum pages for synthetic events.')
+@click.option('--latency', type=float, default=0.0, help='Seconds added to every response.')
+@click.option('--jitter', type=float, default=0.0, help='Extra random latency of up to this many seconds.')
+@click.option('--error-rate', type=float, default=0.0, help='Probability of answering with a 500.')
+@click.option('--burst-every', type=int, default=0, help='Start a 429 burst every N requests (0 disables).')
+@click.option('--burst-length', type=int, default=0, help='Consecutive 429 responses per burst.')
+def serve(port, fixture_dir, max_pages, latency, jitter, error_rate, burst_every, burst_length):
+    """Runs the mock World Athletics server in the foreground."""
+    server = MockWorldAthletics(port=port, fixture_dir=fixture_dir, max_pages=max_pages, latency=latency, jitter=jitter,
+                                error_rate=error_rate, burst_every=burst_every, burst_length=burst_length)
+    print(f"Serving mock World Athletics at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    serve()